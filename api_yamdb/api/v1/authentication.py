@@ -0,0 +1,222 @@
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser')
+TOKEN_VERSION_CLAIM: str = 'token_version'
+USER_CACHE_MAX_SIZE: int = getattr(settings, 'JWT_USER_CACHE_MAX_SIZE', 10000)
+USER_CACHE_TTL: float = getattr(settings, 'JWT_USER_CACHE_TTL', 300)
+
+
+class VersionedAccessToken(AccessToken):
+    """Access token с версией токенов пользователя на момент выдачи и его
+    ролью и флагами is_staff/is_superuser в подписанных claims.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class TTLCache:
+    """Ограниченный по размеру кэш процесса: записи вытесняются по истечении
+    ttl секунд или, при переполнении, начиная с давно не использованных.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.data = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None or item[0] < time.monotonic():
+                self.data.pop(key, None)
+                self.misses += 1
+                return None
+            self.data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = (time.monotonic() + self.ttl, value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_size:
+                self.data.popitem(last=False)
+
+    def invalidate(self, match):
+        """Удаляет записи, для ключей которых match(key) истинно."""
+        with self.lock:
+            for key in [key for key in self.data if match(key)]:
+                del self.data[key]
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self.lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / requests if requests else None,
+                'size': len(self.data),
+                'max_size': self.max_size,
+                'ttl': self.ttl}
+
+
+user_cache = TTLCache(max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL)
+token_version_cache = TTLCache(
+    max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL)
+
+
+def invalidate_cached_user(user_id):
+    """Сбрасывает закэшированного пользователя во всех версиях токенов.
+    Кэш локален для процесса: в остальных процессах запись устареет не
+    позже чем через USER_CACHE_TTL секунд.
+    """
+    user_cache.invalidate(lambda key: key[0] == user_id)
+    token_version_cache.invalidate(lambda key: key == user_id)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs):
+    """Сбрасывает кэш процесса при изменении или удалении пользователя
+    через save() или delete(), в том числе в админке.
+    """
+    invalidate_cached_user(instance.pk)
+
+
+def get_cached_user(user_id, token_version):
+    """Возвращает копию пользователя из кэша процесса, загружая его из базы
+    данных default при промахе: реплика может еще не получить смену роли
+    или версии токенов. Токен устаревшей версии отклоняется.
+    """
+    key = (user_id, token_version)
+    user = user_cache.get(key)
+    if user is None:
+        try:
+            user = get_user_model().objects.using(DEFAULT_DB_ALIAS).get(
+                **{api_settings.USER_ID_FIELD: user_id})
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(
+                'User not found', code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'User is inactive', code='user_inactive')
+        if user.token_version != token_version:
+            raise AuthenticationFailed(
+                'Token version is outdated', code='token_outdated')
+        user_cache.set(key, user)
+    return copy(user)
+
+
+def get_token_version(user_id):
+    """Возвращает текущую версию токенов активного пользователя из базы
+    данных default или None, если пользователь удален или неактивен.
+    Значение кэшируется в процессе: после смены роли в другом процессе
+    токены прежней версии принимаются еще до USER_CACHE_TTL секунд.
+    """
+    cached = token_version_cache.get(user_id)
+    if cached is None:
+        cached = (get_user_model().objects.using(DEFAULT_DB_ALIAS).filter(
+            is_active=True,
+            **{api_settings.USER_ID_FIELD: user_id},
+        ).values_list('token_version', flat=True).first(),)
+        token_version_cache.set(user_id, cached)
+    return cached[0]
+
+
+def get_model_user(user):
+    """Возвращает модель User для request.user, в том числе для
+    пользователя, восстановленного из claims токена.
+    """
+    if isinstance(user, RoleTokenUser):
+        return user.model_user
+    return user
+
+
+class RoleTokenUser(TokenUser):
+    """Пользователь, восстановленный из claims токена без обращения к базе
+    данных. Модель User загружается только по требованию (model_user).
+    """
+
+    @cached_property
+    def role(self):
+        return self.token['role']
+
+    @cached_property
+    def token_version(self):
+        return self.token.get(TOKEN_VERSION_CLAIM, 0)
+
+    @property
+    def is_user_role(self):
+        return self.role == get_user_model().USER
+
+    @property
+    def is_moderator_role(self):
+        return self.role == get_user_model().MODERATOR
+
+    @property
+    def is_admin_role(self):
+        return self.role == get_user_model().ADMIN
+
+    @property
+    def is_superuser_role(self):
+        return self.role == get_user_model().SUPERUSER
+
+    @cached_property
+    def model_user(self):
+        return get_cached_user(self.id, self.token_version)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без загрузки пользователя на каждый запрос.
+    Для токена с claims роли возвращает RoleTokenUser, сверив версию токена
+    с закэшированной версией пользователя. Для токенов без claims берет
+    пользователя из кэша процесса по id и версии токена.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification')
+        token_version = validated_token.get(TOKEN_VERSION_CLAIM, 0)
+        if not all(claim in validated_token for claim in ROLE_CLAIMS):
+            return get_cached_user(user_id, token_version)
+        current_version = get_token_version(user_id)
+        if current_version is None:
+            raise AuthenticationFailed(
+                'User not found', code='user_not_found')
+        if current_version != token_version:
+            raise AuthenticationFailed(
+                'Token version is outdated', code='token_outdated')
+        return RoleTokenUser(validated_token)
@@ -0,0 +1,157 @@
+from collections import defaultdict
+from hashlib import md5
+from threading import Lock
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, urlencode
+from rest_framework import status
+
+from reviews.cache import get_response_cache, get_versions, written_within
+from reviews.routers import read_alias
+
+RESPONSE_KEY_PREFIX: str = 'response:'
+
+
+class ResponseCacheStats:
+    """Счетчики попаданий в кэш ответов текущего процесса по
+    представлениям.
+    """
+
+    def __init__(self):
+        self.counters = defaultdict(lambda: {
+            'hits': 0, 'misses': 0, 'not_modified': 0})
+        self.lock = Lock()
+
+    def count(self, name, counter):
+        with self.lock:
+            self.counters[name][counter] += 1
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+
+    def stats(self):
+        with self.lock:
+            result = {}
+            for name, counters in self.counters.items():
+                requests = counters['hits'] + counters['misses']
+                result[name] = {
+                    **counters,
+                    'hit_ratio': (
+                        counters['hits'] / requests if requests else None)}
+            return result
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def request_digest(request, *versions):
+    """Хэш адреса запроса с упорядоченными параметрами, типа ответа и
+    версий данных, от которых зависит ответ.
+    """
+    key = '|'.join(map(str, (
+        request.scheme,
+        request.get_host(),
+        request.path,
+        urlencode(sorted(request.GET.lists()), doseq=True),
+        request.accepted_media_type,
+        *versions)))
+    return md5(key.encode()).hexdigest()
+
+
+class CachedResponseMixin:
+    """Кэширует отрендеренные ответы list и других обработчиков, обернутых
+    в cached_response (например, retrieve). Ключ строится из адреса запроса
+    с упорядоченными параметрами, типа ответа и версий групп данных из
+    get_cache_groups(), поэтому запись перестает использоваться, как только
+    сигнал модели меняет версию группы. Ответ содержит ETag и
+    Last-Modified, по которым клиент получает 304 Not Modified. В течение
+    settings.DATABASE_REPLICA_MAX_LAG секунд после записи ответ для кэша
+    читается из default, а не из реплики, которая могла ее еще не получить.
+    """
+    cache_groups = ()
+
+    def get_cache_groups(self):
+        return self.cache_groups
+
+    def get_cache_key(self, request):
+        versions = get_versions(*self.get_cache_groups())
+        return RESPONSE_KEY_PREFIX + request_digest(request, *versions)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_response_cache()
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response_cache_stats.count(self.basename, 'misses')
+            if settings.DATABASE_READ_ALIASES and written_within(
+                    settings.DATABASE_REPLICA_MAX_LAG):
+                read_alias.set(None)
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            response = self.finalize_response(
+                request, response, *args, **kwargs)
+            response.render()
+            entry = (
+                response.content,
+                response['Content-Type'],
+                f'"{md5(response.content).hexdigest()}"',
+                int(time.time()))
+            cache.set(key, entry)
+            cache_status = 'MISS'
+        else:
+            response_cache_stats.count(self.basename, 'hits')
+            cache_status = 'HIT'
+        content, content_type, etag, last_modified = entry
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            response_cache_stats.count(self.basename, 'not_modified')
+            response = not_modified
+        else:
+            response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['X-Cache'] = cache_status
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified на GET-запросы list и retrieve с
+    If-None-Match, не выполняя запрос списка и сериализацию. ETag строится
+    из версии ресурса, которую get_version() получает одним агрегирующим
+    запросом: количества объектов и времени последнего изменения. Удаление
+    объекта меняет количество, поэтому Last-Modified не используется.
+    """
+
+    def get_version(self):
+        """Версия ресурса или None, если ресурс не найден."""
+        raise NotImplementedError
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        version = self.get_version()
+        if version is None:
+            return handler(request, *args, **kwargs)
+        etag = f'"{request_digest(request, *version)}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+                status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs)
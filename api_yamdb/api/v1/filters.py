@@ -1,19 +1,63 @@
-from django_filters.rest_framework import CharFilter, FilterSet
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
+from django_filters.rest_framework import (
+    BaseCSVFilter, CharFilter, ChoiceFilter, FilterSet)
 
-from reviews.models import Title
+from reviews.models import Category, Genre, GenreToTitle, Title
+from reviews.search import get_search_backend
+
+MATCH_ALL: str = 'all'
+MATCH_ANY: str = 'any'
+MATCH_CHOICES = ((MATCH_ALL, MATCH_ALL), (MATCH_ANY, MATCH_ANY))
+
+
+class SlugListFilter(BaseCSVFilter, CharFilter):
+    """Фильтр по списку slug через запятую: ?genre=drama,comedy."""
 
 
 class TitleFilter(FilterSet):
-    category = CharFilter(
-        field_name='category__slug',
-        lookup_expr='contains')
-    genre = CharFilter(
-        field_name='genre__slug',
-        lookup_expr='contains')
+    category = SlugListFilter(method='filter_category')
+    genre = SlugListFilter(method='filter_genre')
+    genre_match = ChoiceFilter(
+        choices=MATCH_CHOICES,
+        method='filter_genre_match')
     name = CharFilter(
         field_name='name',
         lookup_expr='contains')
+    search = CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'genre', 'category')
+        fields = ('name', 'year', 'genre', 'category', 'search')
+
+    def filter_category(self, queryset, name, value):
+        """Произведения любой из категорий с точным совпадением slug."""
+        category_ids = list(Category.objects.filter(
+            slug__in=value).values_list('pk', flat=True))
+        return queryset.filter(category_id__in=category_ids)
+
+    def filter_genre(self, queryset, name, value):
+        """Произведения с любым (genre_match=any, по умолчанию) или со
+        всеми (genre_match=all) жанрами из списка. Slug один раз
+        переводятся в id, дальше фильтр идет по индексу таблицы связей.
+        """
+        slugs = set(value)
+        genre_ids = list(Genre.objects.filter(
+            slug__in=slugs).values_list('pk', flat=True))
+        links = GenreToTitle.objects.filter(genre_id__in=genre_ids)
+        if self.form.cleaned_data.get('genre_match') == MATCH_ALL:
+            if len(genre_ids) < len(slugs):
+                return queryset.none()
+            links = links.values('title_id').annotate(
+                genres=Count('genre_id', distinct=True),
+            ).filter(genres=len(genre_ids))
+        return queryset.filter(pk__in=links.values('title_id'))
+
+    def filter_genre_match(self, queryset, name, value):
+        """Режим применяется в filter_genre."""
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию произведения."""
+        return queryset.filter(
+            pk__in=RawSQL(*get_search_backend().ids_sql('title', value)))
@@ -0,0 +1,152 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    BasePagination, LimitOffsetPagination, _positive_int)
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+INVALID_CURSOR_MESSAGE: str = 'Некорректный курсор.'
+
+
+class KeysetPagination(BasePagination):
+    """Постраничный вывод по ключу (keyset): страница начинается сразу после
+    последней записи предыдущей, поэтому база данных не пропускает строки,
+    как при OFFSET. Порядок задается атрибутом keyset_ordering представления
+    и должен заканчиваться уникальным полем, например ('name', 'id').
+    """
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    max_limit = 100
+    page_size = api_settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = view.keyset_ordering
+        self.reverse, position = self.decode_cursor(request)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [self.invert(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_keyset_filter(queryset.model, ordering, position))
+            except (TypeError, ValidationError, ValueError):
+                raise NotFound(INVALID_CURSOR_MESSAGE)
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        self.page = results[:self.limit]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data})
+
+    def get_limit(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def get_keyset_filter(model, ordering, position):
+        """Строит условие "строго после position" для порядка ordering:
+        a >= x AND ((a > x) OR (a = x AND b > y) OR ...). Избыточное
+        a >= x позволяет базе данных читать индекс диапазоном.
+        """
+        keyset_filter = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            value = model._meta.get_field(name).to_python(value)
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            keyset_filter |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        first_field = ordering[0].lstrip('-')
+        lookup = 'lte' if ordering[0].startswith('-') else 'gte'
+        return Q(**{f'{first_field}__{lookup}': equal[first_field]}) & (
+            keyset_filter)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return False, None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            reverse, position = bool(cursor['r']), cursor['p']
+        except (BinasciiError, KeyError, TypeError, ValueError):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        if not isinstance(position, list) or (
+                len(position) != len(self.ordering)) or not all(
+                    isinstance(value, (str, int, float))
+                    and not isinstance(value, bool) for value in position):
+            raise NotFound(INVALID_CURSOR_MESSAGE)
+        return reverse, position
+
+    def encode_cursor(self, obj, reverse):
+        position = []
+        for field in self.ordering:
+            model_field = obj._meta.get_field(field.lstrip('-'))
+            position.append(model_field.value_to_string(obj))
+        cursor = json.dumps({'p': position, 'r': int(reverse)})
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, LimitOffsetPagination.offset_query_param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            urlsafe_b64encode(cursor.encode()).decode('ascii'))
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """По умолчанию работает как LimitOffsetPagination. С параметром
+    ?pagination=cursor (или cursor=...) переключается на KeysetPagination.
+    """
+    mode_query_param = 'pagination'
+    keyset_mode = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if (request.query_params.get(self.mode_query_param)
+                == self.keyset_mode
+                or KeysetPagination.cursor_query_param
+                in request.query_params):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
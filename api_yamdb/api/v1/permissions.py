@@ -31,7 +31,7 @@ class IsAuthorOrAdminOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         return (
             request.method in SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.pk
             or request.user.is_moderator_role
             or request.user.is_admin_role
             or request.user.is_superuser_role
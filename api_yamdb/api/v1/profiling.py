@@ -0,0 +1,170 @@
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import ListSerializer, Serializer
+
+PROFILE_METRICS = ('queries', 'sql_time', 'serializer_time', 'latency')
+PROFILE_PERCENTILES = (50, 95, 99)
+PROFILING_BUFFER_SIZE: int = getattr(settings, 'PROFILING_BUFFER_SIZE', 1000)
+SERIALIZER_METHODS = (
+    (ListSerializer, 'run_validation'),
+    (ListSerializer, 'to_representation'),
+    (Serializer, 'run_validation'),
+    (Serializer, 'to_representation'))
+
+current_profile = ContextVar('current_profile', default=None)
+
+
+def percentile(values, percent):
+    """Перцентиль отсортированного списка с линейной интерполяцией."""
+    if not values:
+        return None
+    position = (len(values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (
+        position - lower)
+
+
+def summarize(values):
+    """Перцентили PROFILE_PERCENTILES и максимум списка значений."""
+    values = sorted(values)
+    summary = {
+        f'p{percent}': percentile(values, percent)
+        for percent in PROFILE_PERCENTILES}
+    summary['max'] = values[-1] if values else None
+    return summary
+
+
+class RequestProfile:
+    """Замеры одного запроса: количество и время SQL-запросов, время
+    сериализаторов и общее время ответа в миллисекундах.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.start = time.perf_counter()
+
+    def execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += (time.perf_counter() - start) * 1000
+            self.queries += 1
+
+    def sample(self):
+        return {
+            'queries': self.queries,
+            'sql_time': self.sql_time,
+            'serializer_time': self.serializer_time,
+            'latency': (time.perf_counter() - self.start) * 1000}
+
+
+class ProfileBuffer:
+    """Кольцевые буферы последних max_size замеров по именам маршрутов.
+    Буферы локальны для процесса.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.samples = defaultdict(lambda: deque(maxlen=self.max_size))
+        self.lock = Lock()
+
+    def record(self, route, sample):
+        with self.lock:
+            self.samples[route].append(sample)
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def report(self):
+        """Количество замеров и перцентили каждой метрики по маршрутам."""
+        with self.lock:
+            samples = {
+                route: list(route_samples)
+                for route, route_samples in self.samples.items()}
+        return {
+            route: {
+                'requests': len(route_samples),
+                **{metric: summarize(
+                    [sample[metric] for sample in route_samples])
+                   for metric in PROFILE_METRICS}}
+            for route, route_samples in sorted(samples.items())}
+
+
+profile_buffer = ProfileBuffer(max_size=PROFILING_BUFFER_SIZE)
+
+
+def profiled(method):
+    """Добавляет время метода сериализатора к замерам текущего запроса.
+    Вложенные сериализаторы не учитываются повторно.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return method(self, *args, **kwargs)
+        profile.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            profile.serializer_depth -= 1
+            if not profile.serializer_depth:
+                profile.serializer_time += (
+                    time.perf_counter() - start) * 1000
+    wrapper.profiled = True
+    return wrapper
+
+
+def install_serializer_profiling():
+    """Оборачивает методы сериализаторов DRF замером времени. Вызывается
+    только при включенном профилировании.
+    """
+    for serializer_class, name in SERIALIZER_METHODS:
+        method = serializer_class.__dict__[name]
+        if not getattr(method, 'profiled', False):
+            setattr(serializer_class, name, profiled(method))
+
+
+class ProfilingMiddleware:
+    """Записывает в profile_buffer количество и время SQL-запросов, время
+    сериализаторов и время ответа каждого запроса по имени маршрута
+    (titles-list, reviews-detail и т.д.). Включается настройкой
+    PROFILING_ENABLED; выключенный middleware исключается из цепочки
+    обработчиков при запуске.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        install_serializer_profiling()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(profile.execute))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is not None and resolver_match.url_name:
+            profile_buffer.record(resolver_match.url_name, profile.sample())
+        return response
@@ -1,15 +1,25 @@
+from django.db import IntegrityError, transaction
 from rest_framework.serializers import (
+    DictField,
     EmailField,
     ModelSerializer,
     IntegerField,
+    ListField,
     Serializer,
+    SlugField,
     SlugRelatedField,
     RegexField,
     ValidationError)
+from rest_framework.settings import api_settings
 
-from reviews.models import Category, Comment, Genre, Title, Review, User
+from reviews.models import (
+    Category, Comment, Genre, Title, TitleRanking, TitleStats, Review, User)
 from reviews.models import USER_EMAIL_MAX_LENGTH, USER_USERNAME_MAX_LENGTH
 
+DUPLICATE_REVIEW_MESSAGE: str = (
+    'Вы уже оставляли обзор на данное произведение')
+STATS_QUERY_PARAM: str = 'stats'
+STATS_QUERY_VALUES = ('1', 'true')
 USER_FORBIDDEN_NAMES = ('me',)
 
 
@@ -36,6 +46,16 @@ class CommentSerializer(ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
+class CommentBulkSerializer(ModelSerializer):
+    review = IntegerField(
+        min_value=1,
+        source='review_id')
+
+    class Meta:
+        model = Comment
+        fields = ('review', 'text')
+
+
 class GenreSerializer(ModelSerializer):
 
     class Meta:
@@ -50,6 +70,16 @@ class GenreField(SlugRelatedField):
         return GenreSerializer(value).data
 
 
+class TitleStatsSerializer(ModelSerializer):
+    histogram = DictField(
+        child=IntegerField(),
+        read_only=True)
+
+    class Meta:
+        model = TitleStats
+        fields = ('review_count', 'comment_count', 'histogram')
+
+
 class TitleSerializer(ModelSerializer):
     category = CategoryField(
         queryset=Category.objects.all(),
@@ -61,12 +91,48 @@ class TitleSerializer(ModelSerializer):
         required=False,
         slug_field='slug')
     rating = IntegerField(
-        required=False)
+        read_only=True)
+    stats = TitleStatsSerializer(
+        read_only=True)
 
     class Meta:
         model = Title
         fields = (
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category')
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category',
+            'stats')
+
+    def get_fields(self):
+        """Блок stats выводится только по запросу с параметром ?stats=true.
+        Поля строятся при первом обращении, когда вложенный сериализатор
+        уже привязан к корневому и видит его контекст с запросом.
+        """
+        fields = super().get_fields()
+        request = self.context.get('request')
+        query_params = getattr(request, 'query_params', {})
+        if query_params.get(STATS_QUERY_PARAM) not in STATS_QUERY_VALUES:
+            fields.pop('stats')
+        return fields
+
+
+class TitleBulkSerializer(ModelSerializer):
+    category = SlugField(
+        required=False)
+    genre = ListField(
+        child=SlugField(),
+        required=False)
+
+    class Meta:
+        model = Title
+        fields = ('name', 'year', 'description', 'genre', 'category')
+
+
+class TitleRankingSerializer(ModelSerializer):
+    title = TitleSerializer(
+        read_only=True)
+
+    class Meta:
+        model = TitleRanking
+        fields = ('rating', 'rating_count', 'trending', 'title')
 
 
 class ReviewSerializer(ModelSerializer):
@@ -78,15 +144,31 @@ class ReviewSerializer(ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, data):
-        if self.context['request'].method != 'POST':
-            return data
-        title_id = self.context['request'].parser_context['kwargs']['title_id']
-        author = self.context['request'].user
-        if Review.objects.filter(title_id=title_id, author=author).exists():
-            raise ValidationError(
-                'Вы уже оставляли обзор на данное произведение')
-        return data
+    def create(self, validated_data):
+        """Создает отзыв, полагаясь на ограничение unique_review вместо
+        предварительной проверки: повторный отзыв автора на произведение,
+        в том числе отправленный параллельно, отклоняется с ответом 400.
+        """
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            if not Review.objects.filter(
+                    author=validated_data['author'],
+                    title=validated_data['title']).exists():
+                raise
+        raise ValidationError(
+            {api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW_MESSAGE]})
+
+
+class ReviewBulkSerializer(ModelSerializer):
+    title = IntegerField(
+        min_value=1,
+        source='title_id')
+
+    class Meta:
+        model = Review
+        fields = ('title', 'text', 'score')
 
 
 class UserSignUpSerializer(Serializer):
@@ -2,12 +2,18 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.v1.views import (
+    auth_cache_stats,
     auth_signup,
     auth_token,
+    BulkViewSet,
+    cache_stats,
     CategoryViewSet,
     CommentViewSet,
+    export,
     GenreViewSet,
+    profiling,
     ReviewViewSet,
+    search,
     TitleViewSet,
     UsersViewSet)
 
@@ -23,6 +29,7 @@ titles_patterns = [
     (r'titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)/comments',
      CommentViewSet, 'comments')]
 router_patterns = [
+    ('bulk', BulkViewSet, 'bulk'),
     ('categories', CategoryViewSet, 'categories'),
     ('genres', GenreViewSet, 'genres'),
     ('users', UsersViewSet, 'users')]
@@ -35,5 +42,13 @@ router_register_func(router=router, patterns=router_patterns)
 
 v1_urlpatterns = [
     path('', include(router.urls)),
+    path('auth/cache/', auth_cache_stats, name='auth-cache'),
     path('auth/signup/', auth_signup, name='signup'),
-    path('auth/token/', auth_token, name='token')]
+    path('auth/token/', auth_token, name='token'),
+    path('cache/', cache_stats, name='cache-stats'),
+    path(
+        'export/<slug:resource>.<slug:file_format>',
+        export,
+        name='export'),
+    path('profiling/', profiling, name='profiling'),
+    path('search/', search, name='search')]
@@ -1,37 +1,63 @@
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.filters import SearchFilter
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin)
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.viewsets import GenericViewSet, ModelViewSet
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.serializers import as_serializer_error, ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.viewsets import GenericViewSet, ModelViewSet, ViewSet
 
+from .authentication import (
+    get_model_user,
+    token_version_cache,
+    user_cache,
+    VersionedAccessToken)
+from .cache import (
+    CachedResponseMixin, ConditionalGetMixin, response_cache_stats)
 from .filters import TitleFilter
+from .pagination import KeysetPagination, LimitOffsetOrKeysetPagination
 from .permissions import (
     DeleteGetPatchPermission,
     IsAdmin,
     IsAdminOrReadOnly,
     IsAuthorOrAdminOrReadOnly)
+from .profiling import profile_buffer
 from .serializers import (
     CategorySerializer,
+    CommentBulkSerializer,
     CommentSerializer,
+    DUPLICATE_REVIEW_MESSAGE,
     GenreSerializer,
+    ReviewBulkSerializer,
     ReviewSerializer,
+    TitleBulkSerializer,
+    TitleRankingSerializer,
     TitleSerializer,
     UserSignUpSerializer,
     UsersSerializer,
     UsersSerializerAdmin)
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.bulk import create_comments, create_reviews, create_titles
+from reviews.export import (
+    CSV, EXPORT_FORMATS, EXPORT_RESOURCES, NDJSON, export_lines)
+from reviews.mail import queue_mail
+from reviews.models import (
+    Category, Comment, Genre, Review, Title, TitleRanking, User)
+from reviews.search import SEARCH_KINDS, SearchResults
 
+BULK_MAX_ITEMS: int = 1000
+BULK_ATTEMPTS: int = 2
 CONFIRM_CODE_LENGTH: str = 32
 EMAIL_FROM_ADDRESS: str = 'YaMDB@yandex.ru'
 EMAIL_FROM_SUBJECT: str = 'YaMDB registration'
@@ -55,6 +81,72 @@ EMAIL_MESSAGE_RESTORE: str = (
     'сформировано автоматически, пожалуйста, не отвечайте на его.\n\nЕсли Вы '
     'не указывали свою почту для регистрации на сайте YaMDB, пожалуйста, '
     'проигнорируйте это сообщение.')
+REVIEW_NOT_FOUND_MESSAGE: str = 'Отзыв не найден.'
+SLUG_NOT_FOUND_MESSAGE: str = 'Object with slug={} does not exist.'
+TITLE_NOT_FOUND_MESSAGE: str = 'Произведение не найдено.'
+EXPORT_CONTENT_TYPES: dict = {
+    CSV: 'text/csv; charset=utf-8',
+    NDJSON: 'application/x-ndjson; charset=utf-8'}
+# Тип результата поиска: (queryset для загрузки объектов, сериализатор).
+SEARCH_RESULT_TYPES: dict = {
+    'title': (
+        Title.objects.select_related('category', 'stats').prefetch_related(
+            'genre'),
+        TitleSerializer),
+    'review': (Review.objects.select_related('author'), ReviewSerializer),
+    'comment': (
+        Comment.objects.select_related('author', 'review'),
+        CommentSerializer)}
+
+
+def bulk_items(request):
+    """Массив элементов из тела запроса bulk-эндпоинта или ответ 400."""
+    items = request.data
+    if not isinstance(items, list) or not items:
+        err = {api_settings.NON_FIELD_ERRORS_KEY: [
+            'Expected a non-empty list of items.']}
+        return None, Response(err, status=status.HTTP_400_BAD_REQUEST)
+    if len(items) > BULK_MAX_ITEMS:
+        err = {api_settings.NON_FIELD_ERRORS_KEY: [
+            f'Ensure there are no more than {BULK_MAX_ITEMS} items.']}
+        return None, Response(err, status=status.HTTP_400_BAD_REQUEST)
+    return items, None
+
+
+def bulk_response(created, errors, count):
+    """Результаты по элементам в порядке запроса: id созданного объекта
+    или ошибки. Статус 201, если созданы все элементы, 400 - если ни один,
+    иначе 207.
+    """
+    results = [
+        {'status': status.HTTP_201_CREATED, 'id': created[index].pk}
+        if index in created else
+        {'status': status.HTTP_400_BAD_REQUEST, 'errors': errors[index]}
+        for index in range(count)]
+    if len(created) == count:
+        response_status = status.HTTP_201_CREATED
+    elif not created:
+        response_status = status.HTTP_400_BAD_REQUEST
+    else:
+        response_status = status.HTTP_207_MULTI_STATUS
+    return Response(
+        {'created': len(created), 'results': results},
+        status=response_status)
+
+
+def validate_bulk_items(items, serializer_class):
+    """Проверяет поля всех элементов без обращения к базе данных.
+    Возвращает проверенные данные и ошибки по индексам элементов.
+    Поля сериализатора строятся один раз на все элементы.
+    """
+    serializer = serializer_class()
+    valid, errors = {}, {}
+    for index, item in enumerate(items):
+        try:
+            valid[index] = serializer.run_validation(item)
+        except ValidationError as error:
+            errors[index] = as_serializer_error(error)
+    return valid, errors
 
 
 class CreateDestroyList(
@@ -65,27 +157,29 @@ class CreateDestroyList(
 
 @api_view(('POST',))
 def auth_signup(request):
-    """Производит регистрацию нового пользователя. Отправляет электронное
-    письмо с confirmation_code для получения JWT access token'a.
+    """Производит регистрацию нового пользователя. Ставит в очередь
+    электронное письмо с confirmation_code для получения JWT access token'a,
+    письмо отправляет команда send_queued_mail.
     """
     serializer = UserSignUpSerializer(data=request.data)
     if not serializer.is_valid(raise_exception=True):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    user, created = User.objects.get_or_create(
-        username=serializer.data['username'],
-        email=serializer.data['email'])
-    if not created:
-        message = EMAIL_MESSAGE_RESTORE.format(user.confirmation_code)
-    else:
-        confirmation_code = default_token_generator.make_token(user=user)
-        user.confirmation_code = confirmation_code
-        user.save()
-        message = EMAIL_MESSAGE_REGISTER.format(confirmation_code)
-    send_mail(
-        from_email=EMAIL_FROM_ADDRESS,
-        message=message,
-        recipient_list=[user.email],
-        subject=EMAIL_FROM_SUBJECT)
+    with transaction.atomic():
+        user, created = User.objects.get_or_create(
+            username=serializer.data['username'],
+            email=serializer.data['email'])
+        if not created:
+            message = EMAIL_MESSAGE_RESTORE.format(user.confirmation_code)
+        else:
+            confirmation_code = default_token_generator.make_token(user=user)
+            user.confirmation_code = confirmation_code
+            user.save()
+            message = EMAIL_MESSAGE_REGISTER.format(confirmation_code)
+        queue_mail(
+            from_email=EMAIL_FROM_ADDRESS,
+            message=message,
+            recipient_list=[user.email],
+            subject=EMAIL_FROM_SUBJECT)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -102,15 +196,236 @@ def auth_token(request):
     if user.confirmation_code != request.data['confirmation_code']:
         err = {"confirmation_code": ["Confirmation_code is invalid."]}
         return Response(err, status=status.HTTP_400_BAD_REQUEST)
-    access_token = {'token': str(AccessToken.for_user(user).access_token)}
+    access_token = {'token': str(VersionedAccessToken.for_user(user))}
     return Response(access_token, status=status.HTTP_200_OK)
 
 
-class CategoryViewSet(CreateDestroyList):
+@api_view(('GET',))
+@permission_classes((IsAdmin,))
+def auth_cache_stats(request):
+    """Для пользователя с уровнем прав не менее "admin" возвращает счетчики
+    кэша пользователей JWT-аутентификации текущего процесса.
+    """
+    stats = {
+        'users': user_cache.stats(),
+        'token_versions': token_version_cache.stats()}
+    return Response(stats, status=status.HTTP_200_OK)
+
+
+@api_view(('GET',))
+@permission_classes((IsAdmin,))
+def cache_stats(request):
+    """Для пользователя с уровнем прав не менее "admin" возвращает счетчики
+    кэша ответов каталога текущего процесса.
+    """
+    return Response(response_cache_stats.stats(), status=status.HTTP_200_OK)
+
+
+@api_view(('GET',))
+@permission_classes((IsAdmin,))
+def export(request, resource, file_format):
+    """Для пользователя с уровнем прав не менее "admin" потоково выгружает
+    произведения, связи с жанрами, отзывы или комментарии в CSV или NDJSON.
+    """
+    if resource not in EXPORT_RESOURCES or file_format not in EXPORT_FORMATS:
+        raise Http404
+    response = StreamingHttpResponse(
+        export_lines(resource, file_format),
+        content_type=EXPORT_CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = (
+        f'attachment; filename="{resource}.{file_format}"')
+    return response
+
+
+@api_view(('GET', 'DELETE'))
+@permission_classes((IsAdmin,))
+def profiling(request):
+    """Для пользователя с уровнем прав не менее "admin" возвращает
+    перцентили количества и времени SQL-запросов, времени сериализаторов
+    и времени ответа по маршрутам, записанные в текущем процессе.
+    DELETE очищает замеры.
+    """
+    if request.method == 'DELETE':
+        profile_buffer.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(profile_buffer.report(), status=status.HTTP_200_OK)
+
+
+@api_view(('GET',))
+def search(request):
+    """Для любого пользователя выполняет полнотекстовый поиск по
+    произведениям, отзывам и комментариям. Результаты упорядочены по
+    релевантности, параметр type ограничивает типы объектов.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        err = {'q': ['This field is required.']}
+        return Response(err, status=status.HTTP_400_BAD_REQUEST)
+    kinds = request.query_params.get('type', ','.join(SEARCH_KINDS))
+    kinds = [kind for kind in kinds.split(',') if kind]
+    if not kinds or any(kind not in SEARCH_KINDS for kind in kinds):
+        err = {'type': [f'Choose from: {", ".join(SEARCH_KINDS)}.']}
+        return Response(err, status=status.HTTP_400_BAD_REQUEST)
+    paginator = LimitOffsetPagination()
+    page = paginator.paginate_queryset(
+        SearchResults(query, kinds), request) or []
+    objects = {}
+    for kind, (queryset, _) in SEARCH_RESULT_TYPES.items():
+        ids = [object_id for row_kind, object_id, _ in page
+               if row_kind == kind]
+        if ids:
+            objects[kind] = queryset.in_bulk(ids)
+    results = []
+    for kind, object_id, rank in page:
+        # Объект мог быть удален после построения индекса.
+        obj = objects[kind].get(object_id)
+        if obj is None:
+            continue
+        serializer = SEARCH_RESULT_TYPES[kind][1]
+        results.append({
+            'type': kind,
+            'rank': rank,
+            'title_id': (
+                obj.pk if kind == 'title' else
+                obj.title_id if kind == 'review' else obj.review.title_id),
+            'review_id': (
+                obj.pk if kind == 'review' else
+                obj.review_id if kind == 'comment' else None),
+            'object': serializer(obj, context={'request': request}).data})
+    return paginator.get_paginated_response(results)
+
+
+class BulkViewSet(ViewSet):
+    """Bulk-эндпоинты /bulk/titles/, /bulk/reviews/ и /bulk/comments/:
+    создают объекты из массива до BULK_MAX_ITEMS элементов и возвращают
+    результат по каждому элементу.
+    """
+
+    @action(
+        detail=False,
+        methods=('post',),
+        permission_classes=(IsAdminOrReadOnly,))
+    def titles(self, request):
+        """Для пользователя с уровнем прав не менее "admin" создает
+        произведения из массива объектов того же вида, что и POST-запрос к
+        списку произведений. Категории и жанры всех элементов загружаются
+        по slug одним запросом каждые, произведения и их связи с жанрами
+        создаются bulk_create. Возвращает результат по каждому элементу.
+        """
+        items, error_response = bulk_items(request)
+        if error_response is not None:
+            return error_response
+        valid, errors = validate_bulk_items(items, TitleBulkSerializer)
+        slugs = {'category': set(), 'genre': set()}
+        for data in valid.values():
+            if data.get('category'):
+                slugs['category'].add(data['category'])
+            slugs['genre'].update(data.get('genre', ()))
+        categories = dict(Category.objects.filter(
+            slug__in=slugs['category']).values_list('slug', 'pk'))
+        genres = dict(Genre.objects.filter(
+            slug__in=slugs['genre']).values_list('slug', 'pk'))
+        created, genre_ids = {}, []
+        for index, data in valid.items():
+            category = data.pop('category', None)
+            title_genres = data.pop('genre', ())
+            item_errors = {}
+            if category and category not in categories:
+                item_errors['category'] = [
+                    SLUG_NOT_FOUND_MESSAGE.format(category)]
+            missing = [slug for slug in title_genres if slug not in genres]
+            if missing:
+                item_errors['genre'] = [
+                    SLUG_NOT_FOUND_MESSAGE.format(slug) for slug in missing]
+            if item_errors:
+                errors[index] = item_errors
+                continue
+            created[index] = Title(
+                category_id=categories.get(category), **data)
+            genre_ids.append({genres[slug] for slug in title_genres})
+        create_titles(list(created.values()), genre_ids)
+        return bulk_response(created, errors, len(items))
+
+    @action(
+        detail=False,
+        methods=('post',),
+        permission_classes=(IsAuthenticated,))
+    def reviews(self, request):
+        """Для пользователя с уровнем прав не менее "user" создает отзывы
+        на одно или несколько произведений из массива {"title", "text",
+        "score"}. Произведения и уже оставленные отзывы загружаются одним
+        запросом каждые, отзывы создаются одним bulk_create, рейтинг
+        каждого произведения пересчитывается один раз. Возвращает результат
+        по каждому элементу.
+        """
+        items, error_response = bulk_items(request)
+        if error_response is not None:
+            return error_response
+        valid, field_errors = validate_bulk_items(
+            items, ReviewBulkSerializer)
+        title_ids = {data['title_id'] for data in valid.values()}
+        existing = set(Title.objects.filter(pk__in=title_ids).values_list(
+            'pk', flat=True))
+        author = get_model_user(request.user)
+        for attempt in range(1, BULK_ATTEMPTS + 1):
+            reviewed = set(Review.objects.filter(
+                author=author, title_id__in=existing).values_list(
+                    'title_id', flat=True))
+            errors = dict(field_errors)
+            created = {}
+            for index, data in valid.items():
+                if data['title_id'] not in existing:
+                    errors[index] = {'title': [TITLE_NOT_FOUND_MESSAGE]}
+                elif data['title_id'] in reviewed:
+                    errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [
+                        DUPLICATE_REVIEW_MESSAGE]}
+                else:
+                    reviewed.add(data['title_id'])
+                    created[index] = Review(author=author, **data)
+            try:
+                create_reviews(list(created.values()))
+            except IntegrityError:
+                # Параллельный запрос успел создать отзыв автора на одно из
+                # произведений: повторяем проверку.
+                if attempt == BULK_ATTEMPTS:
+                    raise
+            else:
+                return bulk_response(created, errors, len(items))
+
+    @action(
+        detail=False,
+        methods=('post',),
+        permission_classes=(IsAuthenticated,))
+    def comments(self, request):
+        """Для пользователя с уровнем прав не менее "user" создает
+        комментарии к одному или нескольким отзывам из массива {"review",
+        "text"}. Отзывы загружаются одним запросом, комментарии создаются
+        одним bulk_create. Возвращает результат по каждому элементу.
+        """
+        items, error_response = bulk_items(request)
+        if error_response is not None:
+            return error_response
+        valid, errors = validate_bulk_items(items, CommentBulkSerializer)
+        review_titles = dict(Review.objects.filter(
+            pk__in={data['review_id'] for data in valid.values()},
+        ).values_list('pk', 'title_id'))
+        author = get_model_user(request.user)
+        created = {}
+        for index, data in valid.items():
+            if data['review_id'] not in review_titles:
+                errors[index] = {'review': [REVIEW_NOT_FOUND_MESSAGE]}
+            else:
+                created[index] = Comment(author=author, **data)
+        create_comments(list(created.values()), review_titles)
+        return bulk_response(created, errors, len(items))
+
+
+class CategoryViewSet(CachedResponseMixin, CreateDestroyList):
     """Для любого пользователя позволяет получить список всех категорий.
     Для пользователя с уровнем прав не менее "admin" позволяет создать или
     удалить категорию по slug полю.
     """
+    cache_groups = ('categories',)
     filter_backends = (SearchFilter,)
     lookup_field = 'slug'
     permission_classes = (IsAdminOrReadOnly,)
@@ -119,7 +434,7 @@ class CategoryViewSet(CreateDestroyList):
     queryset = Category.objects.all()
 
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, ModelViewSet):
     """Для любого пользователя позволяет получить список всех комментариев к
     отзыву или какого-то определенного по id.
     Для пользователя с уровнем прав не менее "user" позволяет создать
@@ -127,26 +442,53 @@ class CommentViewSet(ModelViewSet):
     Для пользователя с уровнем прав не менее "moderator" или автору позволяет
     частично обновить или удалить комментарий по id.
     """
+    keyset_ordering = ('-pub_date', '-id')
+    pagination_class = LimitOffsetOrKeysetPagination
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorOrAdminOrReadOnly,)
 
-    def __get_review(self, get_data):
-        return get_object_or_404(Review, pk=get_data.get('review_id'))
+    @cached_property
+    def review(self):
+        """Отзыв из адреса запроса, принадлежащий произведению title_id.
+        Загружается одним запросом и один раз за запрос; для списка -
+        вместе с количеством и временем изменения комментариев.
+        """
+        reviews = Review.objects.filter(title_id=self.kwargs['title_id'])
+        if self.action == 'list':
+            reviews = reviews.annotate(
+                comments_count=Count('comments'),
+                comments_updated=Max('comments__updated'))
+        return get_object_or_404(reviews, pk=self.kwargs['review_id'])
 
     def get_queryset(self):
-        return self.__get_review(get_data=self.kwargs).comments.all()
+        if self.action == 'list':
+            comments = Comment.objects.filter(review=self.review)
+        else:
+            comments = Comment.objects.filter(
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id'])
+        return comments.select_related('author')
+
+    def get_version(self):
+        if self.action == 'retrieve':
+            return Comment.objects.filter(
+                pk=self.kwargs['pk'],
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id'],
+            ).values_list('pk', 'updated').first()
+        return self.review.comments_count, self.review.comments_updated
 
     def perform_create(self, serializer):
         serializer.save(
-            author=self.request.user,
-            review=self.__get_review(get_data=self.kwargs))
+            author=get_model_user(self.request.user), review=self.review)
 
 
-class GenreViewSet(CreateDestroyList):
+class GenreViewSet(CachedResponseMixin, CreateDestroyList):
     """Для любого пользователя позволяет получить список всех жанров.
     Для пользователя с уровнем прав не менее "admin" позволяет создать или
     удалить жанр по slug полю.
     """
+    cache_groups = ('genres',)
     filter_backends = (SearchFilter,)
     lookup_field = 'slug'
     permission_classes = (IsAdminOrReadOnly,)
@@ -155,7 +497,7 @@ class GenreViewSet(CreateDestroyList):
     queryset = Genre.objects.all()
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(CachedResponseMixin, ModelViewSet):
     """Для любого пользователя позволяет получить список всех произведений
     или информацию о конкретном произведении.
     Для пользователя с уровнем прав не менее "admin" позволяет создать,
@@ -163,12 +505,73 @@ class TitleViewSet(ModelViewSet):
     """
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
+    keyset_ordering = ('name', 'id')
+    pagination_class = LimitOffsetOrKeysetPagination
     permission_classes = (IsAdminOrReadOnly,)
     serializer_class = TitleSerializer
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+    queryset = Title.objects.select_related(
+        'category', 'stats').prefetch_related('genre')
+
+    def get_cache_groups(self):
+        if self.action == 'retrieve':
+            return ('categories', 'genres', f'title:{self.kwargs["pk"]}')
+        return ('categories', 'genres', 'titles')
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
 
+    def get_rankings(self):
+        """Строки материализованного рейтинга для ?category= и ?genre=
+        (slug). Slug заранее переводятся в id, чтобы страница читалась из
+        индекса рейтинга без join. Без жанра выбираются строки произведений
+        без жанра.
+        """
+        rankings = TitleRanking.objects.select_related(
+            'title__category', 'title__stats').prefetch_related(
+                'title__genre')
+        for field, model in (('category', Category), ('genre', Genre)):
+            slug = self.request.query_params.get(field)
+            if not slug:
+                continue
+            group_id = model.objects.filter(slug=slug).values_list(
+                'pk', flat=True).first()
+            if group_id is None:
+                return rankings.none()
+            rankings = rankings.filter(**{f'{field}_id': group_id})
+        if not self.request.query_params.get('genre'):
+            rankings = rankings.filter(genre=None)
+        return rankings
 
-class ReviewViewSet(ModelViewSet):
+    def ranked_response(self, request):
+        page = self.paginate_queryset(self.get_rankings())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        filter_backends=(),
+        keyset_ordering=('-rating', 'title'),
+        pagination_class=KeysetPagination,
+        serializer_class=TitleRankingSerializer)
+    def top(self, request):
+        """Произведения по убыванию байесовского рейтинга."""
+        return self.ranked_response(request)
+
+    @action(
+        detail=False,
+        filter_backends=(),
+        keyset_ordering=('-trending', '-rating', 'title'),
+        pagination_class=KeysetPagination,
+        serializer_class=TitleRankingSerializer)
+    def trending(self, request):
+        """Произведения по убыванию количества отзывов за последний
+        период обновления рейтинга.
+        """
+        return self.ranked_response(request)
+
+
+class ReviewViewSet(ConditionalGetMixin, ModelViewSet):
     """Для любого пользователя позволяет получить список всех отзывов к
     произведению или какого-то определенного по id.
     Для пользователя с уровнем прав не менее "user" позволяет создать
@@ -176,19 +579,49 @@ class ReviewViewSet(ModelViewSet):
     Для пользователя с уровнем прав не менее "moderator" или автору позволяет
     частично обновить или удалить отзыв по id.
     """
+    keyset_ordering = ('-pub_date', '-id')
+    pagination_class = LimitOffsetOrKeysetPagination
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorOrAdminOrReadOnly,)
 
+    @cached_property
+    def title(self):
+        """Произведение из адреса запроса, загруженное один раз за запрос;
+        для списка - вместе с количеством и временем изменения отзывов.
+        """
+        titles = Title.objects.all()
+        if self.action == 'list':
+            titles = titles.annotate(
+                reviews_count=Count('reviews'),
+                reviews_updated=Max('reviews__updated'))
+        return get_object_or_404(titles, pk=self.kwargs['title_id'])
+
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        title_queryset = title.reviews.all()
-        return title_queryset
+        if self.action == 'list':
+            reviews = Review.objects.filter(title=self.title)
+        else:
+            reviews = Review.objects.filter(title_id=self.kwargs['title_id'])
+        return reviews.select_related('author')
+
+    def get_version(self):
+        if self.action == 'retrieve':
+            return Review.objects.filter(
+                pk=self.kwargs['pk'], title_id=self.kwargs['title_id'],
+            ).values_list('pk', 'updated').first()
+        return self.title.reviews_count, self.title.reviews_updated
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(
+            author=get_model_user(self.request.user), title=self.title)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
 
 
 class UsersViewSet(ModelViewSet):
@@ -196,7 +629,8 @@ class UsersViewSet(ModelViewSet):
     или частично изменить свои данные (кроме значения поля "role").
     Для пользователя с уровнем прав не менее "admin" позволяет получить
     список всех пользователей или создать нового, а также получить, изменить
-    или удалить данные любого пользователя по username.
+    или удалить данные любого пользователя по username. Изменение роли
+    отзывает выданные пользователю токены.
     """
     filter_backends = (SearchFilter,)
     http_method_names = ('delete', 'get', 'patch', 'post')
@@ -213,7 +647,7 @@ class UsersViewSet(ModelViewSet):
         permission_classes=(IsAuthenticated, DeleteGetPatchPermission),
         serializer_class=UsersSerializer)
     def users_me(self, request):
-        user = request.user
+        user = get_model_user(request.user)
         if request.method == 'GET':
             serializer = self.get_serializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
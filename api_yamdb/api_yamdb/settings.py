@@ -27,6 +27,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.v1.profiling.ProfilingMiddleware',
+    'reviews.routers.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -62,7 +64,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.v1.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 5
@@ -73,17 +75,135 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+JWT_USER_CACHE_MAX_SIZE = int(os.getenv('JWT_USER_CACHE_MAX_SIZE', 10000))
+
+JWT_USER_CACHE_TTL = float(os.getenv('JWT_USER_CACHE_TTL', 300))
+
+# Профилирование запросов по маршрутам: количество и время SQL-запросов,
+# время сериализаторов и время ответа (api/v1/profiling/, profiling_report).
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', '').lower() in (
+    '1', 'true')
+
+PROFILING_BUFFER_SIZE = int(os.getenv('PROFILING_BUFFER_SIZE', 1000))
+
+# Кэш ответов каталога. Версии групп данных, которые меняют сигналы моделей
+# и management-команды (load_csv, recalculate_ratings, rebuild_title_stats,
+# refresh_rankings), хранятся в том же кэше, поэтому он должен быть общим
+# для всех процессов сервера и команд: FileBasedCache на одном хосте,
+# Memcached или Redis-бэкенд. LocMemCache у каждого процесса свой, запись в
+# другом процессе его не сбрасывает, и до RESPONSE_CACHE_TIMEOUT секунд
+# отдаются устаревшие ответы. Поэтому с LocMemCache кэш ответов отключен
+# (DummyCache), если RESPONSE_CACHE_SINGLE_PROCESS=1 не подтверждает, что
+# API обслуживает один процесс, например runserver.
+LOCAL_CACHE_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+
+response_cache_backend = os.getenv(
+    'RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache')
+
+if (response_cache_backend in LOCAL_CACHE_BACKENDS
+        and os.getenv('RESPONSE_CACHE_SINGLE_PROCESS', '').lower() not in (
+            '1', 'true')):
+    response_cache_backend = 'django.core.cache.backends.dummy.DummyCache'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': response_cache_backend,
+        'LOCATION': os.getenv('RESPONSE_CACHE_LOCATION', 'responses'),
+        'TIMEOUT': int(os.getenv('RESPONSE_CACHE_TIMEOUT', 600)),
+    },
+}
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# База данных: по умолчанию SQLite-файл, DB_ENGINE=django.db.backends.postgresql
+# подключает PostgreSQL. DB_CONN_MAX_AGE держит соединение открытым между
+# запросами (секунды, None - без ограничения), DB_CONN_HEALTH_CHECKS
+# проверяет такое соединение перед повторным использованием
+# (reviews.db.check_connections).
+conn_max_age = os.getenv('DB_CONN_MAX_AGE', '0')
+
+db_engine = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+
+# Профиль SQLite (reviews/backends/sqlite3): журнал WAL, чтобы чтение не
+# ждало запись, ожидание блокировки вместо "database is locked" и
+# BEGIN IMMEDIATE для транзакций. DB_SQLITE_TUNING=0 отключает профиль.
+SQLITE_TUNING = os.getenv('DB_SQLITE_TUNING', '1').lower() in ('1', 'true')
+
+SQLITE_OPTIONS = {
+    'pragmas': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.getenv('DB_SQLITE_BUSY_TIMEOUT', 5000)),
+        'mmap_size': int(os.getenv('DB_SQLITE_MMAP_SIZE', 256 * 1024 ** 2)),
+        'cache_size': int(os.getenv('DB_SQLITE_CACHE_SIZE', -64000)),
+        'temp_store': 'MEMORY',
+    },
+    'transaction_mode': 'IMMEDIATE',
+}
+
+if db_engine == 'django.db.backends.sqlite3' and SQLITE_TUNING:
+    db_engine = 'reviews.backends.sqlite3'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': db_engine,
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'USER': os.getenv('POSTGRES_USER', ''),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+        'OPTIONS': (
+            SQLITE_OPTIONS if db_engine == 'reviews.backends.sqlite3'
+            else {}),
+        'CONN_MAX_AGE': (
+            None if conn_max_age.lower() == 'none' else int(conn_max_age)),
+        'CONN_HEALTH_CHECKS': os.getenv(
+            'DB_CONN_HEALTH_CHECKS', '').lower() in ('1', 'true'),
     }
 }
 
+# Базы данных для чтения в GET, HEAD и OPTIONS-запросах
+# (reviews.routers.ReadWriteRouter); запись и чтение после нее в том же
+# запросе идут в default. DB_REPLICAS - реплики через запятую: файлы SQLite
+# или HOST[:PORT] серверов с той же базой и пользователем, что у default.
+# DB_REPLICA_MAX_LAG - наибольшее ожидаемое отставание реплик, секунд: столько
+# после записи ответы для кэша ответов читаются из default, чтобы в кэш не
+# попали данные реплики, еще не получившей запись. Пользователи для
+# аутентификации всегда читаются из default.
+DATABASE_READ_ALIASES = []
+
+DATABASE_REPLICA_MAX_LAG = float(os.getenv('DB_REPLICA_MAX_LAG', 5))
+
+for number, replica in enumerate(
+        filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1):
+    if db_engine.endswith('sqlite3'):
+        location = {'NAME': replica.strip()}
+    else:
+        host, _, port = replica.strip().partition(':')
+        location = {'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+    DATABASES[f'replica_{number}'] = {**DATABASES['default'], **location}
+    DATABASE_READ_ALIASES.append(f'replica_{number}')
+
+# DB_SQLITE_READ_CONNECTION=1 открывает для чтения отдельное соединение с
+# тем же файлом SQLite только для чтения (PRAGMA query_only).
+if (db_engine == 'reviews.backends.sqlite3' and os.getenv(
+        'DB_SQLITE_READ_CONNECTION', '').lower() in ('1', 'true')):
+    DATABASES['read'] = {
+        **DATABASES['default'],
+        'OPTIONS': {'pragmas': {
+            **SQLITE_OPTIONS['pragmas'], 'query_only': 1}},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_READ_ALIASES.append('read')
+
+if DATABASE_READ_ALIASES:
+    DATABASE_ROUTERS = ['reviews.routers.ReadWriteRouter']
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
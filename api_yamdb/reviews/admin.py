@@ -1,12 +1,16 @@
 from django.contrib.admin import site
 
-from .models import Category, Comment, Genre, GenreTitle, Review, Title, User
+from .models import (
+    Category, Comment, Genre, GenreToTitle, QueuedEmail, Review, Title,
+    TitleStats, User)
 
 
 site.register(Category)
 site.register(Comment)
 site.register(Genre)
-site.register(GenreTitle)
+site.register(GenreToTitle)
+site.register(QueuedEmail)
 site.register(Review)
 site.register(Title)
+site.register(TitleStats)
 site.register(User)
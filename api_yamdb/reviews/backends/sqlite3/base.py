@@ -0,0 +1,27 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с профилем настройки из OPTIONS (settings.SQLITE_OPTIONS).
+    pragmas выполняются на каждом новом соединении. transaction_mode
+    задает BEGIN транзакций: с IMMEDIATE транзакция сразу берет блокировку
+    записи и ждет ее busy_timeout, а не получает "database is locked" при
+    переходе от чтения к записи, пока пишет другой процесс.
+    """
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
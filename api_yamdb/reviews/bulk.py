@@ -0,0 +1,77 @@
+from collections import Counter
+
+from django.db import router, transaction
+
+from .cache import invalidate
+from .models import Comment, GenreToTitle, Review, Title, TitleStats
+from .search import get_search_backend
+
+
+def insert(model, objects):
+    """Вставляет объекты одним bulk_create и заполняет их id. Если база
+    данных не возвращает id из bulk_create (SQLite в Django 3.2), читает id
+    последних len(objects) строк: в транзакции запись в SQLite
+    сериализована, поэтому это строки, вставленные bulk_create, в том же
+    порядке.
+    """
+    model.objects.bulk_create(objects)
+    if objects and objects[0].pk is None:
+        pks = model.objects.using(router.db_for_write(model)).order_by(
+            '-pk').values_list('pk', flat=True)[:len(objects)]
+        for obj, pk in zip(objects, reversed(list(pks))):
+            obj.pk = pk
+
+
+@transaction.atomic
+def create_reviews(reviews):
+    """Создает отзывы одним bulk_create и обновляет то, что для одиночного
+    отзыва обновляют сигналы: рейтинг и статистику затронутых произведений
+    (по одному запросу на все произведения), поисковый индекс и кэш
+    ответов. Нарушение unique_review откатывает все отзывы.
+    """
+    insert(Review, reviews)
+    title_ids = {review.title_id for review in reviews}
+    if not title_ids:
+        return reviews
+    Title.objects.filter(pk__in=title_ids).recalculate_rating()
+    TitleStats.objects.filter(title_id__in=title_ids).rebuild()
+    get_search_backend().index_many('review', reviews)
+    invalidate('titles', *(f'title:{title_id}' for title_id in title_ids))
+    return reviews
+
+
+@transaction.atomic
+def create_comments(comments, review_titles):
+    """Создает комментарии одним bulk_create и обновляет счетчики
+    комментариев в статистике (по одному запросу на произведение),
+    поисковый индекс и кэш ответов. review_titles - id произведения каждого
+    отзыва.
+    """
+    insert(Comment, comments)
+    counts = Counter(review_titles[comment.review_id] for comment in comments)
+    for title_id, count in counts.items():
+        TitleStats.objects.filter(title_id=title_id).update_counts(
+            comments=count)
+    get_search_backend().index_many('comment', comments)
+    if counts:
+        invalidate('titles', *(f'title:{title_id}' for title_id in counts))
+    return comments
+
+
+@transaction.atomic
+def create_titles(titles, genre_ids):
+    """Создает произведения, их связи с жанрами и пустую статистику
+    bulk_create каждые, индексирует произведения для поиска и сбрасывает
+    кэш списков. genre_ids - список id жанров каждого произведения.
+    """
+    insert(Title, titles)
+    GenreToTitle.objects.bulk_create(
+        GenreToTitle(genre_id=genre_id, title_id=title.pk)
+        for title, title_genres in zip(titles, genre_ids)
+        for genre_id in title_genres)
+    TitleStats.objects.bulk_create(
+        TitleStats(title_id=title.pk) for title in titles)
+    get_search_backend().index_many('title', titles)
+    if titles:
+        invalidate('titles')
+    return titles
@@ -0,0 +1,60 @@
+import time
+from uuid import uuid4
+
+from django.core.cache import caches
+from django.db import transaction
+
+RESPONSE_CACHE_ALIAS: str = 'responses'
+VERSION_KEY_PREFIX: str = 'version:'
+LAST_WRITE_KEY: str = 'last_write'
+
+
+def get_response_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def get_versions(*groups):
+    """Возвращает текущие версии групп данных, например 'titles' или
+    'title:1'. Версия - случайный токен, а не счетчик: если ключ версии
+    вытеснен из кэша, новая версия не совпадет ни с одной из прежних и
+    устаревшие ответы не будут отданы.
+    """
+    cache = get_response_cache()
+    keys = [VERSION_KEY_PREFIX + group for group in groups]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = uuid4().hex
+            cache.add(key, version, timeout=None)
+            versions[key] = cache.get(key, version)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*groups):
+    """Меняет версии групп после фиксации текущей транзакции, чтобы
+    конкурентный запрос не закэшировал под новой версией старые данные.
+    """
+    def bump():
+        get_response_cache().set_many({
+            **{VERSION_KEY_PREFIX + group: uuid4().hex for group in groups},
+            LAST_WRITE_KEY: time.time()}, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def clear_response_cache():
+    """Сбрасывает все закэшированные ответы. Нужен после изменений в обход
+    сигналов моделей, например bulk_create и QuerySet.update.
+    """
+    def clear():
+        cache = get_response_cache()
+        cache.clear()
+        cache.set(LAST_WRITE_KEY, time.time(), timeout=None)
+
+    transaction.on_commit(clear)
+
+
+def written_within(seconds):
+    """Сбрасывался ли кэш записью за последние seconds секунд."""
+    last_write = get_response_cache().get(LAST_WRITE_KEY)
+    return last_write is not None and time.time() - last_write < seconds
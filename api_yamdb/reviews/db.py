@@ -0,0 +1,18 @@
+from django.core.signals import request_started
+from django.db import connections
+from django.dispatch import receiver
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Проверяет перед запросом постоянные соединения баз данных с
+    CONN_HEALTH_CHECKS (в Django 3.2 этого параметра нет). Соединение,
+    закрытое сервером или пулером, закрывается, и запрос открывает новое
+    вместо ошибки на первом SQL-запросе.
+    """
+    for connection in connections.all():
+        if (connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()):
+            connection.close()
@@ -0,0 +1,93 @@
+import csv
+from itertools import islice
+import json
+
+from .models import Comment, GenreToTitle, Review, Title
+
+CSV: str = 'csv'
+NDJSON: str = 'ndjson'
+EXPORT_FORMATS = (CSV, NDJSON)
+DEFAULT_CHUNK_SIZE: int = 2000
+
+# Ресурс: (queryset, колонки CSV в порядке static/data/<ресурс>.csv,
+# соответствующие им поля модели).
+EXPORT_RESOURCES = {
+    'titles': (
+        Title.objects.order_by('pk'),
+        ('id', 'name', 'year', 'category'),
+        ('id', 'name', 'year', 'category_id')),
+    'genre_title': (
+        GenreToTitle.objects.order_by('pk'),
+        ('id', 'title_id', 'genre_id'),
+        ('id', 'title_id', 'genre_id')),
+    'review': (
+        Review.objects.order_by('pk'),
+        ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+        ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date')),
+    'comments': (
+        Comment.objects.order_by('pk'),
+        ('id', 'review_id', 'text', 'author', 'pub_date'),
+        ('id', 'review_id', 'text', 'author_id', 'pub_date')),
+}
+
+
+class Echo:
+    """Объект с интерфейсом файла, который возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def format_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat(timespec='milliseconds').replace(
+            '+00:00', 'Z')
+    return value
+
+
+def iter_rows(resource, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Построчно читает ресурс через QuerySet.iterator(), не загружая
+    таблицу в память целиком.
+    """
+    queryset, columns, fields = EXPORT_RESOURCES[resource]
+    for row in queryset.values_list(*fields).iterator(chunk_size=chunk_size):
+        yield dict(zip(columns, map(format_value, row)))
+
+
+def iter_titles(chunk_size=DEFAULT_CHUNK_SIZE):
+    """Отдает произведения вместе со slug категории и жанров и рейтингом.
+    Жанры загружаются одним запросом на каждую порцию из chunk_size
+    произведений.
+    """
+    titles = Title.objects.order_by('pk').values(
+        'id', 'name', 'year', 'rating', 'description',
+        'category__slug').iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(titles, chunk_size))
+        if not chunk:
+            return
+        genres = {title['id']: [] for title in chunk}
+        links = GenreToTitle.objects.filter(
+            title_id__in=genres).order_by('pk').values_list(
+                'title_id', 'genre__slug')
+        for title_id, slug in links:
+            genres[title_id].append(slug)
+        for title in chunk:
+            title['category'] = title.pop('category__slug')
+            title['genre'] = genres[title['id']]
+            yield title
+
+
+def export_lines(resource, file_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Генератор строк выгрузки ресурса в формате CSV или NDJSON."""
+    if file_format == CSV:
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_RESOURCES[resource][1])
+        for row in iter_rows(resource, chunk_size):
+            yield writer.writerow(row.values())
+        return
+    rows = (
+        iter_titles(chunk_size) if resource == 'titles'
+        else iter_rows(resource, chunk_size))
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
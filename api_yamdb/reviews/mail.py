@@ -0,0 +1,110 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+MAIL_BATCH_SIZE: int = 100
+MAIL_MAX_ATTEMPTS: int = 5
+MAIL_RETRY_DELAY: timedelta = timedelta(minutes=1)
+MAIL_LEASE: timedelta = timedelta(minutes=10)
+MAIL_ERRORS = (OSError, SMTPException)
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Ставит письмо в очередь вместо отправки. Вызванная внутри транзакции,
+    запись в очередь фиксируется или откатывается вместе с ней.
+    """
+    QueuedEmail.objects.bulk_create(
+        QueuedEmail(
+            from_email=from_email,
+            message=message,
+            recipient=recipient,
+            subject=subject)
+        for recipient in recipient_list)
+
+
+def claim_queued_mail(batch_size, lease):
+    """Забирает порцию писем, срок отправки которых наступил, в короткой
+    транзакции: помечает их как отправляемые и переносит следующую попытку
+    на окончание аренды. Письма процесса, упавшего во время отправки,
+    снова забираются после окончания аренды.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True).filter(
+                next_attempt__lte=now,
+                status__in=(QueuedEmail.PENDING, QueuedEmail.SENDING),
+            ).order_by('next_attempt', 'id')[:batch_size])
+        QueuedEmail.objects.filter(
+            pk__in=[email.pk for email in emails],
+        ).update(next_attempt=now + lease, status=QueuedEmail.SENDING)
+    return emails
+
+
+def deliver(emails):
+    """Отправляет письма через одно соединение почтового бэкенда и
+    возвращает ошибки отправки по id писем. Если соединение не открылось,
+    ошибка записывается всем письмам.
+    """
+    connection = get_connection()
+    try:
+        connection.open()
+    except MAIL_ERRORS as error:
+        return {email.pk: error for email in emails}
+    errors = {}
+    try:
+        for email in emails:
+            try:
+                EmailMessage(
+                    body=email.message,
+                    connection=connection,
+                    from_email=email.from_email,
+                    subject=email.subject,
+                    to=[email.recipient]).send()
+            except MAIL_ERRORS as error:
+                errors[email.pk] = error
+    finally:
+        try:
+            connection.close()
+        except MAIL_ERRORS:
+            pass
+    return errors
+
+
+def send_queued_mail(batch_size=MAIL_BATCH_SIZE,
+                     max_attempts=MAIL_MAX_ATTEMPTS,
+                     retry_delay=MAIL_RETRY_DELAY,
+                     lease=MAIL_LEASE):
+    """Отправляет порцию писем через одно соединение почтового бэкенда.
+    Письма забираются и результаты записываются в коротких транзакциях, а
+    сама отправка идет вне транзакции и не держит блокировку базы данных.
+    Неотправленное письмо, в том числе при недоступном почтовом сервере,
+    откладывается с экспоненциально растущей задержкой, после max_attempts
+    попыток помечается как недоставленное. Возвращает количество
+    отправленных и неотправленных писем.
+    """
+    emails = claim_queued_mail(batch_size, lease)
+    if not emails:
+        return 0, 0
+    errors = deliver(emails)
+    now = timezone.now()
+    for email in emails:
+        email.attempts += 1
+        error = errors.get(email.pk)
+        if error is None:
+            email.status = QueuedEmail.SENT
+            continue
+        email.last_error = f'{type(error).__name__}: {error}'
+        email.next_attempt = now + retry_delay * 2 ** (email.attempts - 1)
+        email.status = (
+            QueuedEmail.FAILED if email.attempts >= max_attempts
+            else QueuedEmail.PENDING)
+    with transaction.atomic():
+        QueuedEmail.objects.bulk_update(
+            emails, ('attempts', 'last_error', 'next_attempt', 'status'))
+    return len(emails) - len(errors), len(errors)
@@ -0,0 +1,41 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from reviews.export import (
+    CSV, DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, EXPORT_RESOURCES, export_lines)
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает произведения, связи с жанрами, отзывы или '
+        'комментарии в CSV (формат static/data) или NDJSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'resource',
+            choices=tuple(EXPORT_RESOURCES))
+        parser.add_argument(
+            '--format',
+            choices=EXPORT_FORMATS,
+            default=CSV,
+            dest='file_format')
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки; по умолчанию - стандартный вывод.')
+        parser.add_argument(
+            '--chunk-size',
+            default=DEFAULT_CHUNK_SIZE,
+            type=int,
+            help='Количество строк, читаемых из базы данных за раз.')
+
+    def handle(self, *args, **options):
+        lines = export_lines(
+            options['resource'], options['file_format'],
+            options['chunk_size'])
+        if options['output'] is None:
+            sys.stdout.writelines(lines)
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as file:
+            file.writelines(lines)
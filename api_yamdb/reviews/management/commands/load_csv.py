@@ -0,0 +1,178 @@
+import csv
+from itertools import islice
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils.dateparse import parse_datetime
+
+from reviews.cache import clear_response_cache
+from reviews.models import (
+    BaseGroupModel, Category, Comment, Genre, GenreToTitle, Review, Title,
+    TitleStats, User)
+from reviews.search import get_search_backend
+
+DEFAULT_BATCH_SIZE: int = 1000
+DEFAULT_DATA_PATH = os.path.join(settings.BASE_DIR, 'static', 'data')
+
+# auto_now_add заменяет pub_date при вставке, поэтому даты из CSV этих
+# моделей записываются отдельным запросом после bulk_create.
+DATED_MODELS = (Review, Comment)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает данные из CSV-файлов static/data в базу данных пакетами '
+        'bulk_create, по одной транзакции на таблицу.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DEFAULT_DATA_PATH,
+            help='Папка с CSV-файлами.')
+        parser.add_argument(
+            '--batch-size',
+            default=DEFAULT_BATCH_SIZE,
+            type=int,
+            help='Количество строк в одном INSERT.')
+
+    def handle(self, *args, **options):
+        self.path = options['path']
+        self.batch_size = options['batch_size']
+        # id из CSV переносятся в базу со сдвигом на максимальный
+        # существующий первичный ключ таблицы, поэтому внешние ключи
+        # разрешаются без хранения соответствия id для каждой строки.
+        self.offsets = {}
+        self.password = make_password(None)
+        self.load('users', User, self.build_user)
+        self.load('category', Category, self.build_group)
+        self.load('genre', Genre, self.build_group)
+        self.load('titles', Title, self.build_title)
+        self.load('genre_title', GenreToTitle, self.build_genre_title)
+        self.load(
+            'review', Review, self.build_review,
+            after=Title.objects.recalculate_rating)
+        self.load('comments', Comment, self.build_comment)
+        # bulk_create не отправляет сигналы, поэтому статистика, индекс и
+        # кэш ответов обновляются целиком.
+        with transaction.atomic():
+            TitleStats.objects.create_missing(Title.objects.all())
+            TitleStats.objects.rebuild()
+            get_search_backend().rebuild()
+        clear_response_cache()
+
+    def pk(self, table, csv_id):
+        return int(csv_id) + self.offsets.get(table, 0)
+
+    def load(self, table, model, build, after=None):
+        file_path = os.path.join(self.path, f'{table}.csv')
+        if not os.path.exists(file_path):
+            self.stdout.write(self.style.WARNING(f'{table}: файл не найден'))
+            return
+        offset_model = (
+            BaseGroupModel if issubclass(model, BaseGroupModel) else model)
+        start = time.perf_counter()
+        with open(file_path, encoding='utf-8', newline='') as file:
+            with transaction.atomic():
+                self.load_file(table, model, build, file, offset_model)
+                if after is not None:
+                    after()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{table}: {self.rows} строк за {elapsed:.2f} с '
+            f'({self.rows / elapsed:.0f} строк/с)'))
+
+    def load_file(self, table, model, build, file, offset_model):
+        self.offsets[table] = offset_model.objects.aggregate(
+            max_pk=Max('pk'))['max_pk'] or 0
+        self.rows = 0
+        reader = csv.DictReader(file)
+        while True:
+            objs = [
+                build(table, row)
+                for row in islice(reader, self.batch_size)]
+            if not objs:
+                break
+            self.insert(model, objs)
+            self.rows += len(objs)
+        self.reset_sequences(offset_model, model)
+
+    def insert(self, model, objs):
+        if not issubclass(model, BaseGroupModel):
+            dated = model in DATED_MODELS
+            pub_dates = [obj.pub_date for obj in objs] if dated else ()
+            model.objects.bulk_create(objs)
+            if dated:
+                for obj, pub_date in zip(objs, pub_dates):
+                    obj.pub_date = pub_date
+                model.objects.bulk_update(objs, ('pub_date',))
+            return
+        # bulk_create не поддерживает наследование с несколькими таблицами:
+        # строки родителя вставляются пакетом, ссылки потомка - executemany.
+        BaseGroupModel.objects.bulk_create(objs)
+        quote = connection.ops.quote_name
+        ptr = model._meta.pk.column
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {quote(model._meta.db_table)} '
+                f'({quote(ptr)}) VALUES (%s)',
+                [(obj.pk,) for obj in objs])
+
+    def reset_sequences(self, *models):
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    def build_user(self, table, row):
+        return User(
+            bio=row['bio'],
+            email=row['email'],
+            first_name=row['first_name'],
+            id=self.pk(table, row['id']),
+            last_name=row['last_name'],
+            password=self.password,
+            role=row['role'],
+            username=row['username'])
+
+    def build_group(self, table, row):
+        return BaseGroupModel(
+            id=self.pk(table, row['id']),
+            name=row['name'],
+            slug=row['slug'])
+
+    def build_title(self, table, row):
+        return Title(
+            category_id=(
+                self.pk('category', row['category'])
+                if row['category'] else None),
+            id=self.pk(table, row['id']),
+            name=row['name'],
+            year=row['year'])
+
+    def build_genre_title(self, table, row):
+        return GenreToTitle(
+            genre_id=self.pk('genre', row['genre_id']),
+            id=self.pk(table, row['id']),
+            title_id=self.pk('titles', row['title_id']))
+
+    def build_review(self, table, row):
+        return Review(
+            author_id=self.pk('users', row['author']),
+            id=self.pk(table, row['id']),
+            pub_date=parse_datetime(row['pub_date']),
+            score=row['score'],
+            text=row['text'],
+            title_id=self.pk('titles', row['title_id']))
+
+    def build_comment(self, table, row):
+        return Comment(
+            author_id=self.pk('users', row['author']),
+            id=self.pk(table, row['id']),
+            pub_date=parse_datetime(row['pub_date']),
+            review_id=self.pk('review', row['review_id']),
+            text=row['text'])
@@ -0,0 +1,62 @@
+import json
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.v1.profiling import PROFILE_METRICS, PROFILE_PERCENTILES
+
+COLUMNS = (*(f'p{percent}' for percent in PROFILE_PERCENTILES), 'max')
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит перцентили количества и времени SQL-запросов, времени '
+        'сериализаторов и времени ответа по маршрутам API. Замеры '
+        'записывает ProfilingMiddleware при PROFILING_ENABLED=1; они '
+        'хранятся в памяти процесса сервера и читаются из его '
+        'api/v1/profiling/.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            required=True,
+            help='Адрес api/v1/profiling/ работающего сервера.')
+        parser.add_argument(
+            '--token',
+            help='Access token пользователя с правами администратора.')
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Вывести отчет в JSON.')
+
+    def fetch_report(self, url, token):
+        request = Request(url, headers={'Accept': 'application/json'})
+        if token:
+            request.add_header('Authorization', f'Bearer {token}')
+        try:
+            with urlopen(request) as response:
+                return json.load(response)
+        except HTTPError as error:
+            raise CommandError(
+                f'Сервер {url} ответил со статусом {error.code}.')
+        except URLError as error:
+            raise CommandError(
+                f'Не удалось подключиться к {url}: {error.reason}.')
+
+    def handle(self, *args, **options):
+        report = self.fetch_report(options['url'], options['token'])
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        self.stdout.write(
+            f'{"маршрут":<24} {"метрика":<16} {"запросов":>8} '
+            + ' '.join(f'{column:>9}' for column in COLUMNS))
+        for route, route_report in report.items():
+            for metric in PROFILE_METRICS:
+                values = ' '.join(
+                    f'{route_report[metric][column]:>9.2f}'
+                    for column in COLUMNS)
+                self.stdout.write(
+                    f'{route:<24} {metric:<16} '
+                    f'{route_report["requests"]:>8} {values}')
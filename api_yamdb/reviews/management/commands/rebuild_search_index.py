@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.cache import clear_response_cache
+from reviews.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает полнотекстовый индекс произведений, отзывов и '
+        'комментариев.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            get_search_backend().rebuild()
+            clear_response_cache()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.cache import clear_response_cache
+from reviews.models import Title, TitleStats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает статистику произведений: гистограмму оценок и '
+        'количество отзывов и комментариев.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids',
+            nargs='*',
+            type=int,
+            help='id произведений; по умолчанию - все произведения.')
+
+    def handle(self, *args, **options):
+        titles = Title.objects.all()
+        if options['title_ids']:
+            titles = titles.filter(pk__in=options['title_ids'])
+        with transaction.atomic():
+            TitleStats.objects.create_missing(titles)
+            updated = TitleStats.objects.filter(title__in=titles).rebuild()
+            clear_response_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика пересчитана для произведений: {updated}'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.cache import clear_response_cache
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает хранимый рейтинг произведений по их отзывам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids',
+            nargs='*',
+            type=int,
+            help='id произведений; по умолчанию - все произведения.')
+
+    def handle(self, *args, **options):
+        titles = Title.objects.all()
+        if options['title_ids']:
+            titles = titles.filter(pk__in=options['title_ids'])
+        with transaction.atomic():
+            updated = titles.recalculate_rating()
+            clear_response_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для произведений: {updated}'))
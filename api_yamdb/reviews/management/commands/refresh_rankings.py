@@ -0,0 +1,50 @@
+from datetime import timedelta
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.cache import clear_response_cache
+from reviews.rankings import refresh_rankings, TRENDING_WINDOW
+
+
+class Command(BaseCommand):
+    help = (
+        'Обновляет материализованный рейтинг лучших и популярных '
+        'произведений. По умолчанию пересчитывает только произведения, '
+        'изменившиеся с прошлого обновления.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать все произведения.')
+        parser.add_argument(
+            '--window-days',
+            default=TRENDING_WINDOW.days,
+            type=float,
+            help='Период, отзывы за который определяют популярность, дней.')
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а обновлять рейтинг каждые --interval '
+                 'секунд.')
+        parser.add_argument(
+            '--interval',
+            default=300.0,
+            type=float,
+            help='Пауза между обновлениями в режиме --loop, секунд.')
+
+    def handle(self, *args, **options):
+        window = timedelta(days=options['window_days'])
+        full = options['full']
+        while True:
+            start = time.perf_counter()
+            refreshed = refresh_rankings(full=full, window=window)
+            clear_response_cache()
+            self.stdout.write(self.style.SUCCESS(
+                f'Рейтинг обновлен для произведений: {refreshed} за '
+                f'{time.perf_counter() - start:.2f} с'))
+            if not options['loop']:
+                return
+            full = False
+            time.sleep(options['interval'])
@@ -0,0 +1,30 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует базу данных default SQLite в файлы реплик DB_REPLICAS. '
+        'Заменяет репликацию при локальной проверке чтения из реплик.')
+
+    def handle(self, *args, **options):
+        source = connections[DEFAULT_DB_ALIAS]
+        if source.vendor != 'sqlite':
+            raise CommandError('База данных default должна быть SQLite.')
+        source.ensure_connection()
+        copied = 0
+        for alias in settings.DATABASE_READ_ALIASES:
+            name = str(connections[alias].settings_dict['NAME'])
+            if name == str(source.settings_dict['NAME']):
+                continue
+            target = sqlite3.connect(name, uri=True)
+            try:
+                source.connection.backup(target)
+            finally:
+                target.close()
+            copied += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'База данных скопирована в реплики: {copied}'))
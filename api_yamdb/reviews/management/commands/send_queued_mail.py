@@ -0,0 +1,59 @@
+from datetime import timedelta
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.mail import (
+    MAIL_BATCH_SIZE, MAIL_MAX_ATTEMPTS, MAIL_RETRY_DELAY, send_queued_mail)
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди порциями через одно соединение '
+        'почтового бэкенда.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=MAIL_BATCH_SIZE,
+            type=int,
+            help='Количество писем в одной порции.')
+        parser.add_argument(
+            '--max-attempts',
+            default=MAIL_MAX_ATTEMPTS,
+            type=int,
+            help='Количество попыток до пометки письма недоставленным.')
+        parser.add_argument(
+            '--retry-delay',
+            default=MAIL_RETRY_DELAY.total_seconds(),
+            type=float,
+            help='Задержка перед первой повторной попыткой, секунд.')
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval '
+                 'секунд.')
+        parser.add_argument(
+            '--interval',
+            default=5.0,
+            type=float,
+            help='Пауза между проверками очереди в режиме --loop, секунд.')
+
+    def handle(self, *args, **options):
+        while True:
+            self.drain(options)
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
+
+    def drain(self, options):
+        while True:
+            sent, failed = send_queued_mail(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+                retry_delay=timedelta(seconds=options['retry_delay']))
+            if not sent and not failed:
+                return
+            self.stdout.write(
+                f'Отправлено писем: {sent}, отложено или не доставлено: '
+                f'{failed}')
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+SEARCH_DOCUMENTS = (
+    (1, 'title', 'reviews_title', "name || ' ' || COALESCE(description, '')"),
+    (2, 'review', 'reviews_review', 'text'),
+    (3, 'comment', 'reviews_comment', 'text'))
+SEARCH_SQL = {
+    'sqlite': {
+        'create': (
+            'CREATE VIRTUAL TABLE IF NOT EXISTS reviews_search USING fts5('
+            "kind UNINDEXED, body, "
+            "tokenize = 'unicode61 remove_diacritics 2')",),
+        'fill': (
+            'INSERT INTO reviews_search (rowid, kind, body) '
+            "SELECT id * 4 + {code}, '{kind}', {document} FROM {table}"),
+    },
+    'postgresql': {
+        'create': (
+            'CREATE TABLE IF NOT EXISTS reviews_search ('
+            'rowid bigint PRIMARY KEY, kind varchar(16) NOT NULL, '
+            'document tsvector NOT NULL)',
+            'CREATE INDEX IF NOT EXISTS reviews_search_document_idx '
+            'ON reviews_search USING GIN (document)'),
+        'fill': (
+            'INSERT INTO reviews_search (rowid, kind, document) '
+            "SELECT id * 4 + {code}, '{kind}', "
+            "to_tsvector('russian', {document}) FROM {table}"),
+    },
+}
+
+
+def create_search_index(apps, schema_editor):
+    sql = SEARCH_SQL.get(schema_editor.connection.vendor)
+    if sql is None:
+        return
+    for statement in sql['create']:
+        schema_editor.execute(statement)
+    for code, kind, table, document in SEARCH_DOCUMENTS:
+        schema_editor.execute(sql['fill'].format(
+            code=code, document=document, kind=kind, table=table))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in SEARCH_SQL:
+        schema_editor.execute('DROP TABLE IF EXISTS reviews_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_user_token_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
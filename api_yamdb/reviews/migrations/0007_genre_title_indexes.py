@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='genretotitle',
+            index=models.Index(fields=['genre', 'title'], name='genre_title_genre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='genretotitle',
+            index=models.Index(fields=['title', 'genre'], name='genre_title_title_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2 on 2026-10-18 00:41
+
+from itertools import islice
+
+from django.db import migrations, models
+from django.db.models import Min
+
+BATCH_SIZE = 5000
+
+
+def remove_duplicate_links(apps, schema_editor):
+    GenreToTitle = apps.get_model('reviews', 'GenreToTitle')
+    first_ids = GenreToTitle.objects.order_by().values(
+        'title', 'genre').annotate(first_id=Min('id')).values('first_id')
+    GenreToTitle.objects.exclude(id__in=first_ids).delete()
+
+
+def merge_genre_title(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    GenreToTitle = apps.get_model('reviews', 'GenreToTitle')
+    links = GenreTitle.objects.order_by('id').values_list(
+        'title_id', 'genre_id').iterator(chunk_size=BATCH_SIZE)
+    while True:
+        batch = [
+            GenreToTitle(title_id=title_id, genre_id=genre_id)
+            for title_id, genre_id in islice(links, BATCH_SIZE)]
+        if not batch:
+            break
+        GenreToTitle.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_genre_title_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_links, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='genretotitle',
+            name='genre_title_title_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='genretotitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_genre_title'),
+        ),
+        migrations.RunPython(merge_genre_title, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='GenreTitle',
+        ),
+    ]
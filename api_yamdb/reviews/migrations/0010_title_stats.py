@@ -0,0 +1,67 @@
+# Generated by Django 3.2 on 2026-10-18 00:48
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+BATCH_SIZE = 5000
+
+
+def fill_title_stats(apps, schema_editor):
+    Comment = apps.get_model('reviews', 'Comment')
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    TitleStats = apps.get_model('reviews', 'TitleStats')
+    TitleStats.objects.bulk_create(
+        (TitleStats(title_id=title_id) for title_id in
+         Title.objects.values_list('pk', flat=True).iterator()),
+        batch_size=BATCH_SIZE)
+    reviews = Review.objects.filter(
+        title=OuterRef('title')).order_by().values('title')
+    comments = Comment.objects.filter(
+        review__title=OuterRef('title')).order_by().values('review__title')
+
+    def count(queryset):
+        return Coalesce(
+            Subquery(queryset.annotate(total=Count('pk')).values('total')),
+            Value(0))
+
+    TitleStats.objects.update(
+        comment_count=count(comments),
+        review_count=count(reviews),
+        **{f'score_{score}': count(reviews.filter(score=score))
+           for score in range(1, 11)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_updated_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('comment_count', models.PositiveIntegerField(default=0, verbose_name='Количество комментариев')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='Оценок 1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='Оценок 2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='Оценок 3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='Оценок 4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='Оценок 5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='Оценок 6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='Оценок 7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='Оценок 8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='Оценок 9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='Оценок 10')),
+            ],
+            options={
+                'verbose_name': 'Статистика произведения',
+                'verbose_name_plural': 'Статистика произведений',
+            },
+        ),
+        migrations.RunPython(fill_title_stats, migrations.RunPython.noop),
+    ]
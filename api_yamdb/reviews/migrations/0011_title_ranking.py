@@ -0,0 +1,52 @@
+# Generated by Django 3.2 on 2026-10-18 00:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.FloatField(verbose_name='Байесовский рейтинг')),
+                ('rating_count', models.PositiveIntegerField(verbose_name='Количество оценок')),
+                ('rating_sum', models.PositiveIntegerField(verbose_name='Сумма оценок')),
+                ('refreshed', models.DateTimeField(verbose_name='Дата обновления')),
+                ('trending', models.PositiveIntegerField(verbose_name='Отзывов за период')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reviews.category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг произведения',
+                'verbose_name_plural': 'Рейтинги произведений',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['genre', 'category', '-rating', 'title'], name='ranking_category_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['genre', '-rating', 'title'], name='ranking_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['genre', 'category', '-trending', '-rating', 'title'], name='ranking_category_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['genre', '-trending', '-rating', 'title'], name='ranking_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['refreshed'], name='ranking_refreshed_idx'),
+        ),
+    ]
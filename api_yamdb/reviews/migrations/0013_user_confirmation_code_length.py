@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_review_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='confirmation_code',
+            field=models.CharField(blank=True, max_length=64, null=True, verbose_name='Код подтверждения'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 01:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0013_user_confirmation_code_length'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='queuedemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'ожидает отправки'), ('sending', 'отправляется'), ('sent', 'отправлено'), ('failed', 'не доставлено')], default='pending', max_length=7, verbose_name='Статус'),
+        ),
+    ]
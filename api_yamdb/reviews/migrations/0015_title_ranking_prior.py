@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0014_queued_email_sending'),
+    ]
+
+    operations = [
+        # Строки без сохраненной средней оценки пересчитает первое же
+        # обновление рейтинга: она отличается от текущей.
+        migrations.AddField(
+            model_name='titleranking',
+            name='prior',
+            field=models.FloatField(default=-1, verbose_name='Средняя оценка, к которой сглажен рейтинг'),
+            preserve_default=False,
+        ),
+    ]
@@ -1,21 +1,39 @@
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import router
 from django.db.models import (
     CASCADE,
+    Case,
     CharField,
+    Count,
     DateTimeField,
     EmailField,
+    F,
+    FloatField,
     ForeignKey,
+    Index,
     IntegerField,
     ManyToManyField,
     Model,
+    OneToOneField,
+    OuterRef,
+    PositiveIntegerField,
     PositiveSmallIntegerField,
+    QuerySet,
     SET_NULL,
     SlugField,
+    Subquery,
+    Sum,
     TextField,
-    UniqueConstraint)
-
+    UniqueConstraint,
+    Value,
+    When)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+REVIEW_SCORES = range(1, 11)
+STATS_BATCH_SIZE: int = 5000
 USER_EMAIL_MAX_LENGTH: int = 254
 USER_USERNAME_MAX_LENGTH: int = 150
 
@@ -64,8 +82,48 @@ class Genre(BaseGroupModel):
         verbose_name_plural = 'Жанры'
 
 
+class TitleQuerySet(QuerySet):
+
+    def update_rating(self, score_delta, count_delta):
+        """Одним UPDATE сдвигает сумму и количество оценок произведений
+        на указанные величины и пересчитывает по ним рейтинг.
+        """
+        rating_sum = F('rating_sum') + score_delta
+        rating_count = F('rating_count') + count_delta
+        return self.update(
+            rating=Case(
+                When(
+                    rating_count__gt=-count_delta,
+                    then=rating_sum / rating_count),
+                default=None),
+            rating_count=rating_count,
+            rating_sum=rating_sum)
+
+    def recalculate_rating(self):
+        """Пересчитывает рейтинг произведений по всем их отзывам."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')).order_by().values('title')
+        self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values(
+                    'total')),
+                Value(0)),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values(
+                    'total')),
+                Value(0)))
+        return (
+            self.filter(rating_count=0).update(rating=None)
+            + self.filter(rating_count__gt=0).update(
+                rating=F('rating_sum') / F('rating_count')))
+
+
 class Title(Model):
-    """Модель произведений."""
+    """Модель произведений.
+    Поля rating_sum и rating_count хранят сумму и количество оценок из
+    отзывов, rating - их целочисленное среднее. Поля поддерживаются
+    сигналами Review и могут быть пересчитаны командой recalculate_ratings.
+    """
     category = ForeignKey(
         Category,
         blank=True,
@@ -86,9 +144,25 @@ class Title(Model):
     name = CharField(
         max_length=100,
         verbose_name='Название')
+    rating = PositiveSmallIntegerField(
+        blank=True,
+        editable=False,
+        null=True,
+        verbose_name='Рейтинг')
+    rating_count = PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок')
+    rating_sum = PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок')
     year = IntegerField('Год издания')
 
+    objects = TitleQuerySet.as_manager()
+
     class Meta:
+        indexes = [Index(fields=('name', 'id'), name='title_name_id_idx')]
         ordering = ('name',)
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
@@ -98,10 +172,21 @@ class Title(Model):
 
 
 class GenreToTitle(Model):
-    """Модель связывающая произведения с жанром."""
+    """Модель связывающая произведения с жанром. Уникальный индекс
+    (title, genre) обслуживает жанры произведения, индекс (genre, title) -
+    произведения жанра.
+    """
     title = ForeignKey(Title, on_delete=CASCADE)
     genre = ForeignKey(Genre, on_delete=CASCADE)
 
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_genre_title')]
+        indexes = [
+            Index(fields=('genre', 'title'), name='genre_title_genre_idx')]
+
     def __str__(self):
         return f'{self.title} {self.genre}'
 
@@ -117,6 +202,7 @@ class User(AbstractUser):
         (MODERATOR, 'модератор'),
         (ADMIN, 'администратор'),
         (SUPERUSER, 'суперпользователь')]
+    ROLE_CLAIM_FIELDS = ('role', 'is_staff', 'is_superuser')
     bio = TextField(
         blank=True,
         null=True,
@@ -125,7 +211,7 @@ class User(AbstractUser):
     confirmation_code = CharField(
         blank=True,
         null=True,
-        max_length=32,
+        max_length=64,
         verbose_name='Код подтверждения')
     email = EmailField(
         max_length=USER_EMAIL_MAX_LENGTH,
@@ -136,6 +222,10 @@ class User(AbstractUser):
         default=USER,
         max_length=role_max_length(ROLE_CHOICES),
         verbose_name='Статус на сайте')
+    token_version = PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия токенов')
     username = CharField(
         max_length=USER_USERNAME_MAX_LENGTH,
         unique=True,
@@ -150,6 +240,29 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        """При изменении роли или флагов is_staff/is_superuser увеличивает
+        версию токенов: выданные ранее токены с прежними значениями в
+        подписанных claims перестают приниматься. QuerySet.update обходит
+        save(), поэтому менять эти поля нужно через save().
+        """
+        fields = self.ROLE_CLAIM_FIELDS
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            fields = [name for name in fields if name in update_fields]
+        if not self._state.adding and fields:
+            using = kwargs.get('using') or router.db_for_write(
+                type(self), instance=self)
+            stored = type(self)._default_manager.using(using).filter(
+                pk=self.pk).values('token_version', *fields).first()
+            if stored is not None and any(
+                    stored[name] != getattr(self, name) for name in fields):
+                self.token_version = stored['token_version'] + 1
+                if update_fields is not None:
+                    kwargs['update_fields'] = {
+                        *update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+
     @property
     def is_user_role(self):
         return self.role == self.USER
@@ -167,24 +280,6 @@ class User(AbstractUser):
         return self.role == self.SUPERUSER
 
 
-class GenreTitle(Model):
-    """Модель связи жанров и произведений."""
-    genre = ForeignKey(
-        Genre,
-        on_delete=CASCADE,
-        related_name='titles')
-    title = ForeignKey(
-        Title,
-        on_delete=CASCADE,
-        related_name='genres')
-
-    class Meta:
-        ordering = ('id',)
-
-    def __str__(self):
-        return str(self.id)
-
-
 class Review(Model):
     """Модель отзывов."""
     author = ForeignKey(
@@ -208,17 +303,36 @@ class Review(Model):
         on_delete=CASCADE,
         related_name='reviews',
         verbose_name='Произведение')
+    updated = DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения')
 
     class Meta:
         constraints = [
             UniqueConstraint(
                 fields=['author', 'title'],
                 name='unique_review')]
-        ordering = ('-pub_date',)
+        indexes = [
+            Index(
+                fields=('author', '-pub_date', '-id'),
+                name='review_author_history_idx'),
+            Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx'),
+            Index(
+                fields=('title', 'updated'),
+                name='review_title_updated_idx')]
+        ordering = ('-pub_date', '-id')
 
     def __str__(self):
         return self.text
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_score = instance.__dict__.get('score')
+        return instance
+
 
 class Comment(Model):
     """Модель комментариев."""
@@ -238,9 +352,224 @@ class Comment(Model):
     text = TextField(
         max_length=256,
         verbose_name='Текст')
+    updated = DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения')
 
     class Meta:
-        ordering = ('-pub_date',)
+        indexes = [
+            Index(
+                fields=('author', '-pub_date', '-id'),
+                name='comment_author_history_idx'),
+            Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx'),
+            Index(
+                fields=('review', 'updated'),
+                name='comment_review_updated_idx')]
+        ordering = ('-pub_date', '-id')
 
     def __str__(self):
         return self.text
+
+
+class TitleStatsQuerySet(QuerySet):
+
+    def update_counts(self, scores=None, reviews=0, comments=0):
+        """Одним UPDATE сдвигает счетчики оценок (словарь оценка:
+        приращение), отзывов и комментариев на указанные величины.
+        """
+        changes = {
+            f'score_{score}': F(f'score_{score}') + delta
+            for score, delta in (scores or {}).items() if delta}
+        if reviews:
+            changes['review_count'] = F('review_count') + reviews
+        if comments:
+            changes['comment_count'] = F('comment_count') + comments
+        return self.update(**changes) if changes else 0
+
+    def create_missing(self, titles):
+        """Создает пустую статистику произведений, у которых ее нет."""
+        title_ids = titles.filter(stats=None).values_list(
+            'pk', flat=True).iterator(chunk_size=STATS_BATCH_SIZE)
+        self.bulk_create(
+            (TitleStats(title_id=title_id) for title_id in title_ids),
+            batch_size=STATS_BATCH_SIZE)
+
+    def rebuild(self):
+        """Пересчитывает статистику произведений по их отзывам и
+        комментариям.
+        """
+        reviews = Review.objects.filter(
+            title=OuterRef('title')).order_by().values('title')
+        comments = Comment.objects.filter(
+            review__title=OuterRef('title')).order_by().values(
+                'review__title')
+
+        def count(queryset):
+            return Coalesce(
+                Subquery(queryset.annotate(total=Count('pk')).values(
+                    'total')),
+                Value(0))
+
+        return self.update(
+            comment_count=count(comments),
+            review_count=count(reviews),
+            **{f'score_{score}': count(reviews.filter(score=score))
+               for score in REVIEW_SCORES})
+
+
+class TitleStats(Model):
+    """Статистика отзывов произведения: гистограмма оценок и количество
+    отзывов и комментариев. Поддерживается сигналами Review и Comment и
+    может быть пересчитана командой rebuild_title_stats.
+    """
+    title = OneToOneField(
+        Title,
+        on_delete=CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Произведение')
+    comment_count = PositiveIntegerField(
+        default=0,
+        verbose_name='Количество комментариев')
+    review_count = PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов')
+    score_1 = PositiveIntegerField(default=0, verbose_name='Оценок 1')
+    score_2 = PositiveIntegerField(default=0, verbose_name='Оценок 2')
+    score_3 = PositiveIntegerField(default=0, verbose_name='Оценок 3')
+    score_4 = PositiveIntegerField(default=0, verbose_name='Оценок 4')
+    score_5 = PositiveIntegerField(default=0, verbose_name='Оценок 5')
+    score_6 = PositiveIntegerField(default=0, verbose_name='Оценок 6')
+    score_7 = PositiveIntegerField(default=0, verbose_name='Оценок 7')
+    score_8 = PositiveIntegerField(default=0, verbose_name='Оценок 8')
+    score_9 = PositiveIntegerField(default=0, verbose_name='Оценок 9')
+    score_10 = PositiveIntegerField(default=0, verbose_name='Оценок 10')
+
+    objects = TitleStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    def __str__(self):
+        return str(self.title_id)
+
+    @property
+    def histogram(self):
+        return {
+            score: getattr(self, f'score_{score}') for score in REVIEW_SCORES}
+
+
+class TitleRanking(Model):
+    """Материализованный рейтинг произведения для выборок лучших и
+    популярных. Для каждого произведения хранится строка без жанра и по
+    строке на каждый его жанр, поэтому выборка по категории и жанру читает
+    страницу прямо из индекса. Таблицу обновляет команда refresh_rankings.
+    """
+    category = ForeignKey(
+        Category,
+        blank=True,
+        null=True,
+        on_delete=SET_NULL,
+        related_name='+',
+        verbose_name='Категория')
+    genre = ForeignKey(
+        Genre,
+        blank=True,
+        null=True,
+        on_delete=CASCADE,
+        related_name='+',
+        verbose_name='Жанр')
+    prior = FloatField(
+        verbose_name='Средняя оценка, к которой сглажен рейтинг')
+    rating = FloatField(
+        verbose_name='Байесовский рейтинг')
+    rating_count = PositiveIntegerField(
+        verbose_name='Количество оценок')
+    rating_sum = PositiveIntegerField(
+        verbose_name='Сумма оценок')
+    refreshed = DateTimeField(
+        verbose_name='Дата обновления')
+    title = ForeignKey(
+        Title,
+        on_delete=CASCADE,
+        related_name='rankings',
+        verbose_name='Произведение')
+    trending = PositiveIntegerField(
+        verbose_name='Отзывов за период')
+
+    class Meta:
+        indexes = [
+            Index(
+                fields=('genre', 'category', '-rating', 'title'),
+                name='ranking_category_top_idx'),
+            Index(
+                fields=('genre', '-rating', 'title'),
+                name='ranking_top_idx'),
+            Index(
+                fields=('genre', 'category', '-trending', '-rating', 'title'),
+                name='ranking_category_trending_idx'),
+            Index(
+                fields=('genre', '-trending', '-rating', 'title'),
+                name='ranking_trending_idx'),
+            Index(fields=('refreshed',), name='ranking_refreshed_idx')]
+        verbose_name = 'Рейтинг произведения'
+        verbose_name_plural = 'Рейтинги произведений'
+
+    def __str__(self):
+        return f'{self.title_id} {self.genre_id}'
+
+
+class QueuedEmail(Model):
+    """Модель письма в очереди на отправку."""
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'ожидает отправки'),
+        (SENDING, 'отправляется'),
+        (SENT, 'отправлено'),
+        (FAILED, 'не доставлено')]
+    attempts = PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки')
+    created = DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания')
+    from_email = EmailField(
+        max_length=USER_EMAIL_MAX_LENGTH,
+        verbose_name='Отправитель')
+    last_error = TextField(
+        blank=True,
+        verbose_name='Последняя ошибка')
+    message = TextField(
+        verbose_name='Текст')
+    next_attempt = DateTimeField(
+        default=timezone.now,
+        verbose_name='Следующая попытка')
+    recipient = EmailField(
+        max_length=USER_EMAIL_MAX_LENGTH,
+        verbose_name='Получатель')
+    status = CharField(
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        max_length=role_max_length(STATUS_CHOICES),
+        verbose_name='Статус')
+    subject = CharField(
+        max_length=256,
+        verbose_name='Тема')
+
+    class Meta:
+        indexes = [
+            Index(
+                fields=('status', 'next_attempt'),
+                name='queued_email_status_idx')]
+        ordering = ('id',)
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
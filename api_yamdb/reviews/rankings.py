@@ -0,0 +1,135 @@
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import Count, Exists, Max, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import GenreToTitle, Review, Title, TitleRanking
+
+RANKING_BATCH_SIZE: int = 500
+RANKING_COLUMNS = (
+    'title_id', 'genre_id', 'category_id', 'prior', 'rating', 'rating_count',
+    'rating_sum', 'trending', 'refreshed')
+RANKING_PRIOR_TOLERANCE: float = 0.1
+RANKING_PRIOR_WEIGHT: int = 10
+TRENDING_WINDOW: timedelta = timedelta(days=7)
+
+
+def mean_score():
+    """Средняя оценка по всем отзывам всех произведений."""
+    totals = Title.objects.aggregate(
+        count=Sum('rating_count'), total=Sum('rating_sum'))
+    return totals['total'] / totals['count'] if totals['count'] else 0
+
+
+def bayesian_rating(rating_sum, rating_count, mean,
+                    prior_weight=RANKING_PRIOR_WEIGHT):
+    """Средняя оценка, сглаженная к средней оценке всех произведений:
+    (sum + m * C) / (count + m). Произведение с несколькими отзывами не
+    обгоняет произведения с сотнями отзывов за счет одной высокой оценки.
+    """
+    return (rating_sum + prior_weight * mean) / (rating_count + prior_weight)
+
+
+def changed_title_ids(since, now, window):
+    """id произведений, место которых могло измениться после since: без
+    строк рейтинга или с изменившимися оценками или категорией, с жанрами,
+    которые не совпадают со строками рейтинга по жанрам, а также с
+    отзывами, которые с тех пор вошли в окно популярности или вышли из
+    него.
+    """
+    snapshot = TitleRanking.objects.filter(
+        genre=None,
+        rating_count=OuterRef('rating_count'),
+        rating_sum=OuterRef('rating_sum'),
+        title=OuterRef('pk'),
+    ).annotate(
+        category_key=Coalesce('category', Value(0)),
+    ).filter(category_key=Coalesce(OuterRef('category'), Value(0)))
+    stale = Title.objects.filter(~Exists(snapshot)).values_list(
+        'pk', flat=True)
+    added_genres = GenreToTitle.objects.filter(~Exists(
+        TitleRanking.objects.filter(
+            genre=OuterRef('genre'), title=OuterRef('title')),
+    )).values_list('title_id', flat=True)
+    removed_genres = TitleRanking.objects.filter(
+        ~Exists(GenreToTitle.objects.filter(
+            genre=OuterRef('genre'), title=OuterRef('title'))),
+        genre__isnull=False,
+    ).values_list('title_id', flat=True)
+    active = Review.objects.filter(
+        Q(pub_date__gte=since)
+        | Q(pub_date__gte=since - window, pub_date__lt=now - window),
+    ).order_by().values_list('title_id', flat=True).distinct()
+    return set().union(*(
+        queryset.iterator()
+        for queryset in (stale, added_genres, removed_genres, active)))
+
+
+def refresh_titles(title_ids, mean, now, window):
+    """Пересчитывает строки рейтинга произведений порциями по
+    RANKING_BATCH_SIZE. Строки вставляются executemany без создания
+    экземпляров модели. Возвращает количество произведений.
+    """
+    quote = connection.ops.quote_name
+    insert_sql = (
+        f'INSERT INTO {quote(TitleRanking._meta.db_table)} '
+        f'({", ".join(map(quote, RANKING_COLUMNS))}) '
+        f'VALUES ({", ".join(["%s"] * len(RANKING_COLUMNS))})')
+    refreshed_at = connection.ops.adapt_datetimefield_value(now)
+    title_ids = iter(title_ids)
+    refreshed = 0
+    while True:
+        chunk = list(islice(title_ids, RANKING_BATCH_SIZE))
+        if not chunk:
+            return refreshed
+        refreshed += len(chunk)
+        trending = dict(Review.objects.filter(
+            pub_date__gte=now - window,
+            title_id__in=chunk,
+        ).order_by().values('title_id').annotate(
+            total=Count('pk')).values_list('title_id', 'total'))
+        genres = defaultdict(list)
+        for title_id, genre_id in GenreToTitle.objects.filter(
+                title_id__in=chunk).values_list('title_id', 'genre_id'):
+            genres[title_id].append(genre_id)
+        rankings = []
+        titles = Title.objects.filter(pk__in=chunk).values_list(
+            'pk', 'category_id', 'rating_count', 'rating_sum')
+        for title_id, category_id, rating_count, rating_sum in titles:
+            rating = bayesian_rating(rating_sum, rating_count, mean)
+            rankings.extend(
+                (title_id, genre_id, category_id, mean, rating,
+                 rating_count, rating_sum, trending.get(title_id, 0),
+                 refreshed_at)
+                for genre_id in (None, *genres[title_id]))
+        with transaction.atomic():
+            TitleRanking.objects.filter(title_id__in=chunk).delete()
+            with connection.cursor() as cursor:
+                cursor.executemany(insert_sql, rankings)
+
+
+def refresh_rankings(full=False, window=TRENDING_WINDOW):
+    """Обновляет материализованный рейтинг: полностью или, по умолчанию,
+    только для произведений, изменившихся с прошлого обновления.
+    Частичное обновление сглаживает рейтинг к той же средней оценке, что и
+    остальные строки, чтобы все произведения сравнивались при одном
+    априорном значении. Если средняя оценка всех отзывов отошла от нее
+    больше чем на RANKING_PRIOR_TOLERANCE, выполняется полное обновление.
+    Возвращает количество пересчитанных произведений.
+    """
+    now = timezone.now()
+    last = TitleRanking.objects.aggregate(
+        prior=Max('prior'), refreshed=Max('refreshed'))
+    mean = mean_score()
+    if (full or last['refreshed'] is None
+            or abs(mean - last['prior']) > RANKING_PRIOR_TOLERANCE):
+        title_ids = Title.objects.order_by('pk').values_list(
+            'pk', flat=True).iterator(chunk_size=RANKING_BATCH_SIZE)
+    else:
+        title_ids = sorted(changed_title_ids(last['refreshed'], now, window))
+        mean = last['prior']
+    return refresh_titles(title_ids, mean, now, window)
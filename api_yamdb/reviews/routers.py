@@ -0,0 +1,59 @@
+from contextvars import ContextVar
+import random
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections, DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Реплика, из которой читает текущий запрос: выбирается один раз на
+# безопасный запрос, чтобы все его чтения видели одно состояние данных;
+# None - чтение из default, в том числе после первой записи.
+read_alias = ContextVar('read_alias', default=None)
+
+
+class ReadWriteRouter:
+    """Направляет чтение в GET, HEAD и OPTIONS-запросах в выбранную для
+    запроса базу из settings.DATABASE_READ_ALIASES, запись, миграции и
+    остальное чтение - в default. После первой записи запрос читает из
+    default, чтобы видеть свои изменения; чтение внутри транзакции default
+    выполняется в ней.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        read_alias.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """Выбирает для безопасного запроса одну из баз
+    settings.DATABASE_READ_ALIASES, из которой ReadWriteRouter читает до
+    конца запроса. Без settings.DATABASE_READ_ALIASES отключается.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_READ_ALIASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = read_alias.set(
+            random.choice(settings.DATABASE_READ_ALIASES)
+            if request.method in SAFE_METHODS else None)
+        try:
+            return self.get_response(request)
+        finally:
+            read_alias.reset(token)
@@ -0,0 +1,266 @@
+import re
+
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.utils.module_loading import import_string
+
+SEARCH_TABLE: str = 'reviews_search'
+SEARCH_KINDS = {'title': 1, 'review': 2, 'comment': 3}
+KIND_BITS: int = 4
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def search_document(kind, obj):
+    """Текст, по которому индексируется объект."""
+    if kind == 'title':
+        return ' '.join(filter(None, (obj.name, obj.description)))
+    return obj.text
+
+
+def search_rowid(kind, object_id):
+    """Кодирует тип и id объекта в один целочисленный ключ индекса."""
+    return object_id * KIND_BITS + SEARCH_KINDS[kind]
+
+
+class BaseSearchBackend:
+    """Полнотекстовый индекс произведений, отзывов и комментариев в таблице
+    SEARCH_TABLE. Наследники реализуют SQL конкретной базы данных.
+    """
+    create_sql = ()
+    drop_sql = ()
+    rebuild_sql = ''
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.connection = connections[using]
+
+    def execute(self, sql, params=()):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            if cursor.description is not None:
+                return cursor.fetchall()
+        return None
+
+    def create(self):
+        for sql in self.create_sql:
+            self.execute(sql)
+
+    def drop(self):
+        for sql in self.drop_sql:
+            self.execute(sql)
+
+    def rebuild(self):
+        """Перестраивает индекс по всем произведениям, отзывам и
+        комментариям.
+        """
+        self.execute(f'DELETE FROM {SEARCH_TABLE}')
+        for kind, table, document in (
+                ('title', 'reviews_title',
+                 "name || ' ' || COALESCE(description, '')"),
+                ('review', 'reviews_review', 'text'),
+                ('comment', 'reviews_comment', 'text')):
+            self.execute(self.rebuild_sql.format(
+                code=SEARCH_KINDS[kind],
+                document=document,
+                kind=kind,
+                kind_bits=KIND_BITS,
+                table=table))
+
+    def executemany(self, sql, params_list):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql, params_list)
+
+    def index(self, kind, obj):
+        raise NotImplementedError
+
+    def index_many(self, kind, objects):
+        """Индексирует объекты одного типа, например созданные
+        bulk_create, в обход сигналов.
+        """
+        for obj in objects:
+            self.index(kind, obj)
+
+    def delete(self, kind, object_id):
+        self.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            (search_rowid(kind, object_id),))
+
+    def search(self, query, kinds, limit, offset):
+        """Возвращает список (тип, id, ранг) по убыванию релевантности."""
+        raise NotImplementedError
+
+    def count(self, query, kinds):
+        raise NotImplementedError
+
+    def ids_sql(self, kind, query):
+        """SQL и параметры подзапроса id объектов типа kind, найденных по
+        query, для фильтра pk__in=RawSQL(...).
+        """
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    create_sql = (
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+        "kind UNINDEXED, body, tokenize = 'unicode61 remove_diacritics 2')",)
+    drop_sql = (f'DROP TABLE IF EXISTS {SEARCH_TABLE}',)
+    rebuild_sql = (
+        f'INSERT INTO {SEARCH_TABLE} (rowid, kind, body) '
+        "SELECT id * {kind_bits} + {code}, '{kind}', {document} "
+        'FROM {table}')
+
+    @staticmethod
+    def match_expression(query):
+        """Переводит пользовательский запрос в выражение MATCH: все слова
+        обязательны, последнее ищется как префикс.
+        """
+        words = WORD_PATTERN.findall(query)
+        if not words:
+            return None
+        terms = [f'"{word}"' for word in words]
+        terms[-1] += '*'
+        return ' '.join(terms)
+
+    def where(self, query, kinds):
+        placeholders = ', '.join(['%s'] * len(kinds))
+        return (
+            f'{SEARCH_TABLE} MATCH %s AND kind IN ({placeholders})',
+            [self.match_expression(query), *kinds])
+
+    def index(self, kind, obj):
+        rowid = search_rowid(kind, obj.pk)
+        self.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', (rowid,))
+        self.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, kind, body) '
+            'VALUES (%s, %s, %s)',
+            (rowid, kind, search_document(kind, obj)))
+
+    def index_many(self, kind, objects):
+        rows = [
+            (search_rowid(kind, obj.pk), kind, search_document(kind, obj))
+            for obj in objects]
+        self.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [row[:1] for row in rows])
+        self.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, kind, body) '
+            'VALUES (%s, %s, %s)',
+            rows)
+
+    def search(self, query, kinds, limit, offset):
+        if self.match_expression(query) is None:
+            return []
+        where, params = self.where(query, kinds)
+        rows = self.execute(
+            f'SELECT kind, rowid / {KIND_BITS}, -bm25({SEARCH_TABLE}) '
+            f'FROM {SEARCH_TABLE} WHERE {where} '
+            f'ORDER BY bm25({SEARCH_TABLE}), rowid LIMIT %s OFFSET %s',
+            (*params, limit, offset))
+        return [tuple(row) for row in rows]
+
+    def count(self, query, kinds):
+        if self.match_expression(query) is None:
+            return 0
+        where, params = self.where(query, kinds)
+        return self.execute(
+            f'SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE {where}', params)[0][0]
+
+    def ids_sql(self, kind, query):
+        return (
+            f'SELECT rowid / {KIND_BITS} FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND kind = %s',
+            (self.match_expression(query) or '""', kind))
+
+
+class PostgreSQLBackend(BaseSearchBackend):
+    config = 'russian'
+    create_sql = (
+        f'CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ('
+        'rowid bigint PRIMARY KEY, kind varchar(16) NOT NULL, '
+        'document tsvector NOT NULL)',
+        f'CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx '
+        f'ON {SEARCH_TABLE} USING GIN (document)')
+    drop_sql = (f'DROP TABLE IF EXISTS {SEARCH_TABLE}',)
+    rebuild_sql = (
+        f'INSERT INTO {SEARCH_TABLE} (rowid, kind, document) '
+        "SELECT id * {kind_bits} + {code}, '{kind}', "
+        f"to_tsvector('{config}', {{document}}) FROM {{table}}")
+    index_sql = (
+        f'INSERT INTO {SEARCH_TABLE} (rowid, kind, document) '
+        f"VALUES (%s, %s, to_tsvector('{config}', %s)) "
+        'ON CONFLICT (rowid) DO UPDATE SET document = EXCLUDED.document')
+
+    def where(self, query, kinds):
+        placeholders = ', '.join(['%s'] * len(kinds))
+        return (
+            f"document @@ plainto_tsquery('{self.config}', %s) "
+            f'AND kind IN ({placeholders})',
+            [query, *kinds])
+
+    def index(self, kind, obj):
+        self.execute(
+            self.index_sql,
+            (search_rowid(kind, obj.pk), kind, search_document(kind, obj)))
+
+    def index_many(self, kind, objects):
+        self.executemany(self.index_sql, [
+            (search_rowid(kind, obj.pk), kind, search_document(kind, obj))
+            for obj in objects])
+
+    def search(self, query, kinds, limit, offset):
+        where, params = self.where(query, kinds)
+        rows = self.execute(
+            f'SELECT kind, rowid / {KIND_BITS}, ts_rank(document, '
+            f"plainto_tsquery('{self.config}', %s)) AS rank "
+            f'FROM {SEARCH_TABLE} WHERE {where} '
+            'ORDER BY rank DESC, rowid LIMIT %s OFFSET %s',
+            (query, *params, limit, offset))
+        return [tuple(row) for row in rows]
+
+    def count(self, query, kinds):
+        where, params = self.where(query, kinds)
+        return self.execute(
+            f'SELECT COUNT(*) FROM {SEARCH_TABLE} WHERE {where}', params)[0][0]
+
+    def ids_sql(self, kind, query):
+        return (
+            f'SELECT rowid / {KIND_BITS} FROM {SEARCH_TABLE} '
+            f"WHERE document @@ plainto_tsquery('{self.config}', %s) "
+            'AND kind = %s',
+            (query, kind))
+
+
+SEARCH_BACKENDS = {
+    'postgresql': PostgreSQLBackend,
+    'sqlite': SQLiteFTS5Backend}
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    """Бэкенд из настройки SEARCH_BACKEND или, если она не задана, по
+    типу базы данных using.
+    """
+    backend = getattr(settings, 'SEARCH_BACKEND', None)
+    if backend:
+        return import_string(backend)(using)
+    return SEARCH_BACKENDS[connections[using].vendor](using)
+
+
+class SearchResults:
+    """Ленивая последовательность результатов поиска: срез выполняет поиск
+    с LIMIT/OFFSET, len() - подсчет. Подходит для стандартных пагинаторов.
+    """
+
+    def __init__(self, query, kinds, backend=None):
+        self.backend = backend or get_search_backend()
+        self.kinds = kinds
+        self.query = query
+
+    def __len__(self):
+        return self.backend.count(self.query, self.kinds)
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step is not None:
+            raise TypeError('SearchResults supports only slices.')
+        offset = item.start or 0
+        return self.backend.search(
+            self.query, self.kinds, item.stop - offset, offset)
@@ -0,0 +1,141 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate
+from .models import Category, Comment, Genre, Review, Title, TitleStats
+from .search import get_search_backend
+
+
+def comment_title_id(comment):
+    """id произведения комментария без загрузки отзыва, если он еще не
+    загружен.
+    """
+    if Comment.review.is_cached(comment):
+        return comment.review.title_id
+    return Review.objects.filter(pk=comment.review_id).values_list(
+        'title_id', flat=True).first()
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, **kwargs):
+    """Создает пустую статистику нового произведения."""
+    if created:
+        TitleStats.objects.create(title=instance)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Переносит оценку созданного или измененного отзыва в рейтинг и
+    статистику произведения. Изменения в обход save() (например,
+    QuerySet.update) исправляют команды recalculate_ratings и
+    rebuild_title_stats.
+    """
+    loaded_score = getattr(instance, 'loaded_score', None)
+    score = int(instance.score)
+    if created:
+        score_delta, count_delta = score, 1
+        scores = {score: 1}
+    elif loaded_score is None or int(loaded_score) == score:
+        score_delta, count_delta = 0, 0
+        scores = {}
+    else:
+        score_delta, count_delta = score - int(loaded_score), 0
+        scores = {int(loaded_score): -1, score: 1}
+    instance.loaded_score = score
+    if score_delta or count_delta:
+        Title.objects.filter(pk=instance.title_id).update_rating(
+            score_delta=score_delta, count_delta=count_delta)
+    TitleStats.objects.filter(title_id=instance.title_id).update_counts(
+        scores=scores, reviews=count_delta)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Исключает оценку удаленного отзыва из рейтинга и статистики
+    произведения. Комментарии отзыва вычитает comment_deleted.
+    """
+    Title.objects.filter(pk=instance.title_id).update_rating(
+        score_delta=-instance.score, count_delta=-1)
+    TitleStats.objects.filter(title_id=instance.title_id).update_counts(
+        scores={int(instance.score): -1}, reviews=-1)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    """Учитывает новый комментарий в статистике произведения."""
+    if created:
+        title_id = comment_title_id(instance)
+        TitleStats.objects.filter(title_id=title_id).update_counts(
+            comments=1)
+        invalidate('titles', f'title:{title_id}')
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    """Исключает удаленный комментарий из статистики произведения. При
+    каскадном удалении отзыва комментарии удаляются раньше него.
+    """
+    title_id = comment_title_id(instance)
+    if title_id is not None:
+        TitleStats.objects.filter(title_id=title_id).update_counts(
+            comments=-1)
+        invalidate('titles', f'title:{title_id}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Title)
+def search_index_saved(sender, instance, **kwargs):
+    """Обновляет запись объекта в полнотекстовом индексе."""
+    get_search_backend().index(sender._meta.model_name, instance)
+
+
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Title)
+def search_index_deleted(sender, instance, **kwargs):
+    """Удаляет объект из полнотекстового индекса."""
+    get_search_backend().delete(sender._meta.model_name, instance.pk)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    """Сбрасывает кэш категорий и произведений, в которые они вложены."""
+    invalidate('categories')
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Genre)
+def genre_changed(sender, instance, **kwargs):
+    """Сбрасывает кэш жанров и произведений, в которые они вложены."""
+    invalidate('genres')
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_save, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    """Сбрасывает кэш списков произведений и самого произведения."""
+    invalidate('titles', f'title:{instance.pk}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    """Сбрасывает кэш произведений, у которых изменились жанры."""
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate('titles', f'title:{instance.pk}')
+    elif pk_set is None:
+        # genre.titles_gen.clear(): затронутые произведения неизвестны.
+        invalidate('genres', 'titles')
+    else:
+        invalidate('titles', *(f'title:{pk}' for pk in pk_set))
+
+
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    """Сбрасывает кэш произведения, рейтинг которого изменил отзыв."""
+    invalidate('titles', f'title:{instance.title_id}')
@@ -0,0 +1,58 @@
+"""Количество SQL-запросов и время аутентифицированного POST отзыва с
+JWTAuthentication и с CachedJWTAuthentication.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_auth_cache [количество запросов]
+"""
+import sys
+
+from benchmarks.utils import create_users, setup_django
+
+DEFAULT_REQUESTS: int = 200
+
+
+def run(client, titles, view, authentication_class):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    view.authentication_classes = (authentication_class,)
+    with CaptureQueriesContext(connection) as context:
+        for title in titles:
+            client.post(
+                f'/api/v1/titles/{title.pk}/reviews/',
+                data={'text': 'text', 'score': 5})
+    queries = len(context.captured_queries) / len(titles)
+    user_queries = sum(
+        'FROM "reviews_user"' in query['sql']
+        for query in context.captured_queries) / len(titles)
+    return queries, user_queries
+
+
+def main(requests):
+    setup_django()
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+
+    from api.v1.authentication import (
+        CachedJWTAuthentication, VersionedAccessToken)
+    from api.v1.views import ReviewViewSet
+    from reviews.models import Review, Title, User
+
+    Title.objects.bulk_create(
+        Title(name=f'title {i}', year=2000) for i in range(requests))
+    titles = list(Title.objects.all())
+    user = User.objects.get(pk=create_users(1)[0])
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {VersionedAccessToken.for_user(user)}')
+    print(f'{"аутентификация":<26} {"запросов":>9} {"к users":>9}')
+    for authentication_class in (JWTAuthentication, CachedJWTAuthentication):
+        queries, user_queries = run(
+            client, titles, ReviewViewSet, authentication_class)
+        print(f'{authentication_class.__name__:<26} {queries:>9.2f} '
+              f'{user_queries:>9.2f}')
+        Review.objects.all().delete()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS)
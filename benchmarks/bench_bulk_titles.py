@@ -0,0 +1,85 @@
+"""Создание произведений с категорией и двумя жанрами через API:
+отдельный POST-запрос к /api/v1/titles/ на каждое произведение против
+POST-запросов к /api/v1/bulk/titles/ по BULK_MAX_ITEMS произведений.
+Выводит общее время, произведений в секунду и количество SQL-запросов.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_bulk_titles [количество произведений]
+"""
+import sys
+import time
+
+from benchmarks.utils import setup_django
+
+DEFAULT_TITLES: int = 2000
+GENRES: int = 15
+
+
+def items(count, categories, genres):
+    return [
+        {'name': f'title {i:08}',
+         'year': 1950 + i % 70,
+         'description': 'description',
+         'category': categories[i % len(categories)],
+         'genre': [genres[i % len(genres)], genres[(i + 1) % len(genres)]]}
+        for i in range(count)]
+
+
+def run(client, requests):
+    """Выполняет POST-запросы (адрес, тело) и возвращает время в
+    секундах и количество SQL-запросов.
+    """
+    from django.db import connection
+
+    queries = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        start = time.perf_counter()
+        for url, data in requests:
+            response = client.post(url, data=data, format='json')
+            assert response.status_code == 201, response.content
+        elapsed = time.perf_counter() - start
+    return elapsed, queries
+
+
+def main(count):
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from api.v1.views import BULK_MAX_ITEMS
+    from reviews.models import Category, Genre, User
+
+    admin = User.objects.create(
+        username='admin', email='admin@yamdb.fake', role='admin')
+    client = APIClient()
+    client.force_authenticate(admin)
+    categories = [
+        Category.objects.create(name=f'category {i}', slug=f'category-{i}')
+        for i in range(GENRES // 3)]
+    genres = [
+        Genre.objects.create(name=f'genre {i}', slug=f'genre-{i}')
+        for i in range(GENRES)]
+    data = items(
+        count,
+        [category.slug for category in categories],
+        [genre.slug for genre in genres])
+    modes = {
+        'по одному': [('/api/v1/titles/', item) for item in data],
+        'bulk': [
+            ('/api/v1/bulk/titles/', data[start:start + BULK_MAX_ITEMS])
+            for start in range(0, count, BULK_MAX_ITEMS)]}
+    print(f'{"режим":>10} {"время, с":>10} {"в секунду":>10} {"SQL":>8}')
+    for name, requests in modes.items():
+        elapsed, queries = run(client, requests)
+        print(
+            f'{name:>10} {elapsed:>10.2f} {count / elapsed:>10.0f} '
+            f'{queries:>8}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TITLES)
@@ -0,0 +1,45 @@
+"""p50 и p99 повторного опроса списков отзывов и комментариев без
+изменений: обычный GET против условного GET с If-None-Match (304).
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_conditional_get [количество отзывов]
+"""
+import sys
+
+from benchmarks.utils import (
+    BATCH_SIZE, create_reviews, create_users, measure, setup_django)
+
+DEFAULT_REVIEWS: int = 10000
+
+
+def main(count):
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from reviews.models import Comment, Review, Title
+
+    title = Title.objects.create(name='Произведение', year=2000)
+    author_ids = create_users(count)
+    create_reviews(title, author_ids)
+    review = Review.objects.filter(title=title).first()
+    Comment.objects.bulk_create(
+        (Comment(author_id=author_id, review=review, text='text')
+         for author_id in author_ids),
+        batch_size=BATCH_SIZE)
+    client = APIClient()
+    print(f'{"список":>10} {"GET p50":>9} {"GET p99":>9} '
+          f'{"304 p50":>9} {"304 p99":>9}')
+    for name, url in (
+            ('отзывы', f'/api/v1/titles/{title.pk}/reviews/?limit=20'),
+            ('комментарии', f'/api/v1/titles/{title.pk}/reviews/'
+                            f'{review.pk}/comments/?limit=20')):
+        etag = client.get(url)['ETag']
+        full = measure(lambda: client.get(url), repeat=200)
+        conditional = measure(
+            lambda: client.get(url, HTTP_IF_NONE_MATCH=etag), repeat=200)
+        print(f'{name:>10} {full[0]:>9.2f} {full[1]:>9.2f} '
+              f'{conditional[0]:>9.2f} {conditional[1]:>9.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REVIEWS)
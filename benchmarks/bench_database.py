@@ -0,0 +1,186 @@
+"""Пропускная способность эндпоинтов записи отзывов и комментариев на
+SQLite и PostgreSQL: без постоянных соединений (DB_CONN_MAX_AGE=0) и с
+постоянными соединениями и их проверкой (DB_CONN_MAX_AGE=60,
+DB_CONN_HEALTH_CHECKS=1). Каждая конфигурация запускается в отдельном
+процессе; PostgreSQL берется из переменных DB_* или запускается pgserver.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_database
+    python -m benchmarks.bench_database --backend sqlite --requests 400
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import BASE_DIR, postgres_environ, setup_django
+
+CONFIGS: dict = {
+    'sqlite': ('sqlite', {}),
+    'postgresql': ('postgresql', {'DB_CONN_MAX_AGE': '0'}),
+    'postgresql persistent': ('postgresql', {
+        'DB_CONN_MAX_AGE': '60', 'DB_CONN_HEALTH_CHECKS': '1'}),
+}
+PHASES = ('reviews-create', 'reviews-update', 'comments-create')
+
+
+def phase_requests(phase, reviews):
+    """Метод, адрес, тело запроса и id произведения для запросов фазы
+    одного клиента: отзывы на произведения, их изменение и комментарии к
+    ним. reviews - пары (id произведения, id отзыва клиента или None).
+    """
+    if phase == 'reviews-create':
+        return [
+            ('post', f'/api/v1/titles/{title_id}/reviews/',
+             {'text': 'Нагрузочный отзыв', 'score': i % 10 + 1}, title_id)
+            for i, (title_id, _) in enumerate(reviews)]
+    method, suffix, body = {
+        'reviews-update': ('patch', '', {'text': 'Измененный отзыв'}),
+        'comments-create': ('post', 'comments/', {'text': 'Комментарий'}),
+    }[phase]
+    return [
+        (method, f'/api/v1/titles/{title_id}/reviews/{review_id}/{suffix}',
+         body, title_id)
+        for title_id, review_id in reviews]
+
+
+def worker(client, requests, results, created):
+    from django.db import connections
+
+    try:
+        for method, url, body, title_id in requests:
+            start = time.perf_counter()
+            response = getattr(client, method)(url, data=body)
+            results.append((
+                (time.perf_counter() - start) * 1000,
+                response.status_code < 400))
+            if response.status_code == 201 and url.endswith('/reviews/'):
+                created.append((title_id, response.json()['id']))
+    finally:
+        connections.close_all()
+
+
+def run_phase(clients, phase, reviews):
+    """Выполняет фазу во всех потоках, по одному на клиент; возвращает
+    сводку и созданные отзывы по клиентам.
+    """
+    from api.v1.profiling import percentile
+
+    results = []
+    created = [[] for _ in clients]
+    threads = [
+        threading.Thread(target=worker, args=(
+            client,
+            phase_requests(phase, reviews[i]),
+            results,
+            created[i]))
+        for i, client in enumerate(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        'requests': len(results),
+        'errors': sum(not success for _, success in results),
+        'rps': len(results) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95)}, created
+
+
+def child(options):
+    """Замер в текущем процессе с базой данных из окружения; печатает
+    результаты фаз в JSON.
+    """
+    with tempfile.TemporaryDirectory() as db_dir:
+        setup_django(os.path.join(db_dir, 'write.sqlite3'))
+        from django.db import connection, connections
+        from rest_framework.test import APIClient
+
+        from benchmarks.bench_load import seed
+        from reviews.models import Title, User
+
+        data = seed(options.concurrency, options.requests, 10, 0, 0)
+        title_ids = list(Title.objects.order_by('pk').values_list(
+            'pk', flat=True))
+        clients = []
+        for user in User.objects.filter(pk__in=data['author_ids']):
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(user)
+            clients.append(client)
+        per_client = options.requests // len(clients)
+        reviews = [
+            [(title_id, None) for title_id in title_ids[:per_client]]
+            for _ in clients]
+        report = {}
+        for phase in PHASES:
+            report[phase], created = run_phase(clients, phase, reviews)
+            if phase == 'reviews-create':
+                reviews = created
+        report['vendor'] = connection.vendor
+        connections.close_all()
+    print(json.dumps(report))
+
+
+def run_config(name, options, environ):
+    env = dict(os.environ, DB_ENGINE='django.db.backends.sqlite3')
+    env.update(environ)
+    env.update(CONFIGS[name][1])
+    result = subprocess.run(
+        (sys.executable, '-m', 'benchmarks.bench_database', '--child',
+         '--requests', str(options.requests),
+         '--concurrency', str(options.concurrency)),
+        capture_output=True, check=True, cwd=BASE_DIR, env=env, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(options):
+    if options.child:
+        return child(options)
+    backends = set(options.backend or ('sqlite', 'postgresql'))
+    reports = {}
+    with postgres_environ() as environ:
+        for name, (backend, _) in CONFIGS.items():
+            if backend not in backends:
+                continue
+            if backend == 'postgresql' and environ is None:
+                print('PostgreSQL недоступен: укажите переменные DB_* или '
+                      'установите pgserver.')
+                continue
+            reports[name] = run_config(
+                name, options,
+                environ if backend == 'postgresql' else {})
+    print(f'{"база данных":<22} {"эндпоинт":<16} {"req/s":>8} '
+          f'{"p50":>8} {"p95":>8} {"ошибки":>6}')
+    for name, report in reports.items():
+        for phase in PHASES:
+            result = report[phase]
+            print(f'{name:<22} {phase:<16} {result["rps"]:>8.1f} '
+                  f'{result["p50"]:>8.2f} {result["p95"]:>8.2f} '
+                  f'{result["errors"]:>6}')
+    return reports
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--backend', action='append', choices=('sqlite', 'postgresql'),
+        help='Замерять только эту базу данных; можно указать дважды.')
+    parser.add_argument(
+        '--requests', default=800, type=int,
+        help='Запросов в каждой фазе.')
+    parser.add_argument(
+        '--concurrency', default=8, type=int,
+        help='Количество потоков, у каждого свой клиент и пользователь.')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args(args)
+
+
+if __name__ == '__main__':
+    main(parse_args())
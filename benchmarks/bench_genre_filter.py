@@ -0,0 +1,59 @@
+"""Время получения страницы произведений, отфильтрованной по жанрам:
+поиск подстроки в slug через join (прежний фильтр) против точного фильтра
+TitleFilter по id жанров через индекс таблицы связей. Оба фильтра
+измеряются на уровне QuerySet: count и первая страница.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_genre_filter [количество произведений]
+"""
+import random
+import sys
+
+from benchmarks.utils import BATCH_SIZE, measure, setup_django
+
+DEFAULT_TITLES: int = 1000000
+GENRES: int = 15
+
+
+def main(count):
+    setup_django()
+    from api.v1.filters import TitleFilter
+    from reviews.models import Genre, GenreToTitle, Title
+
+    genres = [
+        Genre.objects.create(name=f'genre {i}', slug=f'genre-{i}')
+        for i in range(GENRES)]
+    Title.objects.bulk_create(
+        (Title(name=f'title {i:08}', year=2000) for i in range(count)),
+        batch_size=BATCH_SIZE)
+    generator = random.Random(0)
+    links = (
+        GenreToTitle(genre=genre, title_id=title_id)
+        for title_id in Title.objects.values_list('pk', flat=True).iterator()
+        for genre in generator.sample(genres, generator.randint(1, 3)))
+    GenreToTitle.objects.bulk_create(links, batch_size=BATCH_SIZE)
+
+    def page(titles):
+        titles = titles.order_by('name', 'id')
+        return titles.count(), list(titles[:5])
+
+    def contains(slug):
+        return page(Title.objects.filter(genre__slug__contains=slug))
+
+    def exact(params):
+        return page(TitleFilter(params, queryset=Title.objects.all()).qs)
+
+    print(f'{"фильтр":>22} {"contains, мс":>14} {"exact, мс":>11}')
+    for params in (
+            {'genre': 'genre-7'},
+            {'genre': 'genre-3,genre-7'},
+            {'genre': 'genre-3,genre-7', 'genre_match': 'all'}):
+        slug = params['genre'].split(',')[0]
+        contains_ms, _ = measure(lambda: contains(slug), repeat=5)
+        exact_ms, _ = measure(lambda: exact(params), repeat=5)
+        label = ' '.join(params.values())
+        print(f'{label:>22} {contains_ms:>14.2f} {exact_ms:>11.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TITLES)
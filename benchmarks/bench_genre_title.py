@@ -0,0 +1,81 @@
+"""Стоимость join по таблице связей жанров и произведений до и после
+объединения: прежняя таблица с индексами только на внешних ключах против
+GenreToTitle с уникальным индексом (title, genre) и индексом
+(genre, title). Обе таблицы содержат одни и те же строки.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_genre_title [количество произведений]
+"""
+import random
+import sys
+
+from benchmarks.utils import BATCH_SIZE, measure, setup_django
+
+BEFORE_TABLE: str = 'bench_genre_title_before'
+DEFAULT_TITLES: int = 1000000
+GENRES: int = 15
+PAGE_SIZE: int = 100
+
+QUERIES = {
+    'жанры страницы': (
+        'SELECT l.title_id, b.slug FROM {table} l '
+        'JOIN reviews_basegroupmodel b ON b.id = l.genre_id '
+        'WHERE l.title_id IN ({page})'),
+    'число в жанре': (
+        'SELECT COUNT(*) FROM {table} WHERE genre_id = {genre}'),
+    'оба жанра': (
+        'SELECT COUNT(*) FROM (SELECT title_id FROM {table} '
+        'WHERE genre_id IN ({genre}, {other}) GROUP BY title_id '
+        'HAVING COUNT(*) = 2)'),
+}
+
+
+def main(count):
+    setup_django()
+    from django.db import connection
+
+    from reviews.models import Genre, GenreToTitle, Title
+
+    genres = [
+        Genre.objects.create(name=f'genre {i}', slug=f'genre-{i}')
+        for i in range(GENRES)]
+    Title.objects.bulk_create(
+        (Title(name=f'title {i:08}', year=2000) for i in range(count)),
+        batch_size=BATCH_SIZE)
+    generator = random.Random(0)
+    links = (
+        GenreToTitle(genre=genre, title_id=title_id)
+        for title_id in Title.objects.values_list('pk', flat=True).iterator()
+        for genre in generator.sample(genres, generator.randint(1, 3)))
+    GenreToTitle.objects.bulk_create(links, batch_size=BATCH_SIZE)
+    table = GenreToTitle._meta.db_table
+    page = ', '.join(map(str, generator.sample(
+        list(Title.objects.values_list('pk', flat=True)), PAGE_SIZE)))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE {BEFORE_TABLE} AS '
+            f'SELECT id, title_id, genre_id FROM {table}')
+        for column in ('title_id', 'genre_id'):
+            cursor.execute(
+                f'CREATE INDEX {BEFORE_TABLE}_{column} '
+                f'ON {BEFORE_TABLE} ({column})')
+        cursor.execute('ANALYZE')
+
+        def run(sql):
+            cursor.execute(sql)
+            cursor.fetchall()
+
+        print(f'{"запрос":>16} {"до, мс":>10} {"после, мс":>10}')
+        for name, sql in QUERIES.items():
+            timings = [
+                measure(lambda: run(sql.format(
+                    genre=genres[3].pk,
+                    other=genres[7].pk,
+                    page=page,
+                    table=link_table)), repeat=5)[0]
+                for link_table in (BEFORE_TABLE, table)]
+            print(f'{name:>16} {timings[0]:>10.2f} {timings[1]:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TITLES)
@@ -0,0 +1,282 @@
+"""Нагрузочный тест API v1: наполняет базу синтетическими данными заданного
+размера и опрашивает эндпоинты через тестовый клиент Django в нескольких
+потоках. Для каждого эндпоинта выводит запросы в секунду, p50/p95/p99
+времени ответа и количество SQL-запросов на запрос; --output сохраняет
+результаты в JSON, --compare сравнивает их с результатами другого коммита.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_load --output load.json
+    python -m benchmarks.bench_load --compare load.json --titles 20000
+"""
+import argparse
+from contextlib import ExitStack
+from datetime import datetime, timezone
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import BASE_DIR, BATCH_SIZE, create_users, setup_django
+
+SEARCH_WORDS = (
+    'ветер', 'дорога', 'зеркало', 'море', 'ночь', 'огонь', 'сад', 'тень')
+
+
+def seed(users, titles, genres, reviews, comments, seed_value=0):
+    """Создает пользователей, категории, жанры, произведения, reviews
+    отзывов на произведение и comments комментариев на отзыв, затем
+    пересчитывает рейтинги, создает и пересчитывает статистику, строит
+    поисковый индекс и материализованный рейтинг. Возвращает id и slug
+    объектов для адресов эндпоинтов.
+    """
+    from reviews.models import (
+        Category, Comment, Genre, GenreToTitle, Review, Title, TitleStats)
+    from reviews.rankings import refresh_rankings
+    from reviews.search import get_search_backend
+
+    generator = random.Random(seed_value)
+    author_ids = create_users(users, prefix='load')
+    categories = [
+        Category.objects.create(name=f'category {i}', slug=f'category-{i}')
+        for i in range(max(genres // 4, 1))]
+    genre_objects = [
+        Genre.objects.create(name=f'genre {i}', slug=f'genre-{i}')
+        for i in range(genres)]
+    Title.objects.bulk_create(
+        (Title(category=categories[i % len(categories)],
+               description=' '.join(generator.choices(SEARCH_WORDS, k=5)),
+               name=f'title {i:08}',
+               year=1950 + i % 70)
+         for i in range(titles)),
+        batch_size=BATCH_SIZE)
+    title_ids = list(Title.objects.values_list('pk', flat=True))
+    GenreToTitle.objects.bulk_create(
+        (GenreToTitle(genre=genre, title_id=title_id)
+         for title_id in title_ids
+         for genre in generator.sample(
+             genre_objects, min(2, len(genre_objects)))),
+        batch_size=BATCH_SIZE)
+    Review.objects.bulk_create(
+        (Review(author_id=author_id, score=generator.randint(1, 10),
+                text=' '.join(generator.choices(SEARCH_WORDS, k=8)),
+                title_id=title_id)
+         for title_id in title_ids
+         for author_id in generator.sample(
+             author_ids, min(reviews, len(author_ids)))),
+        batch_size=BATCH_SIZE)
+    review_ids = Review.objects.values_list('pk', flat=True)
+    Comment.objects.bulk_create(
+        (Comment(author_id=generator.choice(author_ids), review_id=review_id,
+                 text=' '.join(generator.choices(SEARCH_WORDS, k=4)))
+         for review_id in review_ids.iterator()
+         for _ in range(comments)),
+        batch_size=BATCH_SIZE)
+    Title.objects.recalculate_rating()
+    TitleStats.objects.create_missing(Title.objects.all())
+    TitleStats.objects.rebuild()
+    get_search_backend().rebuild()
+    refresh_rankings(full=True)
+    review = Review.objects.filter(title_id=title_ids[0]).first()
+    return {
+        'author_ids': author_ids,
+        'category': categories[0].slug,
+        'genre': genre_objects[0].slug,
+        'review_id': review.pk if review else None,
+        'title_id': title_ids[0]}
+
+
+def get_endpoints(data):
+    """Имя, метод, адрес и тело запроса каждого эндпоинта."""
+    title_url = f'/api/v1/titles/{data["title_id"]}/'
+    review_url = f'{title_url}reviews/{data["review_id"]}/'
+    return (
+        ('categories-list', 'get', '/api/v1/categories/', None),
+        ('genres-list', 'get', '/api/v1/genres/', None),
+        ('titles-list', 'get', '/api/v1/titles/?limit=20', None),
+        ('titles-filter', 'get',
+         f'/api/v1/titles/?genre={data["genre"]}&category='
+         f'{data["category"]}&limit=20', None),
+        ('titles-detail', 'get', title_url, None),
+        ('titles-top', 'get', '/api/v1/titles/top/?limit=20', None),
+        ('reviews-list', 'get', f'{title_url}reviews/?limit=20', None),
+        ('reviews-detail', 'get', review_url, None),
+        ('comments-list', 'get', f'{review_url}comments/?limit=20', None),
+        ('comments-create', 'post', f'{review_url}comments/',
+         {'text': 'Нагрузочный комментарий'}),
+        ('search', 'get', f'/api/v1/search/?q={SEARCH_WORDS[0]}', None),
+        ('users-me', 'get', '/api/v1/users/me/', None))
+
+
+def worker(client, method, url, body, count, results):
+    """Выполняет count запросов и добавляет в results кортежи (время
+    ответа в миллисекундах, количество SQL-запросов, успешен ли ответ).
+    """
+    from django.db import connections
+
+    queries = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    samples = []
+    try:
+        for _ in range(count):
+            queries = 0
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(count_query))
+                start = time.perf_counter()
+                response = getattr(client, method)(url, data=body)
+                latency = (time.perf_counter() - start) * 1000
+            samples.append((latency, queries, response.status_code < 400))
+    finally:
+        connections.close_all()
+        results.extend(samples)
+
+
+def run_endpoint(clients, method, url, body, requests):
+    """Распределяет requests запросов между потоками, по одному на клиент,
+    и возвращает сводку по эндпоинту.
+    """
+    from api.v1.profiling import percentile
+
+    results = []
+    threads = [
+        threading.Thread(target=worker, args=(
+            client, method, url, body,
+            requests // len(clients) + (i < requests % len(clients)),
+            results))
+        for i, client in enumerate(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for latency, _, _ in results)
+    return {
+        'requests': len(results),
+        'errors': sum(not success for _, _, success in results),
+        'rps': len(results) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'queries': sum(queries for _, queries, _ in results) / len(results)}
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'), capture_output=True,
+            check=True, cwd=BASE_DIR, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, previous=None):
+    header = (f'{"эндпоинт":<16} {"req/s":>8} {"p50":>8} {"p95":>8} '
+              f'{"p99":>8} {"SQL":>6} {"ошибки":>6}')
+    if previous is not None:
+        header += f' {"Δ req/s":>8} {"Δ p95":>8} {"Δ SQL":>6}'
+    print(header)
+    for name, result in report['endpoints'].items():
+        line = (f'{name:<16} {result["rps"]:>8.1f} {result["p50"]:>8.2f} '
+                f'{result["p95"]:>8.2f} {result["p99"]:>8.2f} '
+                f'{result["queries"]:>6.1f} {result["errors"]:>6}')
+        old = (previous or {}).get('endpoints', {}).get(name)
+        if old is not None:
+            line += (
+                f' {(result["rps"] / old["rps"] - 1) * 100:>+7.1f}%'
+                f' {(result["p95"] / old["p95"] - 1) * 100:>+7.1f}%'
+                f' {result["queries"] - old["queries"]:>+6.1f}')
+        print(line)
+
+
+def run(options):
+    """Наполняет базу и опрашивает эндпоинты; возвращает отчет."""
+    from rest_framework.test import APIClient
+
+    from api.v1.authentication import VersionedAccessToken
+    from reviews.models import User
+
+    start = time.perf_counter()
+    data = seed(options.users, options.titles, options.genres,
+                options.reviews, options.comments)
+    print(f'данные созданы за {time.perf_counter() - start:.1f} с')
+    clients = []
+    for user in User.objects.filter(
+            pk__in=data['author_ids'][:options.concurrency]):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=(
+            f'Bearer {VersionedAccessToken.for_user(user)}'))
+        clients.append(client)
+    report = {
+        'commit': current_commit(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'config': {
+            key: getattr(options, key) for key in (
+                'users', 'titles', 'genres', 'reviews', 'comments',
+                'requests', 'concurrency')},
+        'endpoints': {}}
+    for name, method, url, body in get_endpoints(data):
+        if options.endpoint and name not in options.endpoint:
+            continue
+        run_endpoint(clients, method, url, body, len(clients))
+        report['endpoints'][name] = run_endpoint(
+            clients, method, url, body, options.requests)
+    return report
+
+
+def main(options):
+    with tempfile.TemporaryDirectory() as db_dir:
+        setup_django(os.path.join(db_dir, 'load.sqlite3'))
+        from django.db import connections
+
+        report = run(options)
+        connections.close_all()
+    previous = None
+    if options.compare:
+        with open(options.compare, encoding='utf-8') as file:
+            previous = json.load(file)
+        print(f'сравнение с {options.compare} '
+              f'(коммит {previous.get("commit")})')
+    print_report(report, previous)
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', default=200, type=int)
+    parser.add_argument('--titles', default=2000, type=int)
+    parser.add_argument('--genres', default=20, type=int)
+    parser.add_argument(
+        '--reviews', default=5, type=int,
+        help='Отзывов на произведение.')
+    parser.add_argument(
+        '--comments', default=2, type=int,
+        help='Комментариев на отзыв.')
+    parser.add_argument(
+        '--requests', default=200, type=int,
+        help='Запросов к каждому эндпоинту.')
+    parser.add_argument(
+        '--concurrency', default=4, type=int,
+        help='Количество потоков, у каждого свой клиент и пользователь.')
+    parser.add_argument(
+        '--endpoint', action='append',
+        help='Опрашивать только этот эндпоинт; можно указать несколько раз.')
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    parser.add_argument(
+        '--compare', help='JSON с результатами для сравнения.')
+    return parser.parse_args(args)
+
+
+if __name__ == '__main__':
+    main(parse_args())
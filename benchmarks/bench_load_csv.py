@@ -0,0 +1,74 @@
+"""Загрузка синтетического набора CSV командой load_csv: строк в секунду и
+пиковый размер резидентной памяти процесса до и после загрузки.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_load_csv [количество отзывов] [batch size]
+"""
+import csv
+import os
+import resource
+import sys
+import tempfile
+
+from benchmarks.utils import setup_django
+
+DEFAULT_REVIEWS: int = 1000000
+DEFAULT_BATCH_SIZE: int = 1000
+REVIEWS_PER_TITLE: int = 100
+GENRES: int = 15
+
+
+def write_csv(path, table, header, rows):
+    with open(os.path.join(path, f'{table}.csv'), 'w', encoding='utf-8',
+              newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def generate(path, reviews):
+    titles = max(1, reviews // REVIEWS_PER_TITLE)
+    write_csv(
+        path, 'users', ('id', 'username', 'email', 'role', 'bio',
+                        'first_name', 'last_name'),
+        ((i, f'user{i}', f'user{i}@yamdb.fake', 'user', '', '', '')
+         for i in range(1, REVIEWS_PER_TITLE + 1)))
+    write_csv(path, 'category', ('id', 'name', 'slug'),
+              ((1, 'Фильм', 'movie'), (2, 'Книга', 'book')))
+    write_csv(path, 'genre', ('id', 'name', 'slug'),
+              ((i, f'Жанр {i}', f'genre{i}') for i in range(1, GENRES + 1)))
+    write_csv(path, 'titles', ('id', 'name', 'year', 'category'),
+              ((i, f'Произведение {i}', 2000, i % 2 + 1)
+               for i in range(1, titles + 1)))
+    write_csv(path, 'genre_title', ('id', 'title_id', 'genre_id'),
+              ((i, i, i % GENRES + 1) for i in range(1, titles + 1)))
+    write_csv(
+        path, 'review', ('id', 'title_id', 'text', 'author', 'score',
+                         'pub_date'),
+        ((i, (i - 1) // REVIEWS_PER_TITLE + 1, 'text',
+          (i - 1) % REVIEWS_PER_TITLE + 1, i % 10 + 1,
+          '2020-01-13T23:20:02.422Z')
+         for i in range(1, reviews + 1)))
+    write_csv(
+        path, 'comments', ('id', 'review_id', 'text', 'author', 'pub_date'),
+        ((i, i, 'text', 1, '2020-01-13T23:20:02.422Z')
+         for i in range(1, reviews // 10 + 1)))
+
+
+def main(reviews, batch_size):
+    with tempfile.TemporaryDirectory() as path:
+        setup_django(os.path.join(path, 'bench.sqlite3'))
+        from django.core.management import call_command
+
+        generate(path, reviews)
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        call_command('load_csv', path=path, batch_size=batch_size)
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'Пиковая память процесса: {before / 1024:.1f} МБ до загрузки, '
+          f'{after / 1024:.1f} МБ после')
+
+
+if __name__ == '__main__':
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REVIEWS,
+        int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BATCH_SIZE)
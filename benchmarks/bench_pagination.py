@@ -0,0 +1,40 @@
+"""Время получения глубокой страницы /api/v1/titles/: offset против курсора.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_pagination [количество произведений]
+"""
+import sys
+
+from benchmarks.utils import BATCH_SIZE, measure, setup_django
+
+DEFAULT_TITLES: int = 200000
+
+
+def main(count):
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from api.v1.pagination import KeysetPagination
+    from reviews.models import Title
+
+    Title.objects.bulk_create(
+        (Title(name=f'title {i:08}', year=2000) for i in range(count)),
+        batch_size=BATCH_SIZE)
+    client = APIClient()
+    response = client.get('/api/v1/titles/?pagination=cursor')
+    first_cursor = response.json()['next']
+    paginator = KeysetPagination()
+    paginator.ordering = ('name', 'id')
+    paginator.request = response.wsgi_request
+    deep_url = paginator.encode_cursor(
+        Title.objects.order_by('-name', '-id')[5], reverse=False)
+    print(f'{"страница":>10} {"offset, мс":>12} {"cursor, мс":>12}')
+    for offset, cursor_url in ((5, first_cursor), (count - 5, deep_url)):
+        offset_ms, _ = measure(
+            lambda: client.get(f'/api/v1/titles/?offset={offset}'))
+        cursor_ms, _ = measure(lambda: client.get(cursor_url))
+        print(f'{offset:>10} {offset_ms:>12.2f} {cursor_ms:>12.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TITLES)
@@ -0,0 +1,68 @@
+"""Первая страница лучших произведений категории: сортировка
+аннотированного QuerySet по Avg(reviews__score) против QuerySet
+материализованного рейтинга, как в /api/v1/titles/top/, а также время
+полного и инкрементального обновления рейтинга.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_rankings [количество произведений]
+"""
+import random
+import sys
+import time
+
+from benchmarks.utils import (
+    BATCH_SIZE, create_users, measure, setup_django)
+
+CATEGORIES: int = 5
+DEFAULT_TITLES: int = 200000
+MAX_REVIEWS: int = 5
+
+
+def main(count):
+    setup_django()
+    from django.db.models import Avg
+
+    from reviews.models import Category, Review, Title, TitleRanking
+    from reviews.rankings import refresh_rankings
+
+    categories = [
+        Category.objects.create(name=f'category {i}', slug=f'category-{i}')
+        for i in range(CATEGORIES)]
+    Title.objects.bulk_create(
+        (Title(category=categories[i % CATEGORIES], name=f'title {i:08}',
+               year=2000) for i in range(count)),
+        batch_size=BATCH_SIZE)
+    author_ids = create_users(MAX_REVIEWS)
+    generator = random.Random(0)
+    Review.objects.bulk_create(
+        (Review(author_id=author_id, score=generator.randint(1, 10),
+                text='text', title_id=title_id)
+         for title_id in Title.objects.values_list('pk', flat=True)
+         for author_id in author_ids[:generator.randint(0, MAX_REVIEWS)]),
+        batch_size=BATCH_SIZE)
+    Title.objects.recalculate_rating()
+
+    start = time.perf_counter()
+    refresh_rankings(full=True)
+    print(f'полное обновление: {time.perf_counter() - start:.2f} с')
+    Review.objects.filter(pk__in=Review.objects.order_by('pk').values(
+        'pk')[:100]).delete()
+    Title.objects.recalculate_rating()
+    start = time.perf_counter()
+    refreshed = refresh_rankings()
+    print(f'инкрементальное обновление: {refreshed} произведений за '
+          f'{time.perf_counter() - start:.2f} с')
+
+    category = categories[0]
+    annotated, _ = measure(lambda: list(Title.objects.filter(
+        category=category).annotate(avg=Avg('reviews__score')).order_by(
+            '-avg', 'pk')[:20]), repeat=5)
+    materialized, _ = measure(lambda: list(TitleRanking.objects.filter(
+        category=category, genre=None).select_related('title').order_by(
+            '-rating', 'title')[:20]), repeat=5)
+    print(f'Avg + order_by: {annotated:.2f} мс, '
+          f'материализованный рейтинг: {materialized:.2f} мс')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TITLES)
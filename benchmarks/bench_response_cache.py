@@ -0,0 +1,54 @@
+"""Время ответа каталога без кэша ответов, из кэша и с 304 Not Modified.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_response_cache [количество произведений]
+"""
+import sys
+
+from benchmarks.utils import BATCH_SIZE, measure, setup_django
+
+DEFAULT_TITLES: int = 10000
+GENRES: int = 15
+
+
+def main(count):
+    setup_django()
+    from django.test import override_settings
+    from rest_framework.test import APIClient
+
+    from reviews.models import Category, Genre, GenreToTitle, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name=f'genre {i}', slug=f'genre-{i}')
+        for i in range(GENRES)]
+    Title.objects.bulk_create(
+        (Title(category=category, name=f'title {i:08}', year=2000)
+         for i in range(count)),
+        batch_size=BATCH_SIZE)
+    GenreToTitle.objects.bulk_create(
+        (GenreToTitle(genre=genres[title_id % GENRES], title_id=title_id)
+         for title_id in Title.objects.values_list('pk', flat=True)),
+        batch_size=BATCH_SIZE)
+    title_id = Title.objects.values_list('pk', flat=True).last()
+    client = APIClient()
+    dummy = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    local = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    print(f'{"запрос":>28} {"без кэша":>10} {"кэш":>8} {"304":>8}')
+    for url in (
+            '/api/v1/titles/?limit=20',
+            f'/api/v1/titles/{title_id}/',
+            '/api/v1/genres/?limit=20'):
+        with override_settings(CACHES={'default': dummy, 'responses': dummy}):
+            uncached, _ = measure(lambda: client.get(url), repeat=50)
+        with override_settings(CACHES={'default': local, 'responses': local}):
+            etag = client.get(url)['ETag']
+            cached, _ = measure(lambda: client.get(url), repeat=50)
+            not_modified, _ = measure(
+                lambda: client.get(url, HTTP_IF_NONE_MATCH=etag), repeat=50)
+        print(f'{url:>28} {uncached:>10.2f} {cached:>8.2f} '
+              f'{not_modified:>8.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TITLES)
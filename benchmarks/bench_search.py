@@ -0,0 +1,47 @@
+"""Время поиска произведений по слову: фильтр name (LIKE '%...%') против
+полнотекстового фильтра search.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_search [количество произведений]
+"""
+import random
+import sys
+
+from benchmarks.utils import BATCH_SIZE, measure, setup_django
+
+DEFAULT_TITLES: int = 1000000
+WORDS = (
+    'война мир любовь время город ночь море дорога дом небо звезда огонь '
+    'зима лето сердце песня тайна остров охота память').split()
+
+
+def main(count):
+    setup_django()
+    from rest_framework.test import APIClient
+
+    from reviews.models import Title
+    from reviews.search import get_search_backend
+
+    generator = random.Random(0)
+    Title.objects.bulk_create(
+        (Title(
+            description=' '.join(generator.choices(WORDS, k=12)),
+            name=' '.join(generator.choices(WORDS, k=3)),
+            year=2000) for _ in range(count)),
+        batch_size=BATCH_SIZE)
+    # Редкое слово, которое встречается в одном произведении.
+    Title.objects.create(name='Солярис', year=1961)
+    get_search_backend().rebuild()
+    client = APIClient()
+    print(f'{"запрос":>10} {"contains, мс":>14} {"search, мс":>12}')
+    for word in ('Солярис', 'огонь'):
+        contains_ms, _ = measure(
+            lambda: client.get('/api/v1/titles/', {'name': word}), repeat=5)
+        search_ms, _ = measure(
+            lambda: client.get('/api/v1/titles/', {'search': word}),
+            repeat=5)
+        print(f'{word:>10} {contains_ms:>14.2f} {search_ms:>12.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TITLES)
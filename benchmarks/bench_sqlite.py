@@ -0,0 +1,174 @@
+"""Многопроцессная нагрузка на один файл SQLite: каждый процесс со своим
+пользователем создает отзывы и комментарии и читает списки отзывов и
+произведений. Сравниваются SQLite без профиля настройки
+(DB_SQLITE_TUNING=0), с профилем (WAL, busy_timeout, BEGIN IMMEDIATE) и с
+профилем и отдельным соединением для чтения
+(DB_SQLITE_READ_CONNECTION=1). Для каждого варианта выводит запросы в
+секунду, p50/p95 времени ответа, ошибки и из них "database is locked".
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_sqlite
+    python -m benchmarks.bench_sqlite --processes 8 --requests 400
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.utils import BASE_DIR
+
+PROFILES: dict = {
+    'без профиля': {'DB_SQLITE_TUNING': '0'},
+    'профиль': {'DB_SQLITE_TUNING': '1'},
+    'профиль + чтение': {
+        'DB_SQLITE_TUNING': '1', 'DB_SQLITE_READ_CONNECTION': '1'},
+}
+START_DELAY: float = 2.0
+
+
+def prepare(options):
+    """Создает таблицы и данные в файле DB_NAME."""
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    from benchmarks.bench_load import seed
+
+    call_command('migrate', verbosity=0)
+    seed(options.processes, options.requests, 10, 0, 0)
+
+
+def iteration_requests(title_id):
+    """Запросы одной итерации: половина на запись, половина на чтение."""
+    reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+    return (
+        ('post', reviews_url, {'text': 'Нагрузочный отзыв', 'score': 7}),
+        ('get', reviews_url, None),
+        ('post', reviews_url + '{review_id}/comments/',
+         {'text': 'Комментарий'}),
+        ('get', '/api/v1/titles/?limit=20', None))
+
+
+def worker(options):
+    """Нагрузка одного процесса начиная с момента options.start; печатает
+    результаты в JSON.
+    """
+    import django
+
+    django.setup()
+    from rest_framework.test import APIClient
+
+    from reviews.models import Title, User
+
+    user = User.objects.order_by('pk')[options.worker]
+    title_ids = list(Title.objects.order_by('pk').values_list(
+        'pk', flat=True)[:options.requests // 4])
+    client = APIClient(raise_request_exception=False)
+    client.force_authenticate(user)
+    samples = []
+    time.sleep(max(options.start - time.time(), 0))
+    start = time.time()
+    for title_id in title_ids:
+        review_id = None
+        for method, url, body in iteration_requests(title_id):
+            url = url.format(review_id=review_id)
+            request_start = time.perf_counter()
+            response = getattr(client, method)(url, data=body)
+            latency = (time.perf_counter() - request_start) * 1000
+            error = getattr(response, 'exc_info', None)
+            samples.append((
+                latency,
+                response.status_code < 400,
+                error is not None and 'locked' in str(error[1])))
+            if response.status_code == 201 and url.endswith('/reviews/'):
+                review_id = response.json()['id']
+    print(json.dumps({
+        'start': start, 'end': time.time(), 'samples': samples}))
+
+
+def child(options, env, *args):
+    return subprocess.Popen(
+        (sys.executable, '-m', 'benchmarks.bench_sqlite',
+         '--processes', str(options.processes),
+         '--requests', str(options.requests), *args),
+        cwd=BASE_DIR, env=env, stdout=subprocess.PIPE, text=True)
+
+
+def run_profile(options, environ, db_name):
+    """Готовит базу и запускает options.processes процессов нагрузки."""
+    from api.v1.profiling import percentile
+
+    env = dict(os.environ, DB_ENGINE='django.db.backends.sqlite3',
+               DB_NAME=db_name, **environ)
+    process = child(options, env, '--prepare')
+    if process.wait():
+        raise RuntimeError('не удалось подготовить базу данных')
+    start = time.time() + START_DELAY
+    processes = [
+        child(options, env, '--worker', str(i), '--start', str(start))
+        for i in range(options.processes)]
+    reports = []
+    for process in processes:
+        output, _ = process.communicate()
+        if process.returncode:
+            raise RuntimeError('процесс нагрузки завершился с ошибкой')
+        reports.append(json.loads(output.strip().splitlines()[-1]))
+    samples = [sample for report in reports for sample in report['samples']]
+    elapsed = (max(report['end'] for report in reports)
+               - min(report['start'] for report in reports))
+    latencies = sorted(latency for latency, _, _ in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(not success for _, success, _ in samples),
+        'locked': sum(locked for _, _, locked in samples),
+        'rps': len(samples) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95)}
+
+
+def main(options):
+    if options.prepare:
+        return prepare(options)
+    if options.worker is not None:
+        return worker(options)
+    import django
+
+    django.setup()
+    report = {}
+    with tempfile.TemporaryDirectory() as db_dir:
+        for i, (name, environ) in enumerate(PROFILES.items()):
+            report[name] = run_profile(
+                options, environ, os.path.join(db_dir, f'{i}.sqlite3'))
+    print(f'{"вариант":<18} {"req/s":>8} {"p50":>8} {"p95":>8} '
+          f'{"ошибки":>7} {"locked":>7}')
+    for name, result in report.items():
+        print(f'{name:<18} {result["rps"]:>8.1f} {result["p50"]:>8.2f} '
+              f'{result["p95"]:>8.2f} {result["errors"]:>7} '
+              f'{result["locked"]:>7}')
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+    return report
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--processes', default=4, type=int,
+        help='Количество процессов, у каждого свой пользователь.')
+    parser.add_argument(
+        '--requests', default=200, type=int,
+        help='Запросов на процесс.')
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    parser.add_argument(
+        '--prepare', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--start', type=float, help=argparse.SUPPRESS)
+    return parser.parse_args(args)
+
+
+if __name__ == '__main__':
+    main(parse_args())
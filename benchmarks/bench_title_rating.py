@@ -0,0 +1,39 @@
+"""Время ответа GET /api/v1/titles/ при росте числа отзывов к произведению.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_title_rating [10 100 1000 10000 100000]
+"""
+import sys
+
+from benchmarks.utils import (
+    create_reviews, create_users, measure, setup_django)
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+TITLES_PER_PAGE: int = 5
+
+
+def main(sizes):
+    setup_django()
+    from django.db.models import Avg
+    from rest_framework.test import APIClient
+
+    from reviews.models import Title
+
+    client = APIClient()
+    authors = create_users(max(sizes))
+    print(f'{"отзывов":>10} {"API, мс":>12} {"Avg-запрос, мс":>16}')
+    for size in sizes:
+        Title.objects.all().delete()
+        for number in range(TITLES_PER_PAGE):
+            title = Title.objects.create(name=f'title {number}', year=2000)
+            create_reviews(title, authors[:size])
+        Title.objects.recalculate_rating()
+        stored, _ = measure(lambda: client.get('/api/v1/titles/'))
+        aggregated, _ = measure(lambda: list(
+            Title.objects.annotate(
+                avg_rating=Avg('reviews__score'))[:TITLES_PER_PAGE]))
+        print(f'{size:>10} {stored:>12.2f} {aggregated:>16.2f}')
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or DEFAULT_SIZES)
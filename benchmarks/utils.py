@@ -0,0 +1,98 @@
+import atexit
+from contextlib import contextmanager
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(BASE_DIR, 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+BATCH_SIZE: int = 5000
+POSTGRESQL_ENGINE: str = 'django.db.backends.postgresql'
+
+
+def setup_django(test_db_name=None):
+    """Настраивает Django и создает чистую тестовую базу данных.
+    По умолчанию SQLite-база создается в памяти, test_db_name задает файл.
+    На других базах данных создается отдельная база процесса, которая
+    удаляется при его завершении.
+    """
+    import django
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    database = settings.DATABASES['default']
+    if not database['ENGINE'].endswith('sqlite3'):
+        database['TEST'] = {'NAME': f'test_bench_{os.getpid()}'}
+    elif test_db_name is not None:
+        database['TEST'] = {'NAME': test_db_name}
+    django.setup()
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    if connection.vendor != 'sqlite':
+        atexit.register(connection.creation.destroy_test_db, verbosity=0)
+
+
+def measure(func, repeat=20):
+    """Возвращает медиану и p99 времени выполнения func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    return statistics.median(timings), p99
+
+
+def create_users(count, prefix='bench'):
+    from reviews.models import User
+
+    users = (
+        User(username=f'{prefix}{i}', email=f'{prefix}{i}@yamdb.fake')
+        for i in range(count))
+    User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+    return list(
+        User.objects.filter(username__startswith=prefix).values_list(
+            'pk', flat=True))
+
+
+def create_reviews(title, author_ids, score=lambda i: i % 10 + 1):
+    from reviews.models import Review
+
+    reviews = (
+        Review(author_id=author_id, score=score(i), text='text', title=title)
+        for i, author_id in enumerate(author_ids))
+    Review.objects.bulk_create(reviews, batch_size=BATCH_SIZE)
+
+
+@contextmanager
+def postgres_environ():
+    """Переменные окружения settings.DATABASES для PostgreSQL. Если
+    DB_ENGINE уже указывает на PostgreSQL, используется этот сервер, иначе
+    во временной папке запускается локальный сервер pgserver (без
+    контейнера) и останавливается на выходе. Без pgserver возвращает None.
+    """
+    if os.getenv('DB_ENGINE') == POSTGRESQL_ENGINE:
+        yield {}
+        return
+    try:
+        import pgserver
+    except ImportError:
+        yield None
+        return
+    with tempfile.TemporaryDirectory() as data_dir:
+        server = pgserver.get_server(data_dir, cleanup_mode='stop')
+        try:
+            yield {
+                'DB_ENGINE': POSTGRESQL_ENGINE,
+                'DB_HOST': data_dir,
+                'DB_NAME': 'postgres',
+                'POSTGRES_USER': 'postgres'}
+        finally:
+            server.cleanup()
@@ -109,3 +109,35 @@ def user_client(token_user):
     client = APIClient()
     client.credentials(HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}')
     return client
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    from api.v1.authentication import user_cache
+
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    from api.v1.cache import response_cache_stats
+    from reviews.cache import get_response_cache
+
+    get_response_cache().clear()
+    response_cache_stats.clear()
+    yield
+
+
+@pytest.fixture
+def local_response_cache(settings):
+    """Кэш ответов в памяти процесса: тесты выполняются в одном процессе,
+    а по умолчанию такой кэш отключен.
+    """
+    from reviews.cache import get_response_cache
+
+    settings.CACHES = {**settings.CACHES, 'responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses'}}
+    get_response_cache().clear()
@@ -0,0 +1,27 @@
+"""Запуск тестов на PostgreSQL. Если DB_ENGINE не указывает на PostgreSQL,
+во временной папке запускается локальный сервер pgserver
+(pip install pgserver).
+
+Запуск из корня репозитория:
+    python -m tests.postgresql [аргументы pytest]
+"""
+import os
+import sys
+
+import pytest
+
+from benchmarks.utils import postgres_environ
+
+
+def main(args):
+    with postgres_environ() as environ:
+        if environ is None:
+            print('PostgreSQL недоступен: укажите DB_ENGINE, DB_HOST и '
+                  'другие переменные DB_* или установите pgserver.')
+            return pytest.ExitCode.USAGE_ERROR
+        os.environ.update(environ)
+        return pytest.main(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,86 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAPI:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user, user_client, moderator,
+                                              moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что при создании отзыва его оценка учитывается в '
+            'рейтинге произведения.'
+        )
+
+        response = user_client.patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/',
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 6, (
+            'Проверьте, что при изменении оценки отзыва рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        response = user_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что при удалении отзыва его оценка исключается из '
+            'рейтинга произведения.'
+        )
+
+        for review in (reviews[0], reviews[2]):
+            admin_client.delete(
+                f'/api/v1/titles/{title_id}/reviews/{review["id"]}/'
+            )
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что у произведения без отзывов поле `rating` '
+            'равно `None`.'
+        )
+
+    def test_02_rating_follows_author_deletion(self, admin_client, user,
+                                               user_client):
+        author_map = {user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Проверьте, что при удалении автора оценки его отзывов '
+            'исключаются из рейтинга произведений.'
+        )
+
+    def test_03_recalculate_ratings_command(self, admin_client, user,
+                                            user_client):
+        from reviews.models import Title
+
+        author_map = {user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        create_single_review(user_client, titles[1]['id'], 'text', 3)
+        Title.objects.update(rating=None, rating_count=0, rating_sum=0)
+
+        call_command('recalculate_ratings')
+        assert self.get_rating(admin_client, titles[0]['id']) == 5
+        assert self.get_rating(admin_client, titles[1]['id']) == 3, (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'рейтинг произведений по их отзывам.'
+        )
@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueriesAPI:
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries)
+
+    def create_many_titles(self, admin_client, count):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        genres = Title.objects.get(pk=titles[0]['id']).genre.all()
+        category = Title.objects.get(pk=titles[0]['id']).category
+        for number in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {number}', year=2000, category=category)
+            title.genre.set(genres)
+
+    def test_01_titles_list_queries(self, client, admin_client):
+        self.create_many_titles(admin_client, 10)
+        url = '/api/v1/titles/?limit={}'
+        single = self.count_queries(client, url.format(1))
+        page = self.count_queries(client, url.format(10))
+        assert single == page, (
+            'Проверьте, что количество запросов к базе данных при GET-запросе '
+            'к `/api/v1/titles/` не зависит от количества произведений на '
+            f'странице: {single} запросов для 1 и {page} для 10 произведений.'
+        )
+
+    def test_02_titles_detail_queries(self, client, admin_client):
+        from reviews.models import Title
+
+        self.create_many_titles(admin_client, 1)
+        title_id = Title.objects.first().pk
+        queries = self.count_queries(client, f'/api/v1/titles/{title_id}/')
+        assert queries <= 2, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/` '
+            'получает произведение с категорией и жанрами не более чем за '
+            f'2 запроса к базе данных. Сейчас запросов: {queries}.'
+        )
@@ -0,0 +1,112 @@
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+import json
+
+import pytest
+
+from tests.utils import create_comments, create_titles
+
+
+def encode_cursor(position, reverse=False):
+    cursor = json.dumps({'p': position, 'r': int(reverse)})
+    return urlsafe_b64encode(cursor.encode()).decode('ascii')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPaginationAPI:
+
+    def walk_pages(self, client, url):
+        ids = []
+        response = client.get(url)
+        while True:
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` с параметром '
+                '`pagination=cursor` возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            for key in ('next', 'previous', 'results'):
+                assert key in data, (
+                    f'Проверьте, что ответ на GET-запрос к `{url}` в режиме '
+                    f'курсорной пагинации содержит ключ `{key}`.'
+                )
+            ids.extend(obj['id'] for obj in data['results'])
+            if not data['next']:
+                return ids, data
+            response = client.get(data['next'])
+
+    def test_01_titles_keyset_pagination(self, client, admin_client):
+        from reviews.models import Title
+
+        create_titles(admin_client)
+        for number in range(10):
+            Title.objects.create(name='Дубль', year=2000 + number)
+        expected = list(Title.objects.order_by('name', 'id').values_list(
+            'id', flat=True))
+
+        ids, last_page = self.walk_pages(
+            client, '/api/v1/titles/?pagination=cursor&limit=3')
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` обходит '
+            'все произведения по порядку `name`, `id` без пропусков и '
+            'повторов.'
+        )
+
+        response = client.get(last_page['previous'])
+        assert response.status_code == HTTPStatus.OK
+        previous_ids = [obj['id'] for obj in response.json()['results']]
+        assert previous_ids == expected[-3 - len(last_page['results']):
+                                        -len(last_page['results'])], (
+            'Проверьте, что ссылка `previous` курсорной пагинации ведет на '
+            'предыдущую страницу.'
+        )
+
+        response = client.get('/api/v1/titles/?offset=2&limit=2')
+        assert response.json()['count'] == len(expected), (
+            'Проверьте, что пагинация по `limit`/`offset` для '
+            '`/api/v1/titles/` остается доступной по умолчанию.'
+        )
+
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что некорректный курсор отклоняется со статусом 404.'
+        )
+        for position in ([None, None], [[1], 1], ['title', {'id': 1}]):
+            response = client.get(
+                '/api/v1/titles/', {'cursor': encode_cursor(position)})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что курсор с пустыми или составными значениями '
+                'отклоняется со статусом 404.'
+            )
+
+    def test_02_reviews_and_comments_keyset_pagination(
+            self, client, admin_client, admin, user, user_client,
+            moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        ids, _ = self.walk_pages(
+            client, f'{reviews_url}?pagination=cursor&limit=2')
+        assert ids == [review['id'] for review in reversed(reviews)], (
+            f'Проверьте, что курсорная пагинация `{reviews_url}` обходит '
+            'отзывы от новых к старым.'
+        )
+
+        for position in ([[1], 1], ['not a date', 1], [None, 1]):
+            response = client.get(
+                reviews_url, {'cursor': encode_cursor(position)})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что некорректный курсор `{reviews_url}` '
+                'отклоняется со статусом 404.'
+            )
+
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        ids, _ = self.walk_pages(
+            client, f'{comments_url}?pagination=cursor&limit=2')
+        assert ids == [comment['id'] for comment in reversed(comments)], (
+            f'Проверьте, что курсорная пагинация `{comments_url}` обходит '
+            'комментарии от новых к старым.'
+        )
@@ -0,0 +1,64 @@
+import csv
+import os
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def csv_rows(table):
+    with open(os.path.join(DATA_PATH, f'{table}.csv'),
+              encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11LoadCSV:
+
+    def test_01_load_csv(self, client, admin):
+        from reviews.models import (
+            Category, Comment, Genre, GenreToTitle, Review, Title, User)
+
+        call_command('load_csv', batch_size=7)
+        expected = (
+            (User, 'users', 1),
+            (Category, 'category', 0),
+            (Genre, 'genre', 0),
+            (Title, 'titles', 0),
+            (GenreToTitle, 'genre_title', 0),
+            (Review, 'review', 0),
+            (Comment, 'comments', 0))
+        for model, table, existing in expected:
+            assert model.objects.count() == len(csv_rows(table)) + existing, (
+                f'Проверьте, что команда `load_csv` загружает все строки '
+                f'файла `{table}.csv`.'
+            )
+
+        review = csv_rows('review')[0]
+        assert Review.objects.get(pk=review['id']).pub_date.isoformat(
+        ).startswith(review['pub_date'][:19]), (
+            'Проверьте, что команда `load_csv` сохраняет `pub_date` из CSV.'
+        )
+        title_id = review['title_id']
+        scores = [
+            int(row['score']) for row in csv_rows('review')
+            if row['title_id'] == title_id]
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.json()['rating'] == sum(scores) // len(scores), (
+            'Проверьте, что после загрузки отзывов командой `load_csv` '
+            'рейтинг произведений пересчитывается.'
+        )
+        genre_slugs = {
+            row['id']: row['slug'] for row in csv_rows('genre')}
+        expected_genres = sorted(
+            genre_slugs[row['genre_id']] for row in csv_rows('genre_title')
+            if row['title_id'] == title_id)
+        assert sorted(
+            genre['slug'] for genre in response.json()['genre']
+        ) == expected_genres, (
+            'Проверьте, что команда `load_csv` сопоставляет жанры '
+            'произведениям по id из CSV.'
+        )
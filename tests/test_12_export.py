@@ -0,0 +1,85 @@
+import csv
+from http import HTTPStatus
+from io import StringIO
+import json
+
+import pytest
+from django.core.management import call_command
+
+from tests.test_11_load_csv import csv_rows
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ExportAPI:
+
+    def get_content(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос администратора к `{url}` возвращает '
+            'ответ со статусом 200.'
+        )
+        assert response.streaming, (
+            f'Проверьте, что `{url}` отдает выгрузку потоково '
+            '(`StreamingHttpResponse`).'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_export_permissions(self, client, user_client):
+        for api_client in (client, user_client):
+            response = api_client.get('/api/v1/export/titles.csv')
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN), (
+                'Проверьте, что выгрузка `/api/v1/export/` доступна только '
+                'администратору.'
+            )
+
+    def test_02_export_csv(self, admin_client):
+        call_command('load_csv')
+        for table in ('titles', 'genre_title', 'review', 'comments'):
+            url = f'/api/v1/export/{table}.csv'
+            rows = list(csv.DictReader(StringIO(
+                self.get_content(admin_client, url))))
+            expected = sorted(csv_rows(table), key=lambda row: int(row['id']))
+            assert [row['id'] for row in rows] == [
+                row['id'] for row in expected], (
+                f'Проверьте, что `{url}` выгружает все строки в формате '
+                f'`static/data/{table}.csv`.'
+            )
+            assert list(rows[0]) == list(expected[0]), (
+                f'Проверьте, что колонки `{url}` совпадают с колонками '
+                f'`static/data/{table}.csv`.'
+            )
+        assert all(
+            rows[0][key] == expected[0][key]
+            for key in ('review_id', 'text', 'pub_date')), (
+            'Проверьте, что `/api/v1/export/comments.csv` сохраняет значения '
+            'полей без изменений.'
+        )
+        response = admin_client.get('/api/v1/export/users.csv')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_export_ndjson(self, admin_client):
+        call_command('load_csv')
+        content = self.get_content(admin_client, '/api/v1/export/titles.ndjson')
+        titles = [json.loads(line) for line in content.splitlines()]
+        assert len(titles) == len(csv_rows('titles'))
+        detail = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert titles[0]['rating'] == detail['rating']
+        assert titles[0]['category'] == detail['category']['slug']
+        assert sorted(titles[0]['genre']) == sorted(
+            genre['slug'] for genre in detail['genre']), (
+            'Проверьте, что выгрузка произведений в NDJSON содержит slug '
+            'жанров, категории и рейтинг.'
+        )
+
+    def test_04_export_command(self, tmp_path):
+        call_command('load_csv')
+        output = tmp_path / 'review.csv'
+        call_command('export_data', 'review', output=str(output),
+                     chunk_size=3)
+        expected = sorted(csv_rows('review'), key=lambda row: int(row['id']))
+        with open(output, encoding='utf-8', newline='') as file:
+            assert list(csv.DictReader(file)) == expected, (
+                'Проверьте, что команда `export_data` выгружает отзывы в '
+                'формате `static/data/review.csv`.'
+            )
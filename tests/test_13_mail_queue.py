@@ -0,0 +1,152 @@
+from datetime import timedelta
+from http import HTTPStatus
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, имитирующий недоступный SMTP-сервер."""
+
+    def send_messages(self, email_messages):
+        raise SMTPException('Сервер недоступен')
+
+
+class UnreachableEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, к серверу которого нельзя подключиться."""
+
+    def open(self):
+        raise ConnectionRefusedError(111, 'Connection refused')
+
+    def send_messages(self, email_messages):
+        raise AssertionError('Письма отправляются без соединения.')
+
+
+class RecordingEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, запоминающий состояние писем в очереди и
+    транзакции во время отправки.
+    """
+    sends = []
+
+    def send_messages(self, email_messages):
+        from reviews.models import QueuedEmail
+
+        self.sends.append((
+            connection.in_atomic_block,
+            list(QueuedEmail.objects.values_list('status', flat=True))))
+        return len(email_messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13MailQueue:
+    url_signup = '/api/v1/auth/signup/'
+
+    def signup(self, client, number):
+        data = {
+            'email': f'queued{number}@yamdb.fake',
+            'username': f'queued{number}'
+        }
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == HTTPStatus.OK
+        return data
+
+    def test_01_queue_is_drained_in_batches(self, client):
+        users = [self.signup(client, number) for number in range(5)]
+        assert len(mail.outbox) == 0, (
+            f'Проверьте, что POST-запрос к `{self.url_signup}` только ставит '
+            'письмо в очередь.'
+        )
+        call_command('send_queued_mail', batch_size=2)
+        assert sorted(message.to[0] for message in mail.outbox) == sorted(
+            user['email'] for user in users), (
+            'Проверьте, что команда `send_queued_mail` отправляет все письма '
+            'из очереди.'
+        )
+        call_command('send_queued_mail')
+        assert len(mail.outbox) == len(users), (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_retry_and_dead_letter(self, client, settings):
+        from reviews.models import QueuedEmail
+
+        self.signup(client, 0)
+        settings.EMAIL_BACKEND = 'tests.test_13_mail_queue.FailingEmailBackend'
+        call_command('send_queued_mail', max_attempts=2, retry_delay=60)
+        email = QueuedEmail.objects.get()
+        assert email.status == QueuedEmail.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt > timezone.now() + timedelta(seconds=30), (
+            'Проверьте, что неотправленное письмо откладывается на время '
+            'повторной попытки.'
+        )
+
+        QueuedEmail.objects.update(next_attempt=timezone.now())
+        call_command('send_queued_mail', max_attempts=2, retry_delay=60)
+        email.refresh_from_db()
+        assert email.status == QueuedEmail.FAILED, (
+            'Проверьте, что после исчерпания попыток письмо помечается как '
+            'недоставленное.'
+        )
+        assert 'SMTPException' in email.last_error
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        QueuedEmail.objects.update(next_attempt=timezone.now())
+        call_command('send_queued_mail')
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что недоставленные письма не отправляются повторно.'
+        )
+
+    def test_03_unreachable_server(self, client, settings):
+        from reviews.models import QueuedEmail
+
+        self.signup(client, 0)
+        self.signup(client, 1)
+        settings.EMAIL_BACKEND = (
+            'tests.test_13_mail_queue.UnreachableEmailBackend')
+        call_command('send_queued_mail', retry_delay=60)
+        for email in QueuedEmail.objects.all():
+            assert email.status == QueuedEmail.PENDING
+            assert email.attempts == 1, (
+                'Проверьте, что при недоступном почтовом сервере попытка '
+                'отправки записывается для всех забранных писем.'
+            )
+            assert email.next_attempt > timezone.now() + timedelta(
+                seconds=30)
+            assert 'ConnectionRefusedError' in email.last_error
+
+    def test_04_send_outside_transaction(self, client, settings):
+        from reviews.models import QueuedEmail
+
+        self.signup(client, 0)
+        RecordingEmailBackend.sends.clear()
+        settings.EMAIL_BACKEND = (
+            'tests.test_13_mail_queue.RecordingEmailBackend')
+        call_command('send_queued_mail')
+        assert RecordingEmailBackend.sends == [
+            (False, [QueuedEmail.SENDING])], (
+            'Проверьте, что письма помечаются как отправляемые и '
+            'отправляются вне транзакции.'
+        )
+        assert QueuedEmail.objects.get().status == QueuedEmail.SENT
+
+        self.signup(client, 1)
+        QueuedEmail.objects.filter(status=QueuedEmail.PENDING).update(
+            status=QueuedEmail.SENDING,
+            next_attempt=timezone.now() + timedelta(minutes=5))
+        call_command('send_queued_mail')
+        assert len(RecordingEmailBackend.sends) == 1, (
+            'Проверьте, что письмо с действующей арендой не отправляется '
+            'повторно.'
+        )
+        QueuedEmail.objects.update(next_attempt=timezone.now())
+        call_command('send_queued_mail')
+        assert len(RecordingEmailBackend.sends) == 2, (
+            'Проверьте, что после окончания аренды письмо упавшего '
+            'процесса отправляется снова.'
+        )
@@ -0,0 +1,189 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.v1.authentication import VersionedAccessToken
+
+
+def user_queries(context):
+    return [
+        query for query in context.captured_queries
+        if 'FROM "reviews_user"' in query['sql']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14AuthCache:
+
+    def test_01_token_for_confirmation_code(self, client):
+        data = {'email': 'cached@yamdb.fake', 'username': 'cached'}
+        client.post('/api/v1/auth/signup/', data=data)
+        call_command('send_queued_mail')
+        code = mail.outbox[0].body.split('"')[1]
+        response = client.post(
+            '/api/v1/auth/token/',
+            data={'username': data['username'], 'confirmation_code': code})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что POST-запрос к `/api/v1/auth/token/` с верным '
+            '`confirmation_code` возвращает ответ со статусом 200.'
+        )
+        api_client = APIClient()
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}')
+        response = api_client.get('/api/v1/users/me/')
+        assert response.json()['username'] == data['username'], (
+            'Проверьте, что выданный токен аутентифицирует пользователя.'
+        )
+
+    def test_02_user_is_cached(self, user_client, admin_client):
+        user_client.get('/api/v1/users/me/')
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert not user_queries(context), (
+            'Проверьте, что повторный запрос с тем же токеном не загружает '
+            'пользователя из базы данных.'
+        )
+        response = admin_client.get('/api/v1/auth/cache/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['users']['hits'] >= 1, (
+            'Проверьте, что `/api/v1/auth/cache/` возвращает счетчики '
+            'попаданий и промахов кэша пользователей.'
+        )
+        response = user_client.get('/api/v1/auth/cache/')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_cache_invalidation(self, admin_client, user, user_client):
+        url = '/api/v1/users/'
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(
+            f'{url}{user.username}/', data={'role': 'admin'})
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(url).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменение роли пользователя через '
+            f'`{url}{{username}}/` отзывает выданные ему токены.'
+        )
+        user.refresh_from_db()
+        user_client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {VersionedAccessToken.for_user(user)}')
+        assert user_client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение роли пользователя через '
+            f'`{url}{{username}}/` сбрасывает закэшированного пользователя.'
+        )
+        response = admin_client.delete(f'{url}{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert user_client.get(
+            '/api/v1/users/me/').status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что удаление пользователя сбрасывает '
+            'закэшированного пользователя.'
+        )
+
+    def test_04_outdated_token_version(self, user, user_client):
+        from reviews.models import User
+
+        User.objects.filter(pk=user.pk).update(token_version=1)
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен с устаревшей версией отклоняется.'
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14RoleClaims:
+
+    def claims_client(self, user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {VersionedAccessToken.for_user(user)}')
+        return client
+
+    def test_01_permissions_without_user_queries(self, admin, user):
+        admin_claims_client = self.claims_client(admin)
+        user_claims_client = self.claims_client(user)
+        for client in (admin_claims_client, user_claims_client):
+            client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            assert user_claims_client.get(
+                '/api/v1/users/').status_code == HTTPStatus.FORBIDDEN
+            assert user_claims_client.get(
+                '/api/v1/titles/').status_code == HTTPStatus.OK
+        assert not user_queries(context), (
+            'Проверьте, что проверка прав по токену с ролью не загружает '
+            'пользователя из базы данных.'
+        )
+        assert admin_claims_client.get(
+            '/api/v1/users/').status_code == HTTPStatus.OK, (
+            'Проверьте, что роль администратора из токена дает доступ к '
+            '`/api/v1/users/`.'
+        )
+
+    def test_02_author_checks_with_claims(self, admin_client, user,
+                                          moderator):
+        from tests.utils import create_reviews
+
+        user_claims_client = self.claims_client(user)
+        moderator_claims_client = self.claims_client(moderator)
+        reviews, titles = create_reviews(
+            admin_client, {user: user_claims_client})
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        response = user_claims_client.patch(url, data={'text': 'new text'})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор может изменить свой отзыв, используя '
+            'токен с ролью.'
+        )
+        response = moderator_claims_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        response = user_claims_client.get('/api/v1/users/me/')
+        assert response.json()['username'] == user.username
+
+    def test_03_role_change_rejects_stale_claims(self, admin_client, user):
+        user_claims_client = self.claims_client(user)
+        assert user_claims_client.get(
+            '/api/v1/users/me/').status_code == HTTPStatus.OK
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'})
+        assert response.status_code == HTTPStatus.OK
+        assert user_claims_client.get(
+            '/api/v1/users/me/').status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после изменения роли токен с прежней ролью '
+            'отклоняется.'
+        )
+        user.refresh_from_db()
+        response = self.claims_client(user).get('/api/v1/users/me/')
+        assert response.json()['role'] == 'moderator'
+
+    def test_04_orm_role_change_rejects_stale_claims(self, admin, user):
+        from reviews.models import User
+
+        user_claims_client = self.claims_client(user)
+        staff_claims_client = self.claims_client(admin)
+        for client in (user_claims_client, staff_claims_client):
+            assert client.get(
+                '/api/v1/users/me/').status_code == HTTPStatus.OK
+        user = User.objects.get(pk=user.pk)
+        user.role = User.ADMIN
+        user.save()
+        assert user_claims_client.get(
+            '/api/v1/users/me/').status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменение роли через ORM или админку отклоняет '
+            'токен с прежней ролью.'
+        )
+        admin = User.objects.get(pk=admin.pk)
+        admin.is_staff = not admin.is_staff
+        admin.save(update_fields=('is_staff',))
+        assert staff_claims_client.get(
+            '/api/v1/users/me/').status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменение флага `is_staff` отклоняет токен с '
+            'прежним значением флага.'
+        )
+        token_version = User.objects.get(pk=user.pk).token_version
+        user.bio = 'Новая биография'
+        user.save()
+        assert User.objects.get(pk=user.pk).token_version == token_version, (
+            'Проверьте, что изменение полей, не входящих в claims токена, '
+            'не отзывает токены пользователя.'
+        )
@@ -0,0 +1,154 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15SearchAPI:
+    url = '/api/v1/search/'
+
+    @pytest.fixture(autouse=True)
+    def rebuild_index(self):
+        # Очистка базы между тестами не затрагивает таблицу индекса.
+        call_command('rebuild_search_index')
+
+    def search(self, client, **params):
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` с параметром `q` '
+            'возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_01_search_validation(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{self.url}` без параметра `q` '
+            'возвращает ответ со статусом 400.'
+        )
+        response = client.get(self.url, {'q': 'back', 'type': 'user'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{self.url}` с неизвестным '
+            '`type` возвращает ответ со статусом 400.'
+        )
+
+    def test_02_search_follows_changes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data = self.search(client, q='Терминатор')
+        assert data['count'] == 1
+        result = data['results'][0]
+        assert result['type'] == 'title'
+        assert result['object']['id'] == titles[0]['id'], (
+            'Проверьте, что созданное произведение находится поиском по '
+            'названию.'
+        )
+
+        review = create_single_review(
+            admin_client, titles[1]['id'], 'Терминатор тут ни при чем',
+            5).json()
+        comment = create_single_comment(
+            admin_client, titles[1]['id'], review['id'],
+            'Терминатор лучше').json()
+        data = self.search(client, q='терминатор')
+        assert data['count'] == 3
+        found = {(item['type'], item['object']['id']) for item in data[
+            'results']}
+        assert found == {
+            ('title', titles[0]['id']),
+            ('review', review['id']),
+            ('comment', comment['id'])}, (
+            'Проверьте, что поиск находит произведения, отзывы и '
+            'комментарии.'
+        )
+        comment_result = next(
+            item for item in data['results'] if item['type'] == 'comment')
+        assert comment_result['title_id'] == titles[1]['id']
+        assert comment_result['review_id'] == review['id']
+
+        data = self.search(client, q='терминатор', type='review,comment')
+        assert {item['type'] for item in data['results']} == {
+            'review', 'comment'}, (
+            'Проверьте, что параметр `type` ограничивает типы результатов.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Чужой'})
+        admin_client.delete(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{review["id"]}/')
+        assert self.search(client, q='терминатор')['count'] == 0, (
+            'Проверьте, что индекс обновляется при изменении и удалении '
+            'объектов.'
+        )
+        assert self.search(client, q='Чуж')['count'] == 1, (
+            'Проверьте, что последнее слово запроса ищется как префикс.'
+        )
+
+    def test_03_search_ranking(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(
+            admin_client, titles[0]['id'],
+            'Длинный отзыв, в котором орешек упомянут всего один раз среди '
+            'множества других слов о сюжете, актерах и музыке', 5)
+        create_single_review(
+            admin_client, titles[1]['id'], 'Орешек, орешек, орешек', 5)
+        data = self.search(client, q='орешек', type='review')
+        ranks = [item['rank'] for item in data['results']]
+        assert ranks == sorted(ranks, reverse=True)
+        assert data['results'][0]['title_id'] == titles[1]['id'], (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+        data = self.search(client, q='орешек', limit=1)
+        assert data['count'] == 3 and len(data['results']) == 1, (
+            'Проверьте, что результаты поиска разбиты на страницы.'
+        )
+
+    def test_04_title_filter_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get('/api/v1/titles/', {'search': 'yay'})
+        assert response.status_code == HTTPStatus.OK
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id']], (
+            'Проверьте, что фильтр `search` эндпоинта `/api/v1/titles/` '
+            'ищет по описанию произведения.'
+        )
+
+    def test_05_title_stats(self, client, admin_client):
+        for number in range(3):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Сага, часть {number}', 'year': 2000})
+        with CaptureQueriesContext(connection) as plain:
+            self.search(client, q='сага', type='title')
+        with CaptureQueriesContext(connection) as queries:
+            data = self.search(client, q='сага', type='title', stats='true')
+        assert len(data['results']) == 3
+        assert all(
+            item['object']['stats']['review_count'] == 0
+            for item in data['results'])
+        assert len(queries) == len(plain), (
+            f'Проверьте, что `{self.url}` с параметром `stats=true` не '
+            'выполняет отдельный запрос статистики для каждого произведения.'
+        )
+
+    @pytest.mark.usefixtures('local_response_cache')
+    def test_06_rebuild_clears_response_cache(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        assert client.get(url, {'search': 'переименовано'}).json()[
+            'count'] == 0
+        Title.objects.filter(pk=titles[0]['id']).update(
+            name='Переименовано')
+        call_command('rebuild_search_index')
+        response = client.get(url, {'search': 'переименовано'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']], (
+            'Проверьте, что команда `rebuild_search_index` сбрасывает '
+            'закэшированные ответы.'
+        )
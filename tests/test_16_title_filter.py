@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleFilterAPI:
+    url = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, admin_client):
+        for slug in ('drama', 'melodrama', 'comedy'):
+            admin_client.post(
+                '/api/v1/genres/', data={'name': slug, 'slug': slug})
+        for slug in ('movie', 'book'):
+            admin_client.post(
+                '/api/v1/categories/', data={'name': slug, 'slug': slug})
+        result = {}
+        for name, genre, category in (
+                ('Драма', ['drama'], 'movie'),
+                ('Мелодрама', ['melodrama'], 'book'),
+                ('Драмеди', ['drama', 'comedy'], 'book')):
+            response = admin_client.post(self.url, data={
+                'category': category,
+                'genre': genre,
+                'name': name,
+                'year': 2000})
+            assert response.status_code == HTTPStatus.CREATED
+            result[name] = response.json()['id']
+        return result
+
+    def get_ids(self, client, params):
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK
+        return {title['id'] for title in response.json()['results']}
+
+    def test_01_exact_slug(self, client, titles):
+        assert self.get_ids(client, {'genre': 'drama'}) == {
+            titles['Драма'], titles['Драмеди']}, (
+            'Проверьте, что фильтр `genre` сравнивает slug жанра целиком: '
+            '`drama` не должен находить `melodrama`.'
+        )
+        assert self.get_ids(client, {'category': 'movie'}) == {
+            titles['Драма']}
+        assert self.get_ids(client, {'genre': 'dram'}) == set()
+
+    def test_02_slug_list(self, client, titles):
+        assert self.get_ids(client, {'genre': 'melodrama,comedy'}) == {
+            titles['Мелодрама'], titles['Драмеди']}, (
+            'Проверьте, что фильтр `genre` со списком slug через запятую '
+            'находит произведения с любым из жанров.'
+        )
+        assert self.get_ids(
+            client, {'genre': 'drama,comedy', 'genre_match': 'all'}) == {
+            titles['Драмеди']}, (
+            'Проверьте, что `genre_match=all` оставляет произведения со '
+            'всеми перечисленными жанрами.'
+        )
+        assert self.get_ids(
+            client, {'genre': 'drama,unknown', 'genre_match': 'all'}) == set()
+        assert self.get_ids(client, {'category': 'movie,book'}) == set(
+            titles.values())
+        response = client.get(self.url, {'genre_match': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_slug_list_queries(self, client, titles):
+        queries = {}
+        for genres in ('drama', 'drama,comedy'):
+            with CaptureQueriesContext(connection) as context:
+                client.get(self.url, {'genre': genres, 'genre_match': 'all'})
+            queries[genres] = len(context.captured_queries)
+        assert len(set(queries.values())) == 1, (
+            'Проверьте, что количество запросов при фильтрации по жанрам не '
+            f'зависит от количества slug: {queries}.'
+        )
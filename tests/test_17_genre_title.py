@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection, IntegrityError
+from django.db.migrations.executor import MigrationExecutor
+
+BEFORE_MERGE = [('reviews', '0007_genre_title_indexes')]
+AFTER_MERGE = [('reviews', '0008_merge_genre_title')]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17GenreTitle:
+
+    def test_01_unique_link(self):
+        from reviews.models import Genre, GenreToTitle, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title.genre.add(genre)
+        with pytest.raises(IntegrityError):
+            GenreToTitle.objects.create(genre=genre, title=title)
+
+    def test_02_migration_merges_links(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(BEFORE_MERGE)
+        apps = executor.loader.project_state(BEFORE_MERGE).apps
+        Genre = apps.get_model('reviews', 'Genre')
+        GenreTitle = apps.get_model('reviews', 'GenreTitle')
+        GenreToTitle = apps.get_model('reviews', 'GenreToTitle')
+        Title = apps.get_model('reviews', 'Title')
+        titles = [
+            Title.objects.create(name=f'Произведение {i}', year=2000)
+            for i in range(2)]
+        genres = [
+            Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+            for i in range(2)]
+        for title, genre in ((0, 0), (0, 0)):
+            GenreToTitle.objects.create(
+                genre=genres[genre], title=titles[title])
+        for title, genre in ((0, 0), (0, 1), (1, 1)):
+            GenreTitle.objects.create(
+                genre=genres[genre], title=titles[title])
+
+        executor.loader.build_graph()
+        executor.migrate(AFTER_MERGE)
+        apps = executor.loader.project_state(AFTER_MERGE).apps
+        links = apps.get_model('reviews', 'GenreToTitle').objects.values_list(
+            'title_id', 'genre_id')
+        assert sorted(links) == sorted(
+            (titles[title].pk, genres[genre].pk)
+            for title, genre in ((0, 0), (0, 1), (1, 1))), (
+            'Проверьте, что миграция объединяет связи жанров и произведений '
+            'из обеих таблиц без дубликатов.'
+        )
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
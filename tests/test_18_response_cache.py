@@ -0,0 +1,132 @@
+from http import HTTPStatus
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.test import override_settings
+
+from tests.conftest import MANAGE_PATH
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('local_response_cache')
+class Test18ResponseCacheAPI:
+
+    def get(self, client, url, expected_cache, **headers):
+        response = client.get(url, **headers)
+        assert response.status_code == HTTPStatus.OK
+        assert response['X-Cache'] == expected_cache, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ '
+            f'{"из кэша" if expected_cache == "HIT" else "без кэша"}.'
+        )
+        return response
+
+    def test_01_cache_hit(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/?year=1984&limit=2'
+        first = self.get(client, url, 'MISS')
+        second = self.get(client, '/api/v1/titles/?limit=2&year=1984', 'HIT')
+        assert first.json() == second.json(), (
+            'Проверьте, что ответ из кэша совпадает с исходным.'
+        )
+        assert first['ETag'] == second['ETag']
+        assert first['Last-Modified'] == second['Last-Modified']
+        self.get(client, f'/api/v1/titles/{titles[0]["id"]}/', 'MISS')
+        self.get(client, f'/api/v1/titles/{titles[0]["id"]}/', 'HIT')
+        self.get(client, '/api/v1/categories/', 'MISS')
+        self.get(client, '/api/v1/categories/', 'HIT')
+
+    def test_02_invalidation(self, client, admin_client):
+        titles, categories, _ = create_titles(admin_client)
+        first_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        second_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        for url in (first_url, second_url, '/api/v1/titles/',
+                    '/api/v1/genres/'):
+            self.get(client, url, 'MISS')
+
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 7)
+        response = self.get(client, first_url, 'MISS')
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+        self.get(client, second_url, 'HIT')
+        self.get(client, '/api/v1/genres/', 'HIT')
+        self.get(client, '/api/v1/titles/', 'MISS')
+
+        admin_client.patch(second_url, data={'name': 'Новое название'})
+        assert self.get(client, second_url, 'MISS').json()['name'] == (
+            'Новое название'), (
+            'Проверьте, что изменение произведения сбрасывает его кэш.'
+        )
+        self.get(client, first_url, 'HIT')
+
+        admin_client.delete(f'/api/v1/categories/{categories[0]["slug"]}/')
+        assert self.get(client, first_url, 'MISS').json()['category'] is None
+        assert categories[0]['slug'] not in {
+            category['slug'] for category in self.get(
+                client, '/api/v1/categories/', 'MISS').json()['results']}, (
+            'Проверьте, что удаление категории сбрасывает кэш категорий и '
+            'произведений.'
+        )
+
+    def test_03_not_modified(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = self.get(client, url, 'MISS')
+        for headers in (
+                {'HTTP_IF_NONE_MATCH': response['ETag']},
+                {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']}):
+            not_modified = client.get(url, **headers)
+            assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+                'Проверьте, что при совпадении `ETag` или `Last-Modified` '
+                'возвращается ответ со статусом 304.'
+            )
+            assert not not_modified.content
+        admin_client.patch(url, data={'year': 1985})
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['year'] == 1985
+
+    def test_04_cache_stats(self, client, user_client, admin_client):
+        for _ in range(4):
+            client.get('/api/v1/genres/')
+        response = user_client.get('/api/v1/cache/')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        stats = admin_client.get('/api/v1/cache/').json()
+        assert stats['genres']['hits'] == 3
+        assert stats['genres']['misses'] == 1
+        assert stats['genres']['hit_ratio'] == 0.75, (
+            'Проверьте, что `/api/v1/cache/` возвращает долю попаданий в '
+            'кэш ответов.'
+        )
+
+    def test_05_file_backend(self, client, admin_client, tmp_path):
+        backend = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path)}
+        with override_settings(CACHES={
+                'default': backend, 'responses': backend}):
+            self.get(client, '/api/v1/genres/', 'MISS')
+            self.get(client, '/api/v1/genres/', 'HIT')
+            admin_client.post(
+                '/api/v1/genres/', data={'name': 'Драма', 'slug': 'drama'})
+            response = self.get(client, '/api/v1/genres/', 'MISS')
+            assert response.json()['count'] == 1
+
+    def test_06_local_cache_disabled(self):
+        result = subprocess.run(
+            (sys.executable, '-c',
+             'import json; from api_yamdb import settings; '
+             'print(json.dumps(settings.CACHES["responses"]["BACKEND"]))'),
+            capture_output=True, check=True, cwd=MANAGE_PATH, env={
+                key: value for key, value in os.environ.items()
+                if not key.startswith('RESPONSE_CACHE_')},
+            text=True)
+        assert json.loads(result.stdout) == (
+            'django.core.cache.backends.dummy.DummyCache'), (
+            'Проверьте, что кэш ответов в памяти процесса по умолчанию '
+            'отключен: его не сбрасывает запись в других процессах.'
+        )
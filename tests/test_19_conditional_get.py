@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ConditionalGetAPI:
+
+    def assert_not_modified(self, client, url, etag):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным ETag в '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert len(context.captured_queries) == 1, (
+            f'Проверьте, что ответ 304 на GET-запрос к `{url}` получается '
+            'одним запросом к базе данных, без выборки и сериализации '
+            f'объектов. Сейчас запросов: {len(context.captured_queries)}.'
+        )
+
+    def assert_modified(self, client, url, etag):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после изменения данных GET-запрос к `{url}` со '
+            'старым ETag возвращает ответ со статусом 200.'
+        )
+        assert response['ETag'] != etag
+        return response['ETag']
+
+    def test_01_reviews(self, client, admin_client, admin, user,
+                        user_client):
+        authors = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, authors)
+        list_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        detail_url = f'{list_url}{reviews[1]["id"]}/'
+        for url in (list_url, detail_url):
+            etag = client.get(url)['ETag']
+            self.assert_not_modified(client, url, etag)
+        list_etag = client.get(list_url)['ETag']
+        detail_etag = client.get(detail_url)['ETag']
+        other_etag = client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/')['ETag']
+
+        user_client.patch(detail_url, data={'text': 'Новый текст'})
+        list_etag = self.assert_modified(client, list_url, list_etag)
+        self.assert_modified(client, detail_url, detail_etag)
+        self.assert_not_modified(
+            client, f'/api/v1/titles/{titles[1]["id"]}/reviews/', other_etag)
+
+        self.assert_modified(client, f'{list_url}?limit=1', list_etag)
+        user_client.delete(detail_url)
+        self.assert_modified(client, list_url, list_etag)
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_comments(self, client, admin_client, admin, user,
+                         user_client):
+        authors = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, authors)
+        list_url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}'
+            '/comments/')
+        etag = client.get(list_url)['ETag']
+        self.assert_not_modified(client, list_url, etag)
+        detail_url = f'{list_url}{comments[0]["id"]}/'
+        self.assert_not_modified(
+            client, detail_url, client.get(detail_url)['ETag'])
+
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'Еще один')
+        etag = self.assert_modified(client, list_url, etag)
+        admin_client.patch(detail_url, data={'text': 'Исправлено'})
+        self.assert_modified(client, list_url, etag)
+
+    def test_03_missing_parent(self, client):
+        response = client.get(
+            '/api/v1/titles/999/reviews/', HTTP_IF_NONE_MATCH='"etag"')
+        assert response.status_code == HTTPStatus.NOT_FOUND
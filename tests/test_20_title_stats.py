@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleStatsAPI:
+
+    def get_stats(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/?stats=true')
+        assert response.status_code == HTTPStatus.OK
+        assert 'stats' in response.json(), (
+            'Проверьте, что GET-запрос к `/api/v1/titles/{title_id}/` с '
+            'параметром `stats=true` возвращает блок `stats`.'
+        )
+        return response.json()['stats']
+
+    def expected(self, scores, comments):
+        return {
+            'review_count': sum(scores.values()),
+            'comment_count': comments,
+            'histogram': {
+                str(score): scores.get(score, 0) for score in range(1, 11)}}
+
+    def test_01_stats_follow_changes(self, client, admin_client, admin, user,
+                                     user_client, moderator,
+                                     moderator_client):
+        authors = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client}
+        comments, reviews, titles = create_comments(admin_client, authors)
+        title_id = titles[0]['id']
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert 'stats' not in response.json(), (
+            'Проверьте, что блок `stats` выводится только по запросу.'
+        )
+        assert self.get_stats(client, title_id) == self.expected(
+            {5: 3}, 3), (
+            'Проверьте, что блок `stats` содержит гистограмму оценок и '
+            'количество отзывов и комментариев произведения.'
+        )
+        assert self.get_stats(client, titles[1]['id']) == self.expected(
+            {}, 0)
+
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        user_client.patch(
+            f'{reviews_url}{reviews[1]["id"]}/', data={'score': 9})
+        assert self.get_stats(client, title_id) == self.expected(
+            {5: 2, 9: 1}, 3), (
+            'Проверьте, что изменение оценки переносит отзыв в другой '
+            'столбец гистограммы.'
+        )
+
+        create_single_comment(
+            user_client, title_id, reviews[1]['id'], 'Комментарий')
+        assert self.get_stats(client, title_id) == self.expected(
+            {5: 2, 9: 1}, 4)
+        admin_client.delete(
+            f'{reviews_url}{reviews[0]["id"]}/comments/'
+            f'{comments[1]["id"]}/')
+        assert self.get_stats(client, title_id) == self.expected(
+            {5: 2, 9: 1}, 3)
+
+        admin_client.delete(f'{reviews_url}{reviews[0]["id"]}/')
+        assert self.get_stats(client, title_id) == self.expected(
+            {5: 1, 9: 1}, 1), (
+            'Проверьте, что удаление отзыва исключает из статистики его '
+            'оценку и комментарии.'
+        )
+
+    def test_02_rebuild_command(self, client, admin_client, admin, user,
+                                user_client):
+        from reviews.models import Title, TitleStats
+
+        authors = {admin: admin_client, user: user_client}
+        _, _, titles = create_comments(admin_client, authors)
+        TitleStats.objects.all().delete()
+        Title.objects.bulk_create([Title(name='Без статистики', year=2000)])
+        call_command('rebuild_title_stats')
+        assert self.get_stats(client, titles[0]['id']) == self.expected(
+            {5: 2}, 2), (
+            'Проверьте, что команда `rebuild_title_stats` восстанавливает '
+            'статистику произведений.'
+        )
+        title = Title.objects.get(name='Без статистики')
+        assert self.get_stats(client, title.pk) == self.expected({}, 0)
+
+    @pytest.mark.usefixtures('local_response_cache')
+    def test_03_list_cache(self, client, admin_client, admin, user,
+                           user_client):
+        authors = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, authors)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/?stats=true&name={titles[0]["name"]}'
+
+        def comment_count():
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            return response.json()['results'][0]['stats']['comment_count']
+
+        assert comment_count() == 2
+        create_single_comment(
+            user_client, title_id, reviews[0]['id'], 'Комментарий')
+        assert comment_count() == 3, (
+            'Проверьте, что новый комментарий сбрасывает кэш списка '
+            'произведений со статистикой.'
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+            f'comments/{comments[0]["id"]}/')
+        assert comment_count() == 2, (
+            'Проверьте, что удаление комментария сбрасывает кэш списка '
+            'произведений со статистикой.'
+        )
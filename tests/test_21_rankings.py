@@ -0,0 +1,186 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21RankingsAPI:
+
+    @pytest.fixture
+    def titles(self, admin_client, user_client, moderator_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post('/api/v1/titles/', data={
+            'category': categories[1]['slug'],
+            'genre': [genres[2]['slug']],
+            'name': 'Плохое кино',
+            'year': 2000})
+        titles.append({'id': response.json()['id']})
+        create_single_review(admin_client, titles[0]['id'], 'Отзыв', 10)
+        for client in (admin_client, user_client, moderator_client):
+            create_single_review(client, titles[1]['id'], 'Отзыв', 9)
+            create_single_review(client, titles[2]['id'], 'Отзыв', 1)
+        return [title['id'] for title in titles], categories, genres
+
+    def get_ids(self, client, url, **params):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [item['title']['id'] for item in response.json()['results']]
+
+    def test_01_top(self, client, titles):
+        title_ids, categories, genres = titles
+        url = '/api/v1/titles/top/'
+        assert self.get_ids(client, url) == []
+        call_command('refresh_rankings')
+        assert self.get_ids(client, url) == [
+            title_ids[1], title_ids[0], title_ids[2]], (
+            'Проверьте, что `/api/v1/titles/top/` упорядочивает произведения '
+            'по байесовскому рейтингу: одна высокая оценка не обгоняет '
+            'несколько чуть более низких.'
+        )
+        assert self.get_ids(client, url, category=categories[1]['slug']) == [
+            title_ids[1], title_ids[2]]
+        assert self.get_ids(client, url, genre=genres[0]['slug']) == [
+            title_ids[0]]
+        assert self.get_ids(
+            client, url, category=categories[1]['slug'],
+            genre=genres[2]['slug']) == [title_ids[1], title_ids[2]], (
+            'Проверьте, что `/api/v1/titles/top/` фильтрует по `category` и '
+            '`genre`.'
+        )
+        assert self.get_ids(client, url, genre='unknown') == []
+
+        response = client.get(url, {'limit': 2}).json()
+        assert [item['title']['id'] for item in response['results']] == [
+            title_ids[1], title_ids[0]]
+        assert self.get_ids(client, response['next']) == [title_ids[2]], (
+            'Проверьте, что `/api/v1/titles/top/` разбивается на страницы '
+            'курсором.'
+        )
+
+    def test_02_incremental_refresh(self, client, admin_client, titles):
+        from reviews.rankings import refresh_rankings
+
+        title_ids, _, _ = titles
+        assert refresh_rankings() == 3
+        assert refresh_rankings() == 0, (
+            'Проверьте, что повторное обновление без изменений не '
+            'пересчитывает произведения.'
+        )
+        admin_client.patch(f'/api/v1/titles/{title_ids[0]}/', data={
+            'name': 'Новое название'})
+        review_id = admin_client.get(
+            f'/api/v1/titles/{title_ids[2]}/reviews/').json()['results'][0][
+                'id']
+        admin_client.delete(
+            f'/api/v1/titles/{title_ids[2]}/reviews/{review_id}/')
+        # Удаление оценки 1 сдвигает среднюю оценку с 5.7 до 6.5.
+        with mock.patch('reviews.rankings.RANKING_PRIOR_TOLERANCE', 1):
+            refreshed = refresh_rankings()
+        assert refreshed == 1, (
+            'Проверьте, что обновление пересчитывает только произведения с '
+            'изменившимися оценками.'
+        )
+
+    def test_03_genre_change(self, client, titles):
+        from reviews.models import Genre, Title
+        from reviews.rankings import refresh_rankings
+
+        title_ids, _, genres = titles
+        url = '/api/v1/titles/top/'
+        refresh_rankings(full=True)
+        title = Title.objects.get(pk=title_ids[0])
+        old_genres = set(title.genre.values_list('slug', flat=True))
+        new_genre = next(
+            genre['slug'] for genre in genres
+            if genre['slug'] not in old_genres)
+        title.genre.set(Genre.objects.filter(slug=new_genre))
+        assert refresh_rankings() == 1, (
+            'Проверьте, что обновление рейтинга учитывает изменение жанров '
+            'произведения.'
+        )
+        assert title_ids[0] in self.get_ids(client, url, genre=new_genre)
+        for slug in old_genres:
+            assert title_ids[0] not in self.get_ids(client, url, genre=slug)
+
+    def test_04_prior(self, client, user_client, titles):
+        from reviews.models import TitleRanking
+        from reviews.rankings import mean_score, refresh_rankings
+
+        title_ids, _, _ = titles
+        refresh_rankings(full=True)
+        prior = mean_score()
+        create_single_review(user_client, title_ids[0], 'Отзыв', 10)
+        assert abs(mean_score() - prior) < 1
+        with mock.patch('reviews.rankings.RANKING_PRIOR_TOLERANCE', 1):
+            assert refresh_rankings() == 1
+        assert set(TitleRanking.objects.values_list(
+            'prior', flat=True)) == {prior}, (
+            'Проверьте, что частичное обновление сглаживает рейтинг к той '
+            'же средней оценке, что и остальные строки.'
+        )
+        assert refresh_rankings() == 3, (
+            'Проверьте, что при смещении средней оценки рейтинг '
+            'пересчитывается полностью.'
+        )
+        assert set(TitleRanking.objects.values_list(
+            'prior', flat=True)) == {mean_score()}
+
+    def test_05_trending(self, client, titles):
+        from reviews.rankings import refresh_rankings
+
+        title_ids, _, _ = titles
+        url = '/api/v1/titles/trending/'
+        refresh_rankings()
+        assert self.get_ids(client, url) == [
+            title_ids[1], title_ids[2], title_ids[0]], (
+            'Проверьте, что `/api/v1/titles/trending/` упорядочивает '
+            'произведения по количеству недавних отзывов.'
+        )
+        later = timezone.now() + timedelta(days=8)
+        with mock.patch('reviews.rankings.timezone.now', return_value=later):
+            assert refresh_rankings() == 3
+        response = client.get(url).json()
+        assert {item['trending'] for item in response['results']} == {0}, (
+            'Проверьте, что отзывы старше периода популярности перестают '
+            'учитываться после обновления рейтинга.'
+        )
+
+    def test_06_stats(self, client, titles):
+        title_ids, _, _ = titles
+        call_command('refresh_rankings')
+        for url in ('/api/v1/titles/top/', '/api/v1/titles/trending/'):
+            response = client.get(url)
+            assert all(
+                'stats' not in item['title']
+                for item in response.json()['results'])
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, {'stats': 'true'})
+            stats = {
+                item['title']['id']: item['title'].get('stats')
+                for item in response.json()['results']}
+            assert stats[title_ids[1]] == {
+                'review_count': 3,
+                'comment_count': 0,
+                'histogram': {
+                    str(score): 3 if score == 9 else 0
+                    for score in range(1, 11)}}, (
+                f'Проверьте, что `{url}?stats=true` выводит блок `stats` '
+                'произведений.'
+            )
+            with CaptureQueriesContext(connection) as plain:
+                client.get(url)
+            assert len(queries) == len(plain), (
+                f'Проверьте, что `{url}?stats=true` не выполняет отдельный '
+                'запрос статистики для каждого произведения.'
+            )
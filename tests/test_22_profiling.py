@@ -0,0 +1,135 @@
+import json
+from http import HTTPStatus
+from io import StringIO
+import socket
+
+import pytest
+from django.core.management import call_command, CommandError
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from api.v1.profiling import (
+    percentile, profile_buffer, PROFILE_METRICS, ProfileBuffer)
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture
+def clear_profile_buffer():
+    profile_buffer.clear()
+    yield
+    profile_buffer.clear()
+
+
+def profiled_client(token=None):
+    client = APIClient()
+    if token is not None:
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('clear_profile_buffer')
+class Test22Profiling:
+
+    def test_01_disabled(self, admin_client):
+        create_titles(admin_client)
+        assert admin_client.get('/api/v1/titles/').status_code == (
+            HTTPStatus.OK)
+        assert profile_buffer.report() == {}, (
+            'Проверьте, что без PROFILING_ENABLED запросы не профилируются.'
+        )
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_02_routes(self, token_admin):
+        client = profiled_client(token_admin['access'])
+        titles, _, _ = create_titles(client)
+        review = create_single_review(
+            client, titles[0]['id'], 'Отзыв', 5).json()
+        for _ in range(3):
+            client.get('/api/v1/titles/')
+        client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{review["id"]}/')
+        client.get('/api/v1/no-such-route/')
+
+        report = profile_buffer.report()
+        for route in ('titles-list', 'reviews-list', 'reviews-detail'):
+            assert route in report, (
+                f'Проверьте, что замеры записываются по маршруту `{route}`.'
+            )
+        assert report['titles-list']['requests'] >= 3
+        assert 'None' not in report and None not in report, (
+            'Проверьте, что запросы без маршрута не записываются.'
+        )
+        reviews = report['reviews-list']
+        assert set(PROFILE_METRICS) <= set(reviews)
+        assert reviews['queries']['max'] >= 1, (
+            'Проверьте, что считаются SQL-запросы.'
+        )
+        assert 0 < reviews['serializer_time']['max'] <= (
+            reviews['latency']['max'])
+        assert reviews['sql_time']['max'] <= reviews['latency']['max']
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_03_endpoint(self, token_admin, token_user):
+        admin_client = profiled_client(token_admin['access'])
+        admin_client.get('/api/v1/genres/')
+        user_client = profiled_client(token_user['access'])
+        response = user_client.get('/api/v1/profiling/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что замеры доступны только администратору.'
+        )
+        response = admin_client.get('/api/v1/profiling/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genres-list']['requests'] == 1
+
+        response = admin_client.delete('/api/v1/profiling/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert list(profile_buffer.report()) == ['profiling'], (
+            'Проверьте, что DELETE-запрос очищает замеры.'
+        )
+
+    @override_settings(PROFILING_ENABLED=True)
+    def test_04_report_command(self, live_server, token_admin):
+        profiled_client(token_admin['access']).get('/api/v1/genres/')
+        with pytest.raises(CommandError):
+            call_command('profiling_report', stdout=StringIO())
+        options = (
+            '--url', f'{live_server.url}/api/v1/profiling/',
+            '--token', token_admin['access'])
+        stdout = StringIO()
+        call_command('profiling_report', *options, '--json', stdout=stdout)
+        assert 'genres-list' in json.loads(stdout.getvalue()), (
+            'Проверьте, что команда `profiling_report` читает замеры '
+            'работающего сервера.'
+        )
+        stdout = StringIO()
+        call_command('profiling_report', *options, stdout=stdout)
+        assert 'genres-list' in stdout.getvalue()
+
+        with pytest.raises(CommandError, match='401'):
+            call_command(
+                'profiling_report', '--url', options[1], '--token', 'wrong',
+                stdout=StringIO())
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        with pytest.raises(CommandError, match='Не удалось подключиться'):
+            call_command(
+                'profiling_report', '--url',
+                f'http://127.0.0.1:{port}/api/v1/profiling/',
+                stdout=StringIO())
+
+
+def test_ring_buffer():
+    buffer = ProfileBuffer(max_size=3)
+    for latency in range(10):
+        buffer.record('titles-list', dict.fromkeys(PROFILE_METRICS, latency))
+    report = buffer.report()['titles-list']
+    assert report['requests'] == 3, (
+        'Проверьте, что буфер хранит только последние замеры.'
+    )
+    assert report['latency']['max'] == 9
+    assert report['latency']['p50'] == 8
+    assert percentile([1, 2, 3, 4], 50) == 2.5
+    assert percentile([], 50) is None
@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_load import seed
+from tests.conftest import BASE_DIR
+
+
+def test_load_benchmark(tmp_path):
+    output = tmp_path / 'load.json'
+    subprocess.run(
+        (sys.executable, '-m', 'benchmarks.bench_load', '--users', '5',
+         '--titles', '10', '--genres', '4', '--reviews', '2',
+         '--comments', '1', '--requests', '6', '--concurrency', '2',
+         '--output', str(output)),
+        check=True, cwd=BASE_DIR, env={**os.environ, 'SECRET_KEY': 'x'},
+        stdout=subprocess.DEVNULL)
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['config']['concurrency'] == 2
+    assert {'titles-list', 'reviews-list', 'comments-create'} <= set(
+        report['endpoints']), (
+        'Проверьте, что нагрузочный тест опрашивает эндпоинты API v1.'
+    )
+    for name, result in report['endpoints'].items():
+        assert result['requests'] == 6
+        assert result['errors'] == 0, (
+            f'Проверьте, что запросы к эндпоинту `{name}` выполняются без '
+            f'ошибок.'
+        )
+        assert result['rps'] > 0
+        assert result['p50'] <= result['p95'] <= result['p99']
+        assert result['queries'] >= 0
+
+    compared = subprocess.run(
+        (sys.executable, '-m', 'benchmarks.bench_load', '--titles', '10',
+         '--requests', '2', '--endpoint', 'titles-list',
+         '--compare', str(output)),
+        capture_output=True, check=True, cwd=BASE_DIR,
+        env={**os.environ, 'SECRET_KEY': 'x'}, text=True)
+    assert 'Δ p95' in compared.stdout
+
+
+@pytest.mark.django_db(transaction=True)
+def test_seed_title_stats():
+    from reviews.models import Title, TitleStats
+
+    seed(3, 5, 2, 2, 1)
+    assert TitleStats.objects.count() == Title.objects.count() == 5, (
+        'Проверьте, что у произведений нагрузочного теста есть статистика.'
+    )
+    assert set(TitleStats.objects.values_list(
+        'review_count', 'comment_count')) == {(2, 2)}
@@ -0,0 +1,106 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title, User
+
+TITLES: int = 20
+REVIEWS_PER_TITLE: int = 300
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Проверяется план запроса SQLite (EXPLAIN QUERY PLAN).')
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return ' '.join(str(row[-1]) for row in cursor.fetchall())
+
+
+def list_queries(client, url, table):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+        and 'ORDER BY' in query['sql']]
+
+
+def assert_index_scan(sql, index):
+    plan = query_plan(sql)
+    assert index in plan, (
+        f'Проверьте, что запрос использует индекс `{index}`: {plan}'
+    )
+    assert 'TEMP B-TREE' not in plan, (
+        f'Проверьте, что запрос не сортирует строки: {plan}'
+    )
+
+
+@pytest.fixture
+def reviews_dataset(db):
+    User.objects.bulk_create(
+        User(username=f'author{i}', email=f'author{i}@yamdb.fake')
+        for i in range(REVIEWS_PER_TITLE))
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000) for i in range(TITLES))
+    authors = list(User.objects.order_by('pk'))
+    titles = list(Title.objects.order_by('pk'))
+    Review.objects.bulk_create(
+        Review(author=author, score=i % 10 + 1, text='text', title=title)
+        for title in titles
+        for i, author in enumerate(authors))
+    review = Review.objects.filter(title=titles[0]).first()
+    Comment.objects.bulk_create(
+        Comment(author=author, review_id=review_id, text='text')
+        for review_id in Review.objects.filter(
+            title=titles[0]).values_list('pk', flat=True)
+        for author in authors[:10])
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return titles[0], review, authors[0]
+
+
+class Test24ReviewIndexes:
+
+    def test_01_review_list(self, client, reviews_dataset):
+        title, _, _ = reviews_dataset
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        for page_url in (
+                f'{url}?limit=20&offset=100',
+                f'{url}?pagination=cursor&limit=20'):
+            queries = list_queries(client, page_url, 'reviews_review')
+            assert queries, (
+                f'Проверьте, что GET-запрос к `{page_url}` выбирает отзывы.'
+            )
+            for sql in queries:
+                assert_index_scan(sql, 'review_title_pub_date_idx')
+        next_url = client.get(
+            f'{url}?pagination=cursor&limit=20').json()['next']
+        for sql in list_queries(client, next_url, 'reviews_review'):
+            assert_index_scan(sql, 'review_title_pub_date_idx')
+
+    def test_02_comment_list(self, client, reviews_dataset):
+        title, review, _ = reviews_dataset
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+        for page_url in (
+                f'{url}?limit=5&offset=5',
+                f'{url}?pagination=cursor&limit=5'):
+            queries = list_queries(client, page_url, 'reviews_comment')
+            assert queries
+            for sql in queries:
+                assert_index_scan(sql, 'comment_review_pub_date_idx')
+
+    def test_03_author_history(self, reviews_dataset):
+        _, _, author = reviews_dataset
+        for queryset, index in (
+                (Review.objects.filter(author=author),
+                 'review_author_history_idx'),
+                (Comment.objects.filter(author=author),
+                 'comment_author_history_idx')):
+            sql, params = queryset[:20].query.sql_with_params()
+            with connection.cursor() as cursor:
+                sql = connection.ops.last_executed_query(cursor, sql, params)
+            assert_index_scan(sql, index)
@@ -0,0 +1,128 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (
+    create_single_comment, create_single_review, create_titles)
+
+
+def run(client, method, url, data=None):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data)
+    return response, [query['sql'] for query in context.captured_queries]
+
+
+def parent_queries(queries, table):
+    return [
+        sql for sql in queries
+        if sql.startswith('SELECT') and f'FROM "{table}"' in sql]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25NestedRoutes:
+
+    @pytest.fixture
+    def chain(self, admin_client, user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        reviews = [
+            create_single_review(
+                client, titles[0]['id'], f'Отзыв {i}', 5).json()
+            for i, client in enumerate((admin_client, moderator_client))]
+        other_review = create_single_review(
+            admin_client, titles[1]['id'], 'Другой отзыв', 6).json()
+        comments = [
+            create_single_comment(
+                admin_client, titles[0]['id'], reviews[0]['id'],
+                f'Комментарий {i}').json()
+            for i in range(3)]
+        # Кэш пользователей заполняется первым запросом каждого клиента.
+        user_client.get('/api/v1/users/me/')
+        return titles, reviews, other_review, comments
+
+    @pytest.mark.parametrize('method,path,data,status,expected', (
+        ('get', 'reviews/', None, HTTPStatus.OK, 3),
+        ('get', 'reviews/{review}/', None, HTTPStatus.OK, 2),
+        ('post', 'reviews/', {'text': 'Новый', 'score': 3},
+         HTTPStatus.CREATED, None),
+        ('patch', 'reviews/{own_review}/', {'text': 'Изменен'},
+         HTTPStatus.OK, None),
+        ('delete', 'reviews/{own_review}/', None,
+         HTTPStatus.NO_CONTENT, None),
+        ('get', 'reviews/{review}/comments/', None, HTTPStatus.OK, 3),
+        ('get', 'reviews/{review}/comments/{comment}/', None,
+         HTTPStatus.OK, 2),
+        ('post', 'reviews/{review}/comments/', {'text': 'Новый'},
+         HTTPStatus.CREATED, None),
+        ('patch', 'reviews/{review}/comments/{comment}/',
+         {'text': 'Изменен'}, HTTPStatus.OK, None),
+        ('delete', 'reviews/{review}/comments/{comment}/', None,
+         HTTPStatus.NO_CONTENT, None),
+    ))
+    def test_01_queries(self, chain, admin_client, user_client, method,
+                        path, data, status, expected):
+        titles, reviews, _, comments = chain
+        client = admin_client
+        own_review = reviews[0]['id']
+        if method == 'post' and path == 'reviews/':
+            client = user_client
+        url = f'/api/v1/titles/{titles[0]["id"]}/' + path.format(
+            comment=comments[0]['id'], own_review=own_review,
+            review=reviews[0]['id'])
+        response, queries = run(client, method, url, data)
+        assert response.status_code == status
+        parent = (
+            'reviews_review' if 'comments/' in path else 'reviews_title')
+        lookups = parent_queries(queries, parent)
+        assert len(lookups) <= 1, (
+            f'Проверьте, что {method.upper()}-запрос к `{url}` загружает '
+            f'родительский объект не более одного раза: {lookups}'
+        )
+        if expected is not None:
+            assert len(queries) <= expected, (
+                f'Проверьте, что {method.upper()}-запрос к `{url}` '
+                f'выполняет не более {expected} запросов к базе данных: '
+                f'{queries}'
+            )
+        if method == 'get' and path.endswith('comments/'):
+            response, queries = run(
+                client, method, url + '?limit=1&offset=1')
+            assert not parent_queries(queries, 'reviews_user'), (
+                'Проверьте, что авторы комментариев загружаются вместе с '
+                'комментариями.'
+            )
+
+    def test_02_mismatched_parents(self, chain, admin_client):
+        titles, reviews, other_review, comments = chain
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        other_url = f'/api/v1/titles/{titles[1]["id"]}/'
+        review_id = reviews[0]['id']
+        for method, url, data in (
+                ('get', f'{other_url}reviews/{review_id}/', None),
+                ('patch', f'{other_url}reviews/{review_id}/',
+                 {'text': 'Изменен'}),
+                ('delete', f'{other_url}reviews/{review_id}/', None),
+                ('get', f'{other_url}reviews/{review_id}/comments/', None),
+                ('post', f'{other_url}reviews/{review_id}/comments/',
+                 {'text': 'Комментарий'}),
+                ('get', f'{other_url}reviews/{review_id}/comments/'
+                        f'{comments[0]["id"]}/', None),
+                ('delete', f'{other_url}reviews/{review_id}/comments/'
+                           f'{comments[0]["id"]}/', None),
+                ('get', f'{title_url}reviews/{other_review["id"]}/'
+                        f'comments/{comments[0]["id"]}/', None),
+                ('get', '/api/v1/titles/0/reviews/', None),
+                ('post', '/api/v1/titles/0/reviews/',
+                 {'text': 'Отзыв', 'score': 5})):
+            response = getattr(admin_client, method)(url, data=data)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что {method.upper()}-запрос к `{url}` с '
+                'несовпадающими id произведения и отзыва возвращает ответ '
+                'со статусом 404.'
+            )
+        response = admin_client.get(f'{title_url}reviews/{review_id}/')
+        assert response.json()['text'] == reviews[0]['text']
+        response = admin_client.get(
+            f'{title_url}reviews/{review_id}/comments/')
+        assert response.json()['count'] == 3
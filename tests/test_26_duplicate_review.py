@@ -0,0 +1,99 @@
+from http import HTTPStatus
+import threading
+import time
+
+import pytest
+from django.db import connection, connections, OperationalError
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.v1.serializers import DUPLICATE_REVIEW_MESSAGE
+from tests.utils import create_single_review, create_titles
+
+LOCKED_RETRIES: int = 100
+PARALLEL_POSTS: int = 6
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26DuplicateReview:
+
+    def test_01_duplicate(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
+        assert not [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']], (
+            'Проверьте, что отзыв создается без предварительной проверки '
+            'повторного отзыва.'
+        )
+        response = user_client.post(url, data={'text': 'Еще', 'score': 7})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': [DUPLICATE_REVIEW_MESSAGE]}, (
+            'Проверьте, что повторный отзыв отклоняется с прежним текстом '
+            'ошибки.'
+        )
+        response = admin_client.get(url)
+        assert response.json()['count'] == 1
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json()['rating'] == 5, (
+            'Проверьте, что отклоненный отзыв не меняет рейтинг.'
+        )
+
+    def test_02_parallel_duplicates(self, admin_client, token_user):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        barrier = threading.Barrier(PARALLEL_POSTS)
+        statuses = []
+
+        def post(score):
+            client = APIClient()
+            client.credentials(
+                HTTP_AUTHORIZATION=f'Bearer {token_user["access"]}')
+            data = {'text': f'Отзыв {score}', 'score': score}
+            try:
+                barrier.wait()
+                for _ in range(LOCKED_RETRIES):
+                    try:
+                        response = client.post(url, data=data)
+                    except OperationalError as error:
+                        # Тестовая SQLite-база в памяти с общим кэшем
+                        # блокирует таблицы без ожидания: транзакция
+                        # откатывается, запрос можно повторить.
+                        if 'locked' not in str(error):
+                            raise
+                        time.sleep(0.01)
+                    else:
+                        statuses.append(response.status_code)
+                        return
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=post, args=(score,))
+            for score in range(1, PARALLEL_POSTS + 1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(statuses) == PARALLEL_POSTS and set(statuses) <= {
+            HTTPStatus.CREATED, HTTPStatus.BAD_REQUEST}, (
+            'Проверьте, что параллельные повторные отзывы отклоняются с '
+            f'ответом 400, а не ошибкой сервера: {statuses}'
+        )
+        assert statuses.count(HTTPStatus.CREATED) <= 1
+        assert admin_client.get(url).json()['count'] == 1, (
+            'Проверьте, что из параллельных повторных отзывов создается '
+            'ровно один.'
+        )
+        title = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        review = admin_client.get(url).json()['results'][0]
+        assert title['rating'] == review['score'], (
+            'Проверьте, что рейтинг учитывает только созданный отзыв.'
+        )
+        response = admin_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/?stats=1')
+        assert response.json()['stats']['review_count'] == 1
@@ -0,0 +1,165 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.v1.serializers import DUPLICATE_REVIEW_MESSAGE
+from tests.utils import create_single_review
+
+REVIEWS_URL = '/api/v1/bulk/reviews/'
+COMMENTS_URL = '/api/v1/bulk/comments/'
+
+
+@pytest.fixture
+def titles(db):
+    from reviews.models import Title, TitleStats
+
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000) for i in range(60))
+    TitleStats.objects.create_missing(Title.objects.all())
+    return list(Title.objects.order_by('pk').values_list('pk', flat=True))
+
+
+def post(client, url, data):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(url, data=data, format='json')
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27BulkReviews:
+
+    def test_01_reviews(self, client, user_client, admin_client, titles):
+        create_single_review(user_client, titles[3], 'Уже есть', 2)
+        client.get(f'/api/v1/titles/{titles[0]}/')
+        items = [
+            {'title': titles[0], 'text': 'Сапфировый отзыв', 'score': 9},
+            {'title': titles[1], 'text': 'Второй отзыв', 'score': 4},
+            {'title': titles[0], 'text': 'Повтор в запросе', 'score': 1},
+            {'title': 0, 'text': 'Нет произведения', 'score': 5},
+            {'title': titles[2], 'text': 'Плохая оценка', 'score': 11},
+            {'title': titles[3], 'text': 'Повтор в базе', 'score': 3},
+            {'title': titles[2], 'text': 'Третий отзыв', 'score': 6},
+        ]
+        response, _ = post(user_client, REVIEWS_URL, items)
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            'Проверьте, что при частично успешном создании отзывов '
+            'возвращается ответ со статусом 207.'
+        )
+        data = response.json()
+        assert data['created'] == 3
+        statuses = [result['status'] for result in data['results']]
+        assert statuses == [201, 201, 400, 400, 400, 400, 201], (
+            'Проверьте, что результаты возвращаются по каждому элементу '
+            'в порядке запроса.'
+        )
+        results = data['results']
+        assert results[2]['errors'] == {
+            'non_field_errors': [DUPLICATE_REVIEW_MESSAGE]}
+        assert results[5]['errors'] == {
+            'non_field_errors': [DUPLICATE_REVIEW_MESSAGE]}
+        assert 'title' in results[3]['errors']
+        assert 'score' in results[4]['errors']
+        for index in (0, 1, 6):
+            review = admin_client.get(
+                f'/api/v1/titles/{items[index]["title"]}/reviews/'
+                f'{results[index]["id"]}/').json()
+            assert review['text'] == items[index]['text'], (
+                'Проверьте, что для каждого созданного отзыва возвращается '
+                'его id.'
+            )
+            assert review['author'] == 'TestUser'
+
+        title = client.get(f'/api/v1/titles/{titles[0]}/?stats=1').json()
+        assert title['rating'] == 9, (
+            'Проверьте, что массовое создание отзывов обновляет рейтинг и '
+            'сбрасывает кэш произведения.'
+        )
+        assert title['stats']['review_count'] == 1
+        assert title['stats']['histogram']['9'] == 1
+        found = client.get(
+            '/api/v1/search/?q=сапфировый&type=review').json()['results']
+        assert found[0]['object']['id'] == results[0]['id'], (
+            'Проверьте, что созданные отзывы попадают в поисковый индекс.'
+        )
+
+    def test_02_reviews_queries(self, user_client, titles):
+        small, small_queries = post(user_client, REVIEWS_URL, [
+            {'title': title_id, 'text': 'Отзыв', 'score': 5}
+            for title_id in titles[:5]])
+        large, large_queries = post(user_client, REVIEWS_URL, [
+            {'title': title_id, 'text': 'Отзыв', 'score': 7}
+            for title_id in titles[5:55]])
+        assert small.status_code == large.status_code == HTTPStatus.CREATED
+        assert large_queries <= small_queries, (
+            'Проверьте, что количество запросов к базе данных при массовом '
+            'создании отзывов не зависит от количества отзывов: '
+            f'{small_queries} для 5 и {large_queries} для 50 отзывов.'
+        )
+        assert len({
+            result['id'] for result in large.json()['results']}) == 50
+
+    def test_03_comments(self, client, user_client, admin_client, titles):
+        first = create_single_review(
+            admin_client, titles[0], 'Отзыв', 5).json()
+        second = create_single_review(
+            admin_client, titles[1], 'Отзыв', 6).json()
+        items = [
+            {'review': first['id'], 'text': 'Янтарный комментарий'},
+            {'review': second['id'], 'text': 'Второй'},
+            {'review': first['id'], 'text': 'Третий'},
+            {'review': 0, 'text': 'Нет отзыва'},
+            {'review': second['id']},
+        ]
+        client.get(f'/api/v1/titles/{titles[0]}/?stats=1')
+        response, _ = post(user_client, COMMENTS_URL, items)
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [
+            201, 201, 201, 400, 400]
+        assert 'review' in results[3]['errors']
+        assert 'text' in results[4]['errors']
+        comment = admin_client.get(
+            f'/api/v1/titles/{titles[0]}/reviews/{first["id"]}/comments/'
+            f'{results[2]["id"]}/').json()
+        assert comment['text'] == 'Третий'
+        stats = client.get(f'/api/v1/titles/{titles[0]}/?stats=1').json()
+        assert stats['stats']['comment_count'] == 2, (
+            'Проверьте, что массовое создание комментариев обновляет '
+            'статистику произведения.'
+        )
+        found = client.get('/api/v1/search/?q=янтарный&type=comment')
+        assert found.json()['count'] == 1
+
+        _, small_queries = post(user_client, COMMENTS_URL, [
+            {'review': first['id'], 'text': 'Комментарий'}] * 5)
+        response, large_queries = post(user_client, COMMENTS_URL, [
+            {'review': first['id'], 'text': 'Комментарий'}] * 100)
+        assert response.status_code == HTTPStatus.CREATED
+        assert large_queries <= small_queries, (
+            'Проверьте, что количество запросов к базе данных при массовом '
+            'создании комментариев не зависит от их количества.'
+        )
+        ids = [result['id'] for result in response.json()['results']]
+        assert len(set(ids)) == 100 and ids == sorted(ids)
+
+    def test_04_invalid_requests(self, user_client, titles):
+        item = {'title': titles[0], 'text': 'Отзыв', 'score': 5}
+        response = APIClient().post(REVIEWS_URL, data=[item], format='json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        for url, data in (
+                (REVIEWS_URL, item),
+                (REVIEWS_URL, []),
+                (REVIEWS_URL, [item] * 1001),
+                (COMMENTS_URL, {'review': 1, 'text': 'Комментарий'})):
+            response = user_client.post(url, data=data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{url}` принимает только '
+                'непустой массив не более чем из 1000 элементов.'
+            )
+        response, _ = post(user_client, REVIEWS_URL, [
+            {'title': 0, 'text': 'Отзыв', 'score': 5}])
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['created'] == 0
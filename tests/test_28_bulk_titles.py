@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.utils import create_categories, create_genre
+
+URL = '/api/v1/bulk/titles/'
+
+
+def post(client, data):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(URL, data=data, format='json')
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28BulkTitles:
+
+    def test_01_titles(self, client, admin_client):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+        client.get('/api/v1/titles/')
+        items = [
+            {'name': 'Изумрудный город', 'year': 1939,
+             'description': 'Сказка', 'category': categories[1]['slug'],
+             'genre': [genres[1]['slug'], genres[2]['slug']]},
+            {'name': 'Без жанра', 'year': 2000},
+            {'name': 'Нет категории', 'year': 2001, 'category': 'unknown'},
+            {'name': 'Нет жанра', 'year': 2002,
+             'genre': [genres[0]['slug'], 'unknown']},
+            {'year': 2003},
+            {'name': 'Ужастик', 'year': 1980,
+             'category': categories[0]['slug'], 'genre': [genres[0]['slug']]},
+        ]
+        response, _ = post(admin_client, items)
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            'Проверьте, что при частично успешном создании произведений '
+            'возвращается ответ со статусом 207.'
+        )
+        data = response.json()
+        assert data['created'] == 3
+        results = data['results']
+        assert [result['status'] for result in results] == [
+            201, 201, 400, 400, 400, 201]
+        assert 'category' in results[2]['errors']
+        assert results[3]['errors'] == {
+            'genre': ['Object with slug=unknown does not exist.']}
+        assert 'name' in results[4]['errors']
+
+        title = client.get(f'/api/v1/titles/{results[0]["id"]}/?stats=1')
+        title = title.json()
+        assert title['name'] == items[0]['name']
+        assert title['category'] == categories[1]
+        assert sorted(genre['slug'] for genre in title['genre']) == [
+            'comedy', 'drama'], (
+            'Проверьте, что массовое создание произведений назначает жанры.'
+        )
+        assert title['stats']['review_count'] == 0, (
+            'Проверьте, что для созданных произведений создается статистика.'
+        )
+        title = client.get(f'/api/v1/titles/{results[1]["id"]}/').json()
+        assert title['category'] is None and title['genre'] == []
+        response = client.get('/api/v1/titles/')
+        assert response.json()['count'] == 3, (
+            'Проверьте, что массовое создание произведений сбрасывает кэш '
+            'списка произведений.'
+        )
+        response = client.get('/api/v1/titles/?genre=horror')
+        assert [title['id'] for title in response.json()['results']] == [
+            results[5]['id']]
+        found = client.get('/api/v1/search/?q=изумрудный&type=title').json()
+        assert found['results'][0]['object']['id'] == results[0]['id'], (
+            'Проверьте, что созданные произведения попадают в поисковый '
+            'индекс.'
+        )
+
+    def test_02_queries(self, admin_client):
+        categories = create_categories(admin_client)
+        genres = create_genre(admin_client)
+
+        def items(count):
+            return [
+                {'name': f'Произведение {i}', 'year': 2000,
+                 'category': categories[i % 2]['slug'],
+                 'genre': [genres[i % 3]['slug'], genres[(i + 1) % 3]['slug']]}
+                for i in range(count)]
+
+        small, small_queries = post(admin_client, items(5))
+        large, large_queries = post(admin_client, items(60))
+        assert small.status_code == large.status_code == HTTPStatus.CREATED
+        assert large_queries <= small_queries, (
+            'Проверьте, что количество запросов к базе данных при массовом '
+            'создании произведений не зависит от их количества: '
+            f'{small_queries} для 5 и {large_queries} для 60 произведений.'
+        )
+        ids = [result['id'] for result in large.json()['results']]
+        assert len(set(ids)) == 60 and ids == sorted(ids)
+        response = admin_client.get(f'/api/v1/titles/{ids[-1]}/').json()
+        assert response['name'] == 'Произведение 59'
+        assert {genre['slug'] for genre in response['genre']} == {
+            genres[0]['slug'], genres[2]['slug']}
+
+    def test_03_invalid_requests(self, admin_client, user_client):
+        item = {'name': 'Произведение', 'year': 2000}
+        response = APIClient().post(URL, data=[item], format='json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(URL, data=[item], format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массово создавать произведения может только '
+            'администратор.'
+        )
+        for data in (item, [], [item] * 1001):
+            response = admin_client.post(URL, data=data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert admin_client.get('/api/v1/titles/').json()['count'] == 0
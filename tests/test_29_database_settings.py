@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.db import connection
+
+from reviews.db import check_connections
+from tests.conftest import BASE_DIR, MANAGE_PATH
+
+DATABASE_ENV = (
+    'DB_CONN_HEALTH_CHECKS', 'DB_CONN_MAX_AGE', 'DB_ENGINE', 'DB_HOST',
+    'DB_NAME', 'DB_PORT', 'DB_SQLITE_READ_CONNECTION', 'DB_SQLITE_TUNING',
+    'POSTGRES_PASSWORD', 'POSTGRES_USER')
+
+
+def database_settings(**environ):
+    env = {
+        key: value for key, value in os.environ.items()
+        if key not in DATABASE_ENV}
+    env.update(environ, SECRET_KEY='x')
+    result = subprocess.run(
+        (sys.executable, '-c',
+         'import json; from api_yamdb import settings; '
+         'print(json.dumps(settings.DATABASES["default"], default=str))'),
+        capture_output=True, check=True, cwd=MANAGE_PATH, env=env,
+        text=True)
+    return json.loads(result.stdout)
+
+
+class Test29DatabaseSettings:
+
+    def test_01_settings(self):
+        default = database_settings()
+        assert default['ENGINE'] == 'reviews.backends.sqlite3'
+        assert default['NAME'].endswith('db.sqlite3')
+        assert default['CONN_MAX_AGE'] == 0
+        assert default['CONN_HEALTH_CHECKS'] is False
+        postgresql = database_settings(
+            DB_CONN_HEALTH_CHECKS='true',
+            DB_CONN_MAX_AGE='60',
+            DB_ENGINE='django.db.backends.postgresql',
+            DB_HOST='db',
+            DB_NAME='yamdb',
+            DB_PORT='5432',
+            POSTGRES_PASSWORD='secret',
+            POSTGRES_USER='yamdb')
+        assert postgresql == {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': 'yamdb',
+            'USER': 'yamdb',
+            'PASSWORD': 'secret',
+            'HOST': 'db',
+            'PORT': '5432',
+            'OPTIONS': {},
+            'CONN_MAX_AGE': 60,
+            'CONN_HEALTH_CHECKS': True}, (
+            'Проверьте, что настройки базы данных читаются из переменных '
+            'окружения.'
+        )
+        assert database_settings(
+            DB_CONN_MAX_AGE='None')['CONN_MAX_AGE'] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_health_checks(self, monkeypatch):
+        closed = []
+        connection.ensure_connection()
+        monkeypatch.setitem(
+            connection.settings_dict, 'CONN_HEALTH_CHECKS', True)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(1))
+        check_connections()
+        assert not closed, (
+            'Проверьте, что исправное соединение используется повторно.'
+        )
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        check_connections()
+        assert closed, (
+            'Проверьте, что неисправное постоянное соединение закрывается '
+            'перед запросом.'
+        )
+        monkeypatch.setitem(
+            connection.settings_dict, 'CONN_HEALTH_CHECKS', False)
+        closed.clear()
+        check_connections()
+        assert not closed
+
+    def test_03_postgresql(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Набор тестов уже выполняется на PostgreSQL.')
+        pytest.importorskip('pgserver')
+        result = subprocess.run(
+            (sys.executable, '-m', 'tests.postgresql', '-q',
+             'tests/test_27_bulk_reviews.py', 'tests/test_28_bulk_titles.py'),
+            capture_output=True, cwd=BASE_DIR,
+            env={**os.environ, 'SECRET_KEY': 'x'}, text=True)
+        assert result.returncode == 0, (
+            'Проверьте, что тесты проходят на PostgreSQL: '
+            f'{result.stdout[-2000:]}'
+        )
+
+    def test_04_benchmark(self):
+        result = subprocess.run(
+            (sys.executable, '-m', 'benchmarks.bench_database', '--backend',
+             'sqlite', '--requests', '4', '--concurrency', '1'),
+            capture_output=True, check=True, cwd=BASE_DIR,
+            env={**os.environ, 'SECRET_KEY': 'x'}, text=True)
+        for phase in ('reviews-create', 'reviews-update', 'comments-create'):
+            assert f'sqlite{" " * 17}{phase}' in result.stdout
@@ -0,0 +1,100 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.db import connection, DEFAULT_DB_ALIAS, transaction
+
+from reviews.backends.sqlite3.base import DatabaseWrapper
+from reviews.routers import read_alias, ReadWriteRouter
+from tests.conftest import BASE_DIR
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Проверяется профиль настройки SQLite.')
+
+
+@pytest.fixture
+def tuned(tmp_path, django_db_blocker):
+    wrapper = DatabaseWrapper({
+        **connection.settings_dict,
+        'NAME': str(tmp_path / 'tuned.sqlite3'),
+        'OPTIONS': settings.SQLITE_OPTIONS}, alias='tuned')
+    with django_db_blocker.unblock():
+        yield wrapper
+        wrapper.close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+class Test30SQLiteTuning:
+
+    def test_01_pragmas(self, tuned):
+        assert connection.settings_dict['ENGINE'] == (
+            'reviews.backends.sqlite3'), (
+            'Проверьте, что профиль настройки SQLite включен по умолчанию.'
+        )
+        assert {
+            name: pragma(tuned, name) for name in (
+                'journal_mode', 'synchronous', 'busy_timeout', 'mmap_size',
+                'cache_size', 'temp_store')} == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'mmap_size': 256 * 1024 ** 2,
+            'cache_size': -64000,
+            'temp_store': 2}, (
+            'Проверьте, что PRAGMA профиля применяются к новому соединению.'
+        )
+
+    def test_02_begin_immediate(self, tuned):
+        tuned.ensure_connection()
+        tuned._start_transaction_under_autocommit()
+        other = sqlite3.connect(tuned.settings_dict['NAME'], timeout=0)
+        try:
+            with pytest.raises(sqlite3.OperationalError, match='locked'):
+                other.execute('BEGIN IMMEDIATE')
+        finally:
+            other.close()
+            tuned.connection.rollback()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_read_router(self, settings):
+        settings.DATABASE_READ_ALIASES = ['read']
+        router = ReadWriteRouter()
+        token = read_alias.set('read')
+        try:
+            assert router.db_for_read(None) == 'read'
+            with transaction.atomic():
+                assert router.db_for_read(None) == DEFAULT_DB_ALIAS, (
+                    'Проверьте, что чтение внутри транзакции выполняется '
+                    'через соединение для записи.'
+                )
+        finally:
+            read_alias.reset(token)
+        assert router.db_for_read(None) == DEFAULT_DB_ALIAS
+        assert router.allow_migrate('read', 'reviews') is False
+
+    def test_04_load(self, tmp_path):
+        output = tmp_path / 'sqlite.json'
+        subprocess.run(
+            (sys.executable, '-m', 'benchmarks.bench_sqlite',
+             '--processes', '3', '--requests', '12',
+             '--output', str(output)),
+            check=True, cwd=BASE_DIR, env={**os.environ, 'SECRET_KEY': 'x'},
+            stdout=subprocess.DEVNULL)
+        report = json.loads(output.read_text(encoding='utf-8'))
+        for name in ('профиль', 'профиль + чтение'):
+            assert report[name]['requests'] == 36
+            assert report[name]['errors'] == 0, (
+                'Проверьте, что с профилем настройки параллельная запись из '
+                f'нескольких процессов проходит без ошибок: {report[name]}'
+            )
+            assert report[name]['rps'] > 0
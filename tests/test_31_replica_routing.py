@@ -0,0 +1,199 @@
+from http import HTTPStatus
+from io import StringIO
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.cache import clear_response_cache
+from reviews.routers import (
+    read_alias, ReadWriteRouter, ReplicaRoutingMiddleware)
+from tests.conftest import BASE_DIR, MANAGE_PATH
+
+REPLICA: str = 'replica_1'
+
+needs_replicas = pytest.mark.skipif(
+    not settings.DATABASE_READ_ALIASES,
+    reason='Реплики не настроены: запускается из test_02_two_sqlite_files.')
+
+
+def read_settings(**environ):
+    env = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith('DB_')}
+    env.update(environ, SECRET_KEY='x')
+    result = subprocess.run(
+        (sys.executable, '-c',
+         'import json; from api_yamdb import settings; print(json.dumps({'
+         '"databases": settings.DATABASES, '
+         '"read_aliases": settings.DATABASE_READ_ALIASES, '
+         '"routers": getattr(settings, "DATABASE_ROUTERS", [])}, '
+         'default=str))'),
+        capture_output=True, check=True, cwd=MANAGE_PATH, env=env,
+        text=True)
+    return json.loads(result.stdout)
+
+
+def run(client, method, url, data=None):
+    """Ответ и количество SQL-запросов к default и к реплике."""
+    with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as default, \
+            CaptureQueriesContext(connections[REPLICA]) as replica:
+        response = getattr(client, method)(url, data=data)
+    return response, len(default), len(replica)
+
+
+class Test31ReplicaRouting:
+
+    def test_01_settings(self):
+        sqlite = read_settings(DB_REPLICAS='first.sqlite3,second.sqlite3')
+        assert sqlite['read_aliases'] == ['replica_1', 'replica_2']
+        assert sqlite['routers'] == ['reviews.routers.ReadWriteRouter']
+        replica = sqlite['databases']['replica_2']
+        assert replica['NAME'] == 'second.sqlite3'
+        assert replica['ENGINE'] == sqlite['databases']['default']['ENGINE']
+        postgresql = read_settings(
+            DB_ENGINE='django.db.backends.postgresql',
+            DB_NAME='yamdb',
+            DB_PORT='5432',
+            DB_REPLICAS='replica-a,replica-b:6432')
+        replicas = [
+            postgresql['databases'][alias]
+            for alias in postgresql['read_aliases']]
+        assert [(db['HOST'], db['PORT'], db['NAME']) for db in replicas] == [
+            ('replica-a', '5432', 'yamdb'), ('replica-b', '6432', 'yamdb')]
+        assert read_settings()['read_aliases'] == []
+        assert read_settings()['routers'] == []
+
+    def test_02_two_sqlite_files(self, tmp_path):
+        if settings.DATABASE_READ_ALIASES:
+            pytest.skip('Тест уже выполняется с репликами.')
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            pytest.skip('Проверяется конфигурация из двух файлов SQLite.')
+        result = subprocess.run(
+            (sys.executable, '-m', 'pytest', '-q',
+             'tests/test_31_replica_routing.py'),
+            capture_output=True, cwd=BASE_DIR, text=True, env={
+                **os.environ,
+                'DB_NAME': str(tmp_path / 'primary.sqlite3'),
+                'DB_REPLICAS': str(tmp_path / 'replica.sqlite3'),
+                'SECRET_KEY': 'x'})
+        assert result.returncode == 0, (
+            'Проверьте маршрутизацию запросов с базой default и репликой в '
+            f'двух файлах SQLite: {result.stdout[-3000:]}'
+        )
+        assert '1 skipped' in result.stdout
+
+    @needs_replicas
+    @pytest.mark.django_db(transaction=True, databases='__all__')
+    def test_03_routing(self, admin_client, user_client):
+        call_command('replicate_sqlite', stdout=StringIO())
+        client = APIClient()
+        title = {'name': 'Реплика', 'year': 2000}
+        response, _, replica_queries = run(
+            admin_client, 'post', '/api/v1/titles/', title)
+        assert response.status_code == HTTPStatus.CREATED
+        assert replica_queries == 0, (
+            'Проверьте, что запросы на запись не читают из реплик.'
+        )
+        title_id = response.json()['id']
+
+        response, default_queries, replica_queries = run(
+            client, 'get', '/api/v1/titles/')
+        assert default_queries == 0 and replica_queries > 0, (
+            'Проверьте, что GET-запросы читают из реплики.'
+        )
+        assert response.json()['count'] == 0, (
+            'Реплика еще не получила новое произведение.'
+        )
+        call_command('replicate_sqlite', stdout=StringIO())
+        clear_response_cache()
+        response, _, _ = run(client, 'get', '/api/v1/titles/')
+        assert response.json()['count'] == 1
+
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        response, default_queries, replica_queries = run(
+            user_client, 'post', url, {'text': 'Отзыв', 'score': 8})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == 'TestUser'
+        assert replica_queries == 0 and default_queries > 0
+        response, _, replica_queries = run(user_client, 'get', url)
+        assert response.json()['count'] == 0 and replica_queries > 0
+
+    @needs_replicas
+    @pytest.mark.django_db(transaction=True, databases='__all__')
+    def test_04_pinning(self):
+        router = ReadWriteRouter()
+        assert router.db_for_read(None) == DEFAULT_DB_ALIAS, (
+            'Проверьте, что вне HTTP-запросов чтение идет в default.'
+        )
+        token = read_alias.set(REPLICA)
+        try:
+            assert router.db_for_read(None) == REPLICA
+            assert router.db_for_write(None) == DEFAULT_DB_ALIAS
+            assert router.db_for_read(None) == DEFAULT_DB_ALIAS, (
+                'Проверьте, что после записи запрос читает из default.'
+            )
+        finally:
+            read_alias.reset(token)
+
+    def test_05_one_replica_per_request(self, settings, rf):
+        settings.DATABASE_READ_ALIASES = [f'replica_{i}' for i in range(10)]
+        router = ReadWriteRouter()
+
+        def reads(request):
+            return {router.db_for_read(None) for _ in range(20)}
+
+        middleware = ReplicaRoutingMiddleware(reads)
+        used = [middleware(rf.get('/api/v1/titles/')) for _ in range(20)]
+        assert all(len(aliases) == 1 for aliases in used), (
+            'Проверьте, что все чтения запроса идут в одну реплику.'
+        )
+        assert len(set().union(*used)) > 1, (
+            'Проверьте, что реплика выбирается для каждого запроса.'
+        )
+        assert middleware(rf.post('/api/v1/titles/')) == {DEFAULT_DB_ALIAS}
+
+    @needs_replicas
+    @pytest.mark.django_db(transaction=True, databases='__all__')
+    def test_06_auth_reads_default(self, user_client):
+        from reviews.models import User
+
+        User.objects.filter(username='TestUser').update(role=User.MODERATOR)
+        response, default_queries, replica_queries = run(
+            user_client, 'get', '/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что пользователь для аутентификации читается из '
+            'default, а не из отстающей реплики.'
+        )
+        assert response.json()['role'] == User.MODERATOR
+        assert default_queries > 0 and replica_queries == 0
+
+    @needs_replicas
+    @pytest.mark.django_db(transaction=True, databases='__all__')
+    @pytest.mark.usefixtures('local_response_cache')
+    def test_07_cache_after_write(self, admin_client, settings):
+        call_command('replicate_sqlite', stdout=StringIO())
+        client = APIClient()
+        title = {'name': 'Реплика', 'year': 2000}
+        admin_client.post('/api/v1/titles/', title)
+        response, default_queries, replica_queries = run(
+            client, 'get', '/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['count'] == 1, (
+            'Проверьте, что сразу после записи ответ для кэша читается из '
+            'default, а не из реплики, которая могла ее еще не получить.'
+        )
+        assert default_queries > 0 and replica_queries == 0
+
+        settings.DATABASE_REPLICA_MAX_LAG = 0
+        admin_client.post('/api/v1/titles/', title)
+        response, default_queries, replica_queries = run(
+            client, 'get', '/api/v1/titles/')
+        assert default_queries == 0 and replica_queries > 0